@@ -0,0 +1,88 @@
+"""Event-table computation: sampling the diameter, per-event window metrics, plugins and step detection."""
+import os
+
+import synthetic
+
+from vasoanalyzer.event_table import build_event_table
+from vasoanalyzer.metrics import compute_event_metrics
+from vasoanalyzer.event_detection import detect_events
+from vasoanalyzer.cache import DiskCache
+from vasoanalyzer.plugins import EventWindows, PluginRunner, load_plugins, PLUGINS
+
+class EventTable:
+	params = [synthetic.TRACE_SIZES, synthetic.EVENT_COUNTS]
+	param_names = ["samples", "events"]
+
+	def setup(self, samples, events):
+		self.t, self.d, _ = synthetic.trace_arrays(samples)
+		self.labels, self.times, self.frames = synthetic.event_arrays(events, self.t[-1])
+		self.times = self.times.tolist()
+
+	def time_build_event_table(self, samples, events):
+		build_event_table(self.t, self.d, self.labels, self.times, self.frames)
+
+class EventMetrics:
+	params = [synthetic.TRACE_SIZES, synthetic.EVENT_COUNTS]
+	param_names = ["samples", "events"]
+
+	def setup(self, samples, events):
+		self.t, self.d, _ = synthetic.trace_arrays(samples)
+		_, self.times, _ = synthetic.event_arrays(events, self.t[-1])
+
+	def time_compute_event_metrics(self, samples, events):
+		compute_event_metrics(self.t, self.d, self.times)
+
+# A typical lab readout: area under the curve and mean diameter of each event's span
+BENCH_PLUGIN = """
+import numpy as np
+from vasoanalyzer.plugins import plugin
+
+@plugin("Bench area", columns=["Bench area", "Bench mean"], version=1)
+def area(events):
+	dt = np.gradient(events.time)
+	return {"Bench area": events.reduce(np.add, np.nan_to_num(events.diameter) * dt), "Bench mean": events.mean()}
+"""
+
+def bench_plugin():
+	path = os.path.join(synthetic.data_dir(), "bench_plugin.py")
+	if not os.path.exists(path):
+		with open(path, "w") as f:
+			f.write(BENCH_PLUGIN)
+	load_plugins([path])
+	return PLUGINS["Bench area"]
+
+class EventPlugins:
+	"""An analysis plugin: one call over all events, and a cached re-run (an undo or a reopened recording)."""
+	params = [synthetic.TRACE_SIZES, synthetic.EVENT_COUNTS]
+	param_names = ["samples", "events"]
+
+	def setup(self, samples, events):
+		self.plugin = bench_plugin()
+		self.t, self.d, _ = synthetic.trace_arrays(samples)
+		self.labels, self.times, _ = synthetic.event_arrays(events, self.t[-1])
+		self.windows = EventWindows(self.t, self.d, self.labels, self.times)
+		self.runner = PluginRunner([self.plugin], cache=DiskCache(root=synthetic.data_dir()))
+		self.runner.submit(None, self.windows)
+		self.runner.wait()
+
+	def teardown(self, samples, events):
+		self.runner.shutdown()
+
+	def time_run_plugin(self, samples, events):
+		self.plugin.run(EventWindows(self.t, self.d, self.labels, self.times))
+
+	def time_cached(self, samples, events):
+		# The trace hash is kept between edits, as in the window
+		windows = EventWindows(self.t, self.d, self.labels, self.times, digest=self.windows._trace_digest)
+		self.runner.submit(None, windows)
+		self.runner.finished()
+
+class EventDetection:
+	params = synthetic.TRACE_SIZES
+	param_names = ["samples"]
+
+	def setup(self, samples):
+		self.t, self.d, _ = synthetic.trace_arrays(samples)
+
+	def time_detect_events(self, samples):
+		detect_events(self.t, self.d)
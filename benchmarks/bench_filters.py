@@ -0,0 +1,46 @@
+"""Trace smoothing: each filter over the whole diameter array, and cache hits."""
+import synthetic
+
+from vasoanalyzer.filters import FILTERS, FilterCache, apply_filter
+from vasoanalyzer.trace_loader import TraceStore
+
+class Filters:
+	params = [synthetic.TRACE_SIZES, list(FILTERS), [11, 101]]
+	param_names = ["samples", "filter", "window"]
+
+	def setup(self, samples, name, window):
+		_, self.d, _ = synthetic.trace_arrays(samples)
+
+	def time_apply_filter(self, samples, name, window):
+		apply_filter(name, self.d, window)
+
+class FilterCacheHit:
+	params = [synthetic.TRACE_SIZES]
+	param_names = ["samples"]
+
+	def setup(self, samples):
+		t, d, outer = synthetic.trace_arrays(samples)
+		self.store = TraceStore.from_arrays({'Time (s)': t, 'Inner Diameter': d, 'Outer Diameter': outer})
+		self.cache = FilterCache()
+		self.cache.get(self.store, "Savitzky–Golay", 11)
+
+	def time_toggle_cached(self, samples):
+		self.cache.get(self.store, "Savitzky–Golay", 11)
+
+class FilterFollow:
+	"""A followed trace growing by one row per tick: its filtered copy is extended, not rebuilt."""
+	params = [synthetic.TRACE_SIZES, list(FILTERS)]
+	param_names = ["samples", "filter"]
+
+	def setup(self, samples, name):
+		t, d, outer = synthetic.trace_arrays(samples + 1000)
+		self.rows = {'Time (s)': t, 'Inner Diameter': d, 'Outer Diameter': outer}
+		self.store = TraceStore(list(self.rows), max_memory_chunks=32)
+		self.store.append({col: values[:samples] for col, values in self.rows.items()})
+		self.cache = FilterCache()
+		self.cache.get(self.store, name, 11)
+
+	def time_one_row_tick(self, samples, name):
+		n = len(self.store)
+		self.store.append({col: values[n:n + 1] for col, values in self.rows.items()})
+		self.cache.get(self.store, name, 11)
@@ -0,0 +1,399 @@
+"""Offscreen (Agg) redraws and exports driven through VasoAnalyzerApp."""
+import os
+import shutil
+import tempfile
+
+import numpy as np
+import synthetic
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+_QAPP = None
+
+def make_window():
+	global _QAPP
+	from PyQt5.QtWidgets import QApplication
+	from vasoanalyzer.gui import VasoAnalyzerApp
+
+	_QAPP = QApplication.instance() or QApplication([])
+	return VasoAnalyzerApp()
+
+def load_window(window, samples, events):
+	"""Populate ``window`` with a synthetic trace and events, as load_trace_and_events would."""
+	from vasoanalyzer.trace_loader import TraceStore
+
+	t, inner, outer = synthetic.trace_arrays(samples)
+	labels, times, frames = synthetic.event_arrays(events, t[-1])
+	window.trace_data = TraceStore.from_arrays({"Time (s)": t, "Inner Diameter": inner, "Outer Diameter": outer})
+	window.event_labels = labels
+	window.event_times = times.tolist()
+	window.event_frames = frames.tolist()
+
+class PlotRedraw:
+	params = [synthetic.TRACE_SIZES, [10, 500]]
+	param_names = ["samples", "events"]
+	timeout = 300
+
+	def setup(self, samples, events):
+		self.out_dir = tempfile.mkdtemp()
+		self.window = make_window()
+		self.window.trace_file_path = self.out_dir
+		load_window(self.window, samples, events)
+
+	def teardown(self, samples, events):
+		self.window.close()
+		shutil.rmtree(self.out_dir, ignore_errors=True)
+
+	def time_update_plot(self, samples, events):
+		self.window.update_plot()
+		self.window.canvas.draw()
+
+	def time_redraw_only(self, samples, events):
+		self.window.canvas.draw()
+
+	def time_zoom_redraw(self, samples, events):
+		# Zoom to 1% of the trace, redraw, then back to the overview
+		w = self.window
+		t_min, t_max = w.trace_data.t_min, w.trace_data.t_max
+		w.ax.set_xlim(t_min, t_min + (t_max - t_min) / 100)
+		w.canvas.draw()
+		w.ax.set_xlim(t_min, t_max)
+		w.canvas.draw()
+
+class ComparisonRedraw:
+	params = [synthetic.TRACE_SIZES, [1, 8], ["overlay", "stacked"]]
+	param_names = ["samples", "traces", "mode"]
+	timeout = 300
+
+	def setup(self, samples, traces, mode):
+		from vasoanalyzer.trace_loader import TraceStore
+
+		self.out_dir = tempfile.mkdtemp()
+		self.window = make_window()
+		self.window.trace_file_path = self.out_dir
+		load_window(self.window, samples, 0)
+		for i in range(traces):
+			t, inner, outer = synthetic.trace_arrays(samples, seed=i + 1)
+			store = TraceStore.from_arrays({"Time (s)": t, "Inner Diameter": inner, "Outer Diameter": outer})
+			self.window.overlay.add(f"vessel {i + 1}", store)
+		self.window.overlay.mode = mode
+		self.window.update_plot()
+
+	def teardown(self, samples, traces, mode):
+		self.window.close()
+		shutil.rmtree(self.out_dir, ignore_errors=True)
+
+	def time_zoom_redraw(self, samples, traces, mode):
+		w = self.window
+		t_min, t_max = w.trace_data.t_min, w.trace_data.t_max
+		w.ax.set_xlim(t_min, t_min + (t_max - t_min) / 100)
+		w.canvas.draw()
+		w.ax.set_xlim(t_min, t_max)
+		w.canvas.draw()
+
+class ViewHistory:
+	"""Back/Forward between zoomed views: blitted from cached renderings vs redrawn."""
+	params = synthetic.TRACE_SIZES
+	param_names = ["samples"]
+	timeout = 300
+
+	def setup(self, samples):
+		self.window = make_window()
+		load_window(self.window, samples, 10)
+		self.window.update_plot()
+		self.window.canvas.draw()
+		t_min, t_max = self.window.trace_data.t_min, self.window.trace_data.t_max
+		for start in (0.1, 0.5):
+			self.window.ax.set_xlim(t_min + (t_max - t_min) * start, t_min + (t_max - t_min) * (start + 0.01))
+			self.window.toolbar.push_current()
+			self.window.canvas.draw()
+
+	def teardown(self, samples):
+		self.window.close()
+
+	def time_back_forward(self, samples):
+		self.window.toolbar.back()
+		self.window.toolbar.forward()
+
+	def time_back_forward_uncached(self, samples):
+		w = self.window
+		w.views.invalidate()
+		w.toolbar.back()
+		w.canvas.draw()
+		w.views.invalidate()
+		w.toolbar.forward()
+		w.canvas.draw()
+
+class EventStepping:
+	"""Keyboard navigation: event steps (cached windows vs redrawn) and TIFF frame steps (blitted marker)."""
+	params = synthetic.TRACE_SIZES
+	param_names = ["samples"]
+	timeout = 300
+
+	def setup(self, samples):
+		self.window = make_window()
+		load_window(self.window, samples, 50)
+		self.window.update_plot()
+		frames = [np.zeros((64, 64), dtype=np.uint8)] * 100
+		self.window.show_snapshot_frames(frames, [{"FrameNumber": x} for x in np.linspace(0, self.window.trace_data.t_max, len(frames))])
+		self.window.canvas.draw()
+		# Visit the first two event windows so stepping between them hits the view cache
+		for delta in (1, 1):
+			self.window.step_event(delta)
+			self.window.canvas.draw()
+
+	def teardown(self, samples):
+		self.window.close()
+
+	def time_step_event_cached(self, samples):
+		self.window.step_event(-1)
+		self.window.step_event(1)
+
+	def time_step_event_uncached(self, samples):
+		w = self.window
+		w.views.invalidate()
+		w.step_event(-1)
+		w.canvas.draw()
+		w.views.invalidate()
+		w.step_event(1)
+		w.canvas.draw()
+
+	def time_step_frame(self, samples):
+		self.window.step_frame(1)
+		self.window.step_frame(-1)
+
+EDITS = 50
+
+class EventEdits:
+	"""Event-table edits through the undo stack (each applies/reverts only its delta)."""
+	params = [synthetic.TRACE_SIZES, [10, 500]]
+	param_names = ["samples", "events"]
+
+	def setup(self, samples, events):
+		self.out_dir = tempfile.mkdtemp()
+		self.window = make_window()
+		self.window.trace_file_path = self.out_dir
+		load_window(self.window, samples, events)
+		self.window.update_plot()
+
+	def teardown(self, samples, events):
+		self.window.close()
+		shutil.rmtree(self.out_dir, ignore_errors=True)
+
+	def time_edit_undo_redo(self, samples, events):
+		from vasoanalyzer.undo import SetEventValue
+
+		w = self.window
+		for i in range(EDITS):
+			row = i % len(w.event_table_data)
+			w.undo_stack.push(SetEventValue(w, row, w.event_table_data[row][3], float(i)))
+		for _ in range(EDITS):
+			w.undo()
+		for _ in range(EDITS):
+			w.redo()
+
+	def time_insert_event_undo(self, samples, events):
+		from vasoanalyzer.undo import InsertEvents
+
+		w = self.window
+		label, t, frame, value = w.event_table_data[len(w.event_table_data) // 2]
+		w.undo_stack.push(InsertEvents(w, [(len(w.event_table_data) // 2, ("New", t - 1, frame, value))]))
+		w.undo()
+
+class PinHitTest:
+	"""Right-click pin lookup: one grid lookup, and a rebuild of the pixel index after a zoom."""
+	params = [10, 500, 5000]
+	param_names = ["pins"]
+
+	def setup(self, pins):
+		self.window = make_window()
+		load_window(self.window, 100_000, 10)
+		self.window.update_plot()
+		store = self.window.trace_data
+		for x in np.linspace(store.t_min, store.t_max, pins):
+			self.window.pins.append(x, store.value_at(x, "Inner Diameter")[1])
+		self.window.canvas.draw()
+		self.click = self.window.ax.transData.transform((self.window.pins.xs[pins // 2], self.window.pins.ys[pins // 2]))
+		self.window.pins.hit(*self.click)
+
+	def teardown(self, pins):
+		self.window.close()
+
+	def time_hit(self, pins):
+		self.window.pins.hit(*self.click)
+
+	def time_hit_after_zoom(self, pins):
+		# Nudge the view back and forth so every call rebuilds the index once
+		ax = self.window.ax
+		x_min, x_max = ax.get_xlim()
+		self.nudge = -getattr(self, "nudge", -1e-6)
+		ax.set_xlim(x_min + self.nudge, x_max + self.nudge)
+		self.window.pins.hit(*self.click)
+
+def plot_style(size, family):
+	"""A PlotStyleDialog.get_style() dict with every font at ``size`` in ``family``."""
+	style = {"tick_font_size": size, "pin_size": 6, "line_width": 1.5}
+	for prefix in ("axis", "event", "pin"):
+		style.update({f"{prefix}_font_size": size, f"{prefix}_font_family": family, f"{prefix}_bold": False, f"{prefix}_italic": False})
+	return style
+
+class Restyle:
+	"""PlotStyleDialog "Apply" with as many pins as events, then the redraw it triggers."""
+	params = [10, 500]
+	param_names = ["events"]
+
+	def setup(self, events):
+		self.window = make_window()
+		load_window(self.window, 100_000, events)
+		self.window.update_plot()
+		store = self.window.trace_data
+		for x in np.linspace(store.t_min, store.t_max, events):
+			self.window.pins.append(x, store.value_at(x, "Inner Diameter")[1])
+		self.styles = [plot_style(9, "DejaVu Sans"), plot_style(11, "DejaVu Serif")]
+		self.window.canvas.draw()
+
+	def teardown(self, events):
+		self.window.close()
+
+	def time_apply_style(self, events):
+		self.styles.reverse()
+		self.window.apply_plot_style(self.styles[0])
+
+	def time_apply_style_and_draw(self, events):
+		self.styles.reverse()
+		self.window.apply_plot_style(self.styles[0])
+		self.window.canvas.draw()
+
+	def time_redraw(self, events):
+		self.window.canvas.draw()
+
+BULK_RECORDINGS = 20
+
+class Export:
+	params = synthetic.EVENT_COUNTS
+	param_names = ["events"]
+
+	def setup(self, events):
+		from openpyxl import load_workbook
+		from vasoanalyzer.event_table import build_event_table
+
+		self.out_dir = tempfile.mkdtemp()
+		self.window = make_window()
+		self.window.trace_file_path = self.out_dir
+		load_window(self.window, 100_000, events)
+		w = self.window
+		w.event_table_data = build_event_table(
+			w.trace_data["Time (s)"], w.trace_data["Inner Diameter"],
+			w.event_labels, w.event_times, w.event_frames
+		)
+		self.excel_path = os.path.join(self.out_dir, "template.xlsx")
+		shutil.copy(synthetic.excel_template(events), self.excel_path)
+		self.template_ws = load_workbook(self.excel_path).active
+
+	def teardown(self, events):
+		self.window.close()
+		shutil.rmtree(self.out_dir, ignore_errors=True)
+
+	def time_auto_export_table(self, events):
+		self.window.auto_export_table()
+
+	def time_update_excel_file(self, events):
+		from vasoanalyzer.excel_mapper import update_excel_file
+
+		update_excel_file(self.excel_path, self.window.event_table_data)
+
+	def time_update_excel_file_label_matched(self, events):
+		from vasoanalyzer.excel_mapper import update_excel_file
+
+		update_excel_file(self.excel_path, self.window.event_table_data, match_labels=True)
+
+	def time_plan_label_mapping(self, events):
+		"""Auto-map preview: index column A once, match every event label (exact/normalised/fuzzy)."""
+		from vasoanalyzer.excel_mapper import plan_mapping
+
+		labels = [row[0].lower() for row in self.window.event_table_data]	# Normalised matches
+		plan_mapping(self.template_ws, labels, [row[2] for row in self.window.event_table_data], "B")
+
+	def time_update_excel_file_per_recording(self, events):
+		"""Collating BULK_RECORDINGS recordings one update_excel_file call at a time."""
+		from vasoanalyzer.excel_mapper import update_excel_file, column_letter
+
+		for i in range(BULK_RECORDINGS):
+			update_excel_file(self.excel_path, self.window.event_table_data, column_letter=column_letter(i + 2))
+
+	def time_bulk_update_excel(self, events):
+		from vasoanalyzer.excel_mapper import bulk_update_excel, column_letter
+
+		recordings = [
+			{"name": f"rec{i}", "events": self.window.event_table_data, "column": column_letter(i + 2)}
+			for i in range(BULK_RECORDINGS)
+		]
+		bulk_update_excel(self.excel_path, recordings)
+
+class FigureExport:
+	"""GUI-thread cost of a figure export (the snapshot) vs. the worker-side render."""
+	params = synthetic.TRACE_SIZES
+	param_names = ["samples"]
+	timeout = 300
+
+	def setup(self, samples):
+		from vasoanalyzer.export_jobs import snapshot_figure
+
+		self.out_dir = tempfile.mkdtemp()
+		self.window = make_window()
+		self.window.trace_file_path = self.out_dir
+		load_window(self.window, samples, 10)
+		self.window.update_plot()
+		self.snapshot = snapshot_figure(self.window.fig, self.window.line_sources(), n_bins=4800)
+
+	def teardown(self, samples):
+		self.window.close()
+		shutil.rmtree(self.out_dir, ignore_errors=True)
+
+	def time_snapshot_figure(self, samples):
+		from vasoanalyzer.export_jobs import snapshot_figure
+
+		snapshot_figure(self.window.fig, self.window.line_sources(), n_bins=4800)
+
+	def time_render_tiff_600dpi(self, samples):
+		from vasoanalyzer.export_jobs import render_snapshot
+
+		render_snapshot(self.snapshot, os.path.join(self.out_dir, "plot.tiff"), "tiff", 600)
+
+	def time_render_svg(self, samples):
+		from vasoanalyzer.export_jobs import render_snapshot
+
+		render_snapshot(self.snapshot, os.path.join(self.out_dir, "plot.svg"), "svg")
+
+class EditablePlotExport:
+	"""Saving/opening the editable plot (.vasoplot document) vs. pickling the live Figure."""
+	params = synthetic.TRACE_SIZES
+	param_names = ["samples"]
+	timeout = 300
+
+	def setup(self, samples):
+		self.out_dir = tempfile.mkdtemp()
+		self.window = make_window()
+		self.window.trace_file_path = self.out_dir
+		load_window(self.window, samples, 10)
+		self.window.update_plot()
+		self.window.auto_export_editable_plot()
+		self.path = os.path.join(self.out_dir, "tracePlot_output.vasoplot")
+
+	def teardown(self, samples):
+		self.window.close()
+		shutil.rmtree(self.out_dir, ignore_errors=True)
+
+	def time_save_document(self, samples):
+		self.window.auto_export_editable_plot()
+
+	def time_open_document(self, samples):
+		from vasoanalyzer.plot_document import open_figure
+
+		open_figure(self.path)
+
+	def time_pickle_figure(self, samples):
+		import pickle
+
+		with open(os.path.join(self.out_dir, "plot.fig.pickle"), "wb") as f:
+			pickle.dump(self.window.fig, f)
@@ -0,0 +1,114 @@
+"""Load times for traces, event tables and TIFF stacks.
+
+``time_*`` parse the files (no disk cache); ``time_*_cached`` reopen them
+from a warmed DiskCache.
+"""
+import os
+import synthetic
+
+from vasoanalyzer.cache import DiskCache
+from vasoanalyzer.trace_loader import load_trace
+from vasoanalyzer.event_loader import load_events
+from vasoanalyzer.tiff_loader import load_tiff
+
+class TraceLoad:
+	params = synthetic.TRACE_SIZES
+	param_names = ["samples"]
+
+	def setup(self, samples):
+		self.path = synthetic.trace_csv(samples)
+		self.cache = DiskCache(root=synthetic.data_dir())
+		load_trace(self.path, cache=self.cache)
+
+	def time_load_trace(self, samples):
+		load_trace(self.path, cache=False)
+
+	def time_load_trace_diameter_only(self, samples):
+		load_trace(self.path, columns=[], cache=False)
+
+	def time_load_trace_cached(self, samples):
+		load_trace(self.path, cache=self.cache)
+
+class EventLoad:
+	params = synthetic.EVENT_COUNTS
+	param_names = ["events"]
+
+	def setup(self, events):
+		self.path = synthetic.event_csv(events, duration=events * 60.0)
+		self.cache = DiskCache(root=synthetic.data_dir())
+		load_events(self.path, cache=self.cache)
+
+	def time_load_events(self, events):
+		load_events(self.path, cache=False)
+
+	def time_load_events_cached(self, events):
+		load_events(self.path, cache=self.cache)
+
+class TiffLoad:
+	params = synthetic.TIFF_STACKS
+	param_names = ["stack"]
+
+	def setup(self, stack):
+		self.path = synthetic.tiff_stack(*stack)
+		self.cache = DiskCache(root=synthetic.data_dir())
+		load_tiff(self.path, cache=self.cache)
+
+	def time_load_tiff(self, stack):
+		load_tiff(self.path, cache=False)
+
+	def time_load_tiff_and_touch_frames(self, stack):
+		# Memory-mapped stacks defer reads until a frame is displayed
+		frames, _ = load_tiff(self.path, cache=False)
+		for frame in frames:
+			frame.sum()
+
+	def time_load_tiff_cached(self, stack):
+		load_tiff(self.path, cache=self.cache)
+
+class TiffRemeasure:
+	"""Diameter re-measurement along a line across every page (one worker's share: serial)."""
+	params = synthetic.TIFF_STACKS
+	param_names = ["stack"]
+
+	def setup(self, stack):
+		self.path = synthetic.tiff_stack(*stack)
+		self.n_pages = stack[0]
+		height, width = stack[1:3]
+		self.line = ((width * 0.1, height / 2), (width * 0.9, height / 2))
+
+	def time_measure_range(self, stack):
+		from vasoanalyzer.remeasure import measure_range
+
+		measure_range(self.path, 0, self.n_pages, *self.line)
+
+class Thumbnails:
+	"""Filmstrip thumbnails: rendering a stack's pages, and reopening it from the disk cache."""
+	params = synthetic.TIFF_STACKS
+	param_names = ["stack"]
+
+	def setup(self, stack):
+		from vasoanalyzer.thumbnails import ThumbnailStore, render_thumbnails, thumbnail_factor
+
+		self.path = synthetic.tiff_stack(*stack)
+		self.pages = list(range(stack[0]))
+		self.factor = thumbnail_factor(stack[1:3])
+		self.cache_dir = os.path.join(synthetic.data_dir(), "thumbnails")
+		os.makedirs(self.cache_dir, exist_ok=True)
+		store = ThumbnailStore(self.path, self.pages, cache_dir=self.cache_dir)
+		pages, images = render_thumbnails(self.path, self.pages, self.factor)
+		store.images[pages] = images
+		store.ready[pages] = True
+		store.close()
+
+	def time_render_thumbnails(self, stack):
+		from vasoanalyzer.thumbnails import render_thumbnails
+
+		render_thumbnails(self.path, self.pages, self.factor)
+
+	def time_open_cached_store(self, stack):
+		from vasoanalyzer.thumbnails import ThumbnailStore
+
+		store = ThumbnailStore(self.path, self.pages, cache_dir=self.cache_dir)
+		for position in range(len(store)):
+			store.get(position)
+		store.close()
@@ -0,0 +1,32 @@
+"""TraceStore: live appends, windowed views and overview envelopes."""
+import numpy as np
+
+import synthetic
+
+from vasoanalyzer.trace_loader import TraceStore
+
+class TraceStoreOps:
+	params = synthetic.TRACE_SIZES
+	param_names = ["samples"]
+
+	def setup(self, samples):
+		self.t, self.inner, self.outer = synthetic.trace_arrays(samples)
+		self.store = TraceStore.from_arrays({"Time (s)": self.t, "Inner Diameter": self.inner})
+		self.t_mid = self.t[len(self.t) // 2]
+
+	def time_append_in_batches(self, samples):
+		# 1000-row batches, as a live tail would deliver them
+		store = TraceStore(["Time (s)", "Inner Diameter"], max_memory_chunks=32)
+		for start in range(0, samples, 1000):
+			store.append({"Time (s)": self.t[start:start + 1000], "Inner Diameter": self.inner[start:start + 1000]})
+		store.close()
+
+	def time_window_60s(self, samples):
+		self.store.window(self.t_mid, self.t_mid + 60)
+
+	def time_overview_envelope(self, samples):
+		self.store.envelope("Inner Diameter", self.store.t_min, self.store.t_max, 1000)
+
+	def time_value_at(self, samples):
+		for t in np.linspace(self.store.t_min, self.store.t_max, 100):
+			self.store.value_at(t, "Inner Diameter")
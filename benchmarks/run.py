@@ -0,0 +1,105 @@
+"""Minimal runner for the benchmark suite.
+
+The bench_*.py files follow asv's conventions (classes with ``params``,
+``param_names``, ``setup``/``teardown`` and ``time_*`` methods), so they can
+also be run with asv. This runner needs nothing beyond the app's own
+dependencies:
+
+	python benchmarks/run.py                      # quick sizes
+	VASO_BENCH_FULL=1 python benchmarks/run.py    # adds 10M/50M samples, big stacks
+	python benchmarks/run.py -k TiffLoad --json results.json
+"""
+import argparse
+import glob
+import importlib
+import inspect
+import itertools
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, BENCH_DIR)
+
+def iter_param_sets(cls):
+	params = getattr(cls, "params", None)
+	if not params:
+		return [()]
+	if all(isinstance(p, list) for p in params):
+		return list(itertools.product(*params))
+	return [(p,) for p in params]
+
+def time_call(fn, args, repeat, min_time):
+	"""Run ``fn`` at least ``repeat`` times (and ``min_time`` s); return per-call seconds."""
+	samples = []
+	started = time.perf_counter()
+	while len(samples) < repeat or (time.perf_counter() - started < min_time and len(samples) < 100):
+		t0 = time.perf_counter()
+		fn(*args)
+		samples.append(time.perf_counter() - t0)
+	return samples
+
+def discover(pattern):
+	for path in sorted(glob.glob(os.path.join(BENCH_DIR, "bench_*.py"))):
+		module = importlib.import_module(os.path.splitext(os.path.basename(path))[0])
+		for cls_name, cls in inspect.getmembers(module, inspect.isclass):
+			if cls.__module__ != module.__name__:
+				continue
+			for name, _ in inspect.getmembers(cls, inspect.isfunction):
+				full_name = f"{module.__name__}.{cls_name}.{name}"
+				if name.startswith("time_") and (not pattern or pattern in full_name):
+					yield full_name, cls, name
+
+def main(argv=None):
+	parser = argparse.ArgumentParser(description="Run VasoAnalyzer benchmarks")
+	parser.add_argument("-k", dest="pattern", help="only run benchmarks whose name contains this")
+	parser.add_argument("--repeat", type=int, default=3, help="minimum timed runs per case")
+	parser.add_argument("--min-time", type=float, default=0.5, help="minimum seconds per case")
+	parser.add_argument("--json", dest="json_path", help="write results to this file")
+	args = parser.parse_args(argv)
+
+	results = []
+	for full_name, cls, method_name in discover(args.pattern):
+		for param_set in iter_param_sets(cls):
+			bench = cls()
+			label = f"{full_name}{list(param_set) if param_set else ''}"
+			try:
+				if hasattr(bench, "setup"):
+					bench.setup(*param_set)
+				fn = getattr(bench, method_name)
+				fn(*param_set)	# warm-up (also fills OS / fixture caches)
+				samples = time_call(fn, param_set, args.repeat, args.min_time)
+			except Exception as e:
+				print(f"❌ {label}: {e}")
+				continue
+			finally:
+				if hasattr(bench, "teardown"):
+					try:
+						bench.teardown(*param_set)
+					except Exception as e:
+						print(f"⚠️ {label}: teardown failed: {e}")
+
+			median = statistics.median(samples)
+			print(f"{median * 1000:12.2f} ms  (min {min(samples) * 1000:.2f}, n={len(samples)})  {label}")
+			results.append({
+				"name": full_name,
+				"params": [str(p) for p in param_set],
+				"median_s": median,
+				"min_s": min(samples),
+				"runs": len(samples),
+			})
+
+	if args.json_path:
+		with open(args.json_path, "w") as f:
+			json.dump({
+				"python": platform.python_version(),
+				"platform": platform.platform(),
+				"results": results,
+			}, f, indent=2)
+		print(f"✔ Results written to:\n{args.json_path}")
+
+if __name__ == "__main__":
+	main()
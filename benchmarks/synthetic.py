@@ -0,0 +1,116 @@
+"""Synthetic VasoTracker-style fixtures for the benchmark suite.
+
+Fixtures are written once to ``VASO_BENCH_DATA`` (default: a folder in the
+system temp dir) and reused across runs, so only the first run pays for
+generating the large traces and stacks.
+"""
+import json
+import os
+import sys
+import tempfile
+
+import numpy as np
+
+# Benchmarks run against the source tree (there is no installed package)
+SRC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+if SRC_DIR not in sys.path:
+	sys.path.insert(0, SRC_DIR)
+
+# VASO_BENCH_FULL=1 adds the 10M/50M-sample traces and the larger stacks
+FULL = bool(os.environ.get("VASO_BENCH_FULL"))
+
+TRACE_SIZES = [10_000, 1_000_000] + ([10_000_000, 50_000_000] if FULL else [])
+EVENT_COUNTS = [10, 500, 5000]
+# (frames, height, width, dtype, compression)
+TIFF_STACKS = [
+	(300, 256, 256, "uint8", None),
+	(300, 256, 256, "uint8", "zlib"),
+	(300, 256, 256, "uint16", None),
+	(300, 256, 256, "uint16", "zlib"),
+] + ([
+	(3000, 512, 512, "uint8", None),
+	(3000, 512, 512, "uint8", "zlib"),
+] if FULL else [])
+
+SAMPLE_INTERVAL = 0.14	# seconds per sample, as in VasoTracker recordings
+
+def data_dir():
+	path = os.environ.get("VASO_BENCH_DATA") or os.path.join(tempfile.gettempdir(), "vasoanalyzer-bench")
+	os.makedirs(path, exist_ok=True)
+	return path
+
+def trace_arrays(n_samples, seed=0):
+	"""Time and inner/outer diameter arrays with slow tone changes plus noise."""
+	rng = np.random.default_rng(seed)
+	t = np.arange(n_samples) * SAMPLE_INTERVAL
+	tone = 120 + 25 * np.sin(t / 300.0) - 15 * (np.sin(t / 47.0) > 0.8)
+	inner = tone + rng.normal(0, 0.8, n_samples)
+	outer = inner + 40 + rng.normal(0, 0.5, n_samples)
+	return t, inner, outer
+
+def event_arrays(n_events, duration):
+	"""Evenly spaced event labels, times (s) and frame numbers over ``duration``."""
+	times = np.linspace(0, duration, n_events + 2)[1:-1].round(2)
+	labels = [f"Event {i + 1}" for i in range(n_events)]
+	frames = (times / SAMPLE_INTERVAL).astype(int)
+	return labels, times, frames
+
+def trace_csv(n_samples):
+	"""Path to a trace CSV with ``n_samples`` rows (and its ``_table.csv``)."""
+	import pandas as pd
+
+	path = os.path.join(data_dir(), f"trace_{n_samples}.csv")
+	if not os.path.exists(path):
+		t, inner, outer = trace_arrays(n_samples)
+		pd.DataFrame({
+			"Time (s)": t,
+			"Inner Diameter": inner,
+			"Outer Diameter": outer,
+		}).to_csv(path, index=False, float_format="%.3f")
+		event_csv(min(50, max(1, n_samples // 1000)), t[-1], path.replace(".csv", "_table.csv"))
+	return path
+
+def event_csv(n_events, duration, path=None):
+	"""Path to a VasoTracker-style ``_table.csv`` with ``n_events`` rows."""
+	import pandas as pd
+
+	path = path or os.path.join(data_dir(), f"events_{n_events}_table.csv")
+	if not os.path.exists(path):
+		labels, times, frames = event_arrays(n_events, duration)
+		pd.DataFrame({"Label": labels, "Time": times, "Frame": frames}).to_csv(path, index=False)
+	return path
+
+def tiff_stack(frames, height, width, dtype, compression):
+	"""Path to a stack with one JSON description per page, like VasoTracker's _Result.tif."""
+	import tifffile
+
+	name = f"stack_{frames}x{height}x{width}_{dtype}_{compression or 'raw'}.tif"
+	path = os.path.join(data_dir(), name)
+	if not os.path.exists(path):
+		rng = np.random.default_rng(1)
+		info = np.iinfo(dtype)
+		frame = rng.integers(0, info.max, (height, width), dtype=dtype)
+		with tifffile.TiffWriter(path) as tif:
+			for i in range(frames):
+				tif.write(
+					np.roll(frame, i, axis=1),
+					compression=compression,
+					description=json.dumps({"FrameNumber": i, "Time": round(i * SAMPLE_INTERVAL, 3)}),
+					metadata=None,
+					contiguous=False,
+				)
+	return path
+
+def excel_template(n_rows):
+	"""Path to a template workbook with event descriptions in column A."""
+	from openpyxl import Workbook
+
+	path = os.path.join(data_dir(), f"template_{n_rows}.xlsx")
+	if not os.path.exists(path):
+		wb = Workbook()
+		ws = wb.active
+		ws["A1"] = "Protocol"
+		for i in range(n_rows):
+			ws[f"A{i + 3}"] = f"Event {i + 1}"
+		wb.save(path)
+	return path
@@ -12,11 +12,16 @@ a = Analysis(
     pathex=[project_dir],
     binaries=[],
     datas=[
-        ('vasoanalyzer/splash_image_base64.txt', 'vasoanalyzer'),
+        ('vasoanalyzer/VasoAnalyzer Splash Screen.png', 'vasoanalyzer'),
         ('vasoanalyzer/VasoAnalyzerIcon.icns', 'vasoanalyzer'),
         ('vasoanalyzer/VasoAnalyzerIcon.ico', 'vasoanalyzer'),
     ],
-    hiddenimports=['tkinter', 'tkinter.filedialog', 'tkinter.messagebox', 'PIL._tkinter_finder'],  # Add tkinter dependencies
+    hiddenimports=[
+        'tkinter', 'tkinter.filedialog', 'tkinter.messagebox', 'PIL._tkinter_finder',  # Add tkinter dependencies
+        # Imported by name at runtime (see vasoanalyzer/startup.py)
+        'vasoanalyzer.gui', 'vasoanalyzer.trace_loader', 'vasoanalyzer.event_loader',
+        'vasoanalyzer.tiff_loader', 'vasoanalyzer.excel_mapper', 'vasoanalyzer.plot_style_dialog',
+    ],
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
@@ -1,31 +1,48 @@
 # ===== Main Launcher =====
 import sys
 import os
-import base64
+import multiprocessing
+
+# Only Qt is imported up front; matplotlib, pandas, tifffile and openpyxl are
+# imported when the window is built or on the background warm-up thread.
+from vasoanalyzer import startup
 from PyQt5.QtWidgets import QApplication, QSplashScreen
-from PyQt5.QtGui import QPixmap
+from PyQt5.QtGui import QPixmap, QIcon
 from PyQt5.QtCore import Qt, QTimer
-import re
-from PyQt5.QtWidgets import QFileDialog, QMessageBox
-from PyQt5.QtGui import QIcon
-
-from vasoanalyzer.gui import VasoAnalyzerApp
-import matplotlib
-import matplotlib.pyplot as plt
-from matplotlib import rcParams
-from matplotlib.backends.backend_qt5 import MainWindow
-
-# ===== Embedded Splash Image =====
-# Resolve base64 splash path for source vs. PyInstaller bundle
+startup.mark("Qt imported")
+
+# ===== Splash Image =====
+# Resolve splash path for source vs. PyInstaller bundle
 if hasattr(sys, "_MEIPASS"):
 	base_path = os.path.join(sys._MEIPASS, "vasoanalyzer")
 else:
 	base_path = os.path.join(os.path.dirname(__file__), "vasoanalyzer")
 
-splash_file = os.path.join(base_path, "splash_image_base64.txt")
+splash_file = os.path.join(base_path, "VasoAnalyzer Splash Screen.png")
+
+# ===== Profiling flags =====
+def parse_profiling_args(argv):
+	"""Strip --profile / --profile-trace <path> from argv and enable profiling."""
+	from vasoanalyzer.profiling import PROFILER
+
+	remaining = []
+	args = iter(argv)
+	for arg in args:
+		if arg == "--profile":
+			PROFILER.enable()
+		elif arg == "--profile-trace":
+			PROFILER.enable(next(args, "vasoanalyzer_trace.json"))
+		elif arg.startswith("--profile-trace="):
+			PROFILER.enable(arg.split("=", 1)[1])
+		else:
+			remaining.append(arg)
+	return remaining
 
 # ===== Helper to fix Matplotlib dialogs =====
 def fix_matplotlib_dialogs():
+	import matplotlib.pyplot as plt
+	from matplotlib.backends.backend_qt5 import MainWindow
+
 	for fig_num in plt.get_fignums():
 		fig = plt.figure(fig_num)
 		window = fig.canvas.manager.window
@@ -54,7 +71,8 @@ def fix_matplotlib_dialogs():
 
 class VasoAnalyzerLauncher:
 	def __init__(self):
-		self.app = QApplication(sys.argv)
+		self.app = QApplication(parse_profiling_args(sys.argv))
+		startup.mark("QApplication created")
 
 		# ===== Platform-specific icon =====
 		if sys.platform.startswith("win"):
@@ -97,55 +115,61 @@ class VasoAnalyzerLauncher:
 			}
 		""")
 
-		# === Matplotlib rcParams Patch for Plot Styling ===
-		rcParams.update({
-			'axes.labelcolor': 'black',
-			'xtick.color': 'black',
-			'ytick.color': 'black',
-			'text.color': 'black',
-			'axes.facecolor': 'white',
-			'figure.facecolor': 'white',
-			'savefig.facecolor': 'white',
-			'figure.edgecolor': 'white',
-			'savefig.edgecolor': 'white',
-		})
-
-		# === Load and Show Splash Screen from Embedded Data ===
-		try:
-			with open(splash_file, 'r') as f:
-				splash_base64 = f.read().strip()
-			splash_data = base64.b64decode(splash_base64)
-			splash_pix = QPixmap()
-			splash_pix.loadFromData(splash_data)
-
-			if splash_pix.isNull():
-				print("⚠️ Splash image could not be loaded from embedded data.")
-				self.start_main_app()
-			else:
-				splash_pix = splash_pix.scaled(400, 400, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-				self.splash = QSplashScreen(splash_pix, Qt.WindowStaysOnTopHint)
-				self.splash.setMask(splash_pix.mask())
-				self.splash.show()
-
-				QTimer.singleShot(2500, self.start_main_app)
-		except Exception as e:
-			print(f"⚠️ Error loading splash image: {e}")
-			self.start_main_app()
+		# === Show Splash Screen straight from the PNG ===
+		splash_pix = QPixmap(splash_file)
+		if splash_pix.isNull():
+			print("⚠️ Splash image could not be loaded.")
+		else:
+			splash_pix = splash_pix.scaled(400, 400, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+			self.splash = QSplashScreen(splash_pix, Qt.WindowStaysOnTopHint)
+			self.splash.setMask(splash_pix.mask())
+			self.splash.show()
+			self.app.processEvents()
+		startup.mark("splash shown")
+
+		# Build the main window as soon as the event loop is running
+		QTimer.singleShot(0, self.start_main_app)
 
 	def start_main_app(self):
-		if hasattr(self, 'splash'):
-			self.splash.close()
 		try:
 			print("🚀 Attempting to create VasoAnalyzerApp window...")
+			startup.timed_import("matplotlib")
+			from matplotlib import rcParams
+
+			# === Matplotlib rcParams Patch for Plot Styling ===
+			rcParams.update({
+				'axes.labelcolor': 'black',
+				'xtick.color': 'black',
+				'ytick.color': 'black',
+				'text.color': 'black',
+				'axes.facecolor': 'white',
+				'figure.facecolor': 'white',
+				'savefig.facecolor': 'white',
+				'figure.edgecolor': 'white',
+				'savefig.edgecolor': 'white',
+			})
+
+			VasoAnalyzerApp = startup.timed_import("vasoanalyzer.gui").VasoAnalyzerApp
 			self.window = VasoAnalyzerApp()
 			self.window.show()
+			if hasattr(self, 'splash'):
+				self.splash.finish(self.window)
+			startup.mark("main window shown")
 			print("✅ Main window shown successfully!")
 		except Exception as e:
+			if hasattr(self, 'splash'):
+				self.splash.close()
 			print(f"❗ Error launching main window: {e}")
+			return
+
+		# Pull in the remaining heavy modules while the user picks a file
+		startup.warm_up_in_background(on_done=startup.report_import_times)
 
 	def run(self):
 		sys.exit(self.app.exec_())
 
 if __name__ == "__main__":
+	# Figure exports run in spawned worker processes (vasoanalyzer.export_jobs)
+	multiprocessing.freeze_support()
 	launcher = VasoAnalyzerLauncher()
 	launcher.run()
\ No newline at end of file
@@ -0,0 +1,212 @@
+import atexit
+import hashlib
+import os
+import sys
+
+APP_NAME = "VasoAnalyzer"
+# Bytes hashed from each end of a file for its identity (see file_key)
+FILE_KEY_SAMPLE = 1 << 16
+
+def user_cache_dir(*parts):
+	"""Per-user cache directory (created on demand), e.g. ``~/.cache/VasoAnalyzer/<parts>``.
+
+	Set ``VASOANALYZER_CACHE_DIR`` to put it elsewhere.
+	"""
+	root = os.environ.get("VASOANALYZER_CACHE_DIR")
+	if not root:
+		if sys.platform == "win32":
+			base = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~\\AppData\\Local")
+		elif sys.platform == "darwin":
+			base = os.path.expanduser("~/Library/Caches")
+		else:
+			base = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+		root = os.path.join(base, APP_NAME)
+	path = os.path.join(root, *parts)
+	os.makedirs(path, exist_ok=True)
+	return path
+
+def file_key(path):
+	"""Content key of ``path``: a hash of its size and its first and last FILE_KEY_SAMPLE bytes.
+
+	Stable across renames, moves and copies, and cheap for multi-GB stacks;
+	any rewrite of the file (a new recording) changes it.
+	"""
+	size = os.path.getsize(path)
+	digest = hashlib.sha1(str(size).encode())
+	with open(path, "rb") as f:
+		digest.update(f.read(FILE_KEY_SAMPLE))
+		if size > FILE_KEY_SAMPLE:
+			f.seek(max(FILE_KEY_SAMPLE, size - FILE_KEY_SAMPLE))
+			digest.update(f.read(FILE_KEY_SAMPLE))
+	return digest.hexdigest()
+
+# ===== Persistent product cache =====
+# Parsed traces, event tables and TIFF metadata/previews are stored per
+# source file in the user cache dir so reopening a recording skips parsing.
+# An entry is a directory named by the SHA-1 of the source file's identity
+# (absolute path, size, mtime) plus the loader's parameters, holding
+# meta.json and one .npy per array; arrays are memory-mapped back on a hit.
+# Entries are written to a temporary directory and renamed into place, so a
+# crash never leaves a half-written entry. The mtime of meta.json is the
+# entry's last use: hits touch it, and when the cache outgrows its budget the
+# least recently used entries are deleted.
+
+CACHE_FORMAT = 1			# Bump when the layout of cached products changes
+DEFAULT_CACHE_MB = 1024		# Size budget; VASOANALYZER_CACHE_MB overrides (0 disables caching)
+
+def json_default(value):
+	"""``json.dump`` fallback for numpy scalars/arrays, bytes and anything else (as str)."""
+	import numpy as np
+
+	if isinstance(value, np.generic):
+		return value.item()
+	if isinstance(value, np.ndarray):
+		return value.tolist()
+	if isinstance(value, bytes):
+		return value.decode("latin-1")
+	return str(value)
+
+def _tree_size(path):
+	total = 0
+	for entry in os.scandir(path):
+		if entry.is_file(follow_symlinks=False):
+			total += entry.stat().st_size
+	return total
+
+class DiskCache:
+	"""Size-bounded, least-recently-used store of ``(meta, arrays)`` products on disk.
+
+	``meta`` is anything JSON can hold (numpy scalars, arrays and other
+	values are converted as in sessions); ``arrays`` is ``{name: ndarray}``
+	and comes back as read-only memory maps. ``stats`` counts hits, misses,
+	writes and evictions for this process.
+	"""
+
+	def __init__(self, name="products", max_bytes=None, root=None):
+		if max_bytes is None:
+			max_bytes = int(float(os.environ.get("VASOANALYZER_CACHE_MB", DEFAULT_CACHE_MB)) * 1024 * 1024)
+		self.max_bytes = max_bytes
+		self.path = os.path.join(root, name) if root else user_cache_dir(name)
+		os.makedirs(self.path, exist_ok=True)
+		self.stats = {"hits": 0, "misses": 0, "writes": 0, "evictions": 0}
+
+	@property
+	def enabled(self):
+		return self.max_bytes > 0
+
+	def key(self, file_path, *params):
+		"""Key for a product of ``file_path`` made with ``params`` (any repr-able values)."""
+		info = os.stat(file_path)
+		identity = (CACHE_FORMAT, os.path.abspath(file_path), info.st_size, info.st_mtime_ns, params)
+		return hashlib.sha1(repr(identity).encode()).hexdigest()
+
+	def get(self, key):
+		"""``(meta, arrays)`` stored under ``key``, or None."""
+		import json
+		import numpy as np
+
+		entry = os.path.join(self.path, key)
+		meta_path = os.path.join(entry, "meta.json")
+		if not self.enabled or not os.path.exists(meta_path):
+			self.stats["misses"] += 1
+			return None
+		try:
+			with open(meta_path) as f:
+				manifest = json.load(f)
+			arrays = {
+				name: np.load(os.path.join(entry, f"{i}.npy"), mmap_mode="r", allow_pickle=False)
+				for i, name in enumerate(manifest["arrays"])
+			}
+			os.utime(meta_path)
+		except (OSError, ValueError, KeyError) as e:
+			print(f"⚠️ Discarding unreadable cache entry {key}: {e}")
+			self.remove(key)
+			self.stats["misses"] += 1
+			return None
+		self.stats["hits"] += 1
+		return manifest["meta"], arrays
+
+	def put(self, key, meta, arrays=None):
+		"""Store ``meta`` and ``arrays`` under ``key`` (skipped if larger than the whole budget)."""
+		import json
+		import shutil
+		import tempfile
+		import numpy as np
+
+		arrays = arrays or {}
+		if not self.enabled or sum(np.asarray(a).nbytes for a in arrays.values()) > self.max_bytes:
+			return
+		tmp = tempfile.mkdtemp(prefix=".tmp-", dir=self.path)
+		try:
+			for i, values in enumerate(arrays.values()):
+				np.save(os.path.join(tmp, f"{i}.npy"), np.ascontiguousarray(values), allow_pickle=False)
+			with open(os.path.join(tmp, "meta.json"), "w") as f:
+				json.dump({"meta": meta, "arrays": list(arrays)}, f, default=json_default)
+			entry = os.path.join(self.path, key)
+			self.remove(key)
+			os.replace(tmp, entry)
+		except OSError as e:
+			print(f"⚠️ Could not write cache entry: {e}")
+			shutil.rmtree(tmp, ignore_errors=True)
+			return
+		self.stats["writes"] += 1
+		self.evict()
+
+	def remove(self, key):
+		import shutil
+
+		shutil.rmtree(os.path.join(self.path, key), ignore_errors=True)
+
+	def entries(self):
+		"""``[(last_used, size, key)]`` of all complete entries, least recently used first."""
+		entries = []
+		for entry in os.scandir(self.path):
+			meta_path = os.path.join(entry.path, "meta.json")
+			if entry.name.startswith(".") or not os.path.exists(meta_path):
+				continue
+			try:
+				entries.append((os.stat(meta_path).st_mtime, _tree_size(entry.path), entry.name))
+			except OSError:
+				continue
+		return sorted(entries)
+
+	def size(self):
+		return sum(size for _, size, _ in self.entries())
+
+	def evict(self, max_bytes=None):
+		"""Delete least recently used entries until the cache fits in ``max_bytes``."""
+		budget = self.max_bytes if max_bytes is None else max_bytes
+		entries = self.entries()
+		total = sum(size for _, size, _ in entries)
+		for _, size, key in entries:
+			if total <= budget:
+				break
+			self.remove(key)
+			total -= size
+			self.stats["evictions"] += 1
+
+	def clear(self):
+		self.evict(0)
+
+	def summary(self):
+		stats = self.stats
+		lookups = stats["hits"] + stats["misses"]
+		rate = 100.0 * stats["hits"] / lookups if lookups else 0.0
+		return (
+			f"{stats['hits']} hits, {stats['misses']} misses ({rate:.0f}% hit rate), "
+			f"{stats['writes']} writes, {stats['evictions']} evictions; "
+			f"{self.size() / 1e6:.1f} of {self.max_bytes / 1e6:.0f} MB used"
+		)
+
+_default_cache = None
+
+def default_cache():
+	"""The shared product cache used by the loaders."""
+	global _default_cache
+	if _default_cache is None:
+		from vasoanalyzer.profiling import PROFILER
+
+		_default_cache = DiskCache()
+		if PROFILER.enabled:
+			atexit.register(lambda: print(f"🗄 Cache: {_default_cache.summary()}"))
+	return _default_cache
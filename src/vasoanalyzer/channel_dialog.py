@@ -0,0 +1,35 @@
+from PyQt5.QtWidgets import (
+	QDialog, QVBoxLayout, QHBoxLayout, QLabel, QCheckBox, QPushButton
+)
+
+class ChannelSelectionDialog(QDialog):
+	"""Pick which extra trace columns (outer diameter, pressure, …) to load and plot."""
+
+	def __init__(self, parent, columns, selected=()):
+		super().__init__(parent)
+		self.setWindowTitle("Select Channels")
+		self.setMinimumWidth(320)
+
+		main_layout = QVBoxLayout()
+		self.setLayout(main_layout)
+		main_layout.addWidget(QLabel("Time and Inner Diameter are always loaded.\nAlso load and plot:"))
+
+		self.checkboxes = []
+		for column in columns:
+			checkbox = QCheckBox(column)
+			checkbox.setChecked(column in selected)
+			main_layout.addWidget(checkbox)
+			self.checkboxes.append(checkbox)
+
+		btn_row = QHBoxLayout()
+		self.ok_btn = QPushButton("Load")
+		self.cancel_btn = QPushButton("Cancel")
+		self.ok_btn.clicked.connect(self.accept)
+		self.cancel_btn.clicked.connect(self.reject)
+		btn_row.addStretch()
+		btn_row.addWidget(self.cancel_btn)
+		btn_row.addWidget(self.ok_btn)
+		main_layout.addLayout(btn_row)
+
+	def selected_columns(self):
+		return [checkbox.text() for checkbox in self.checkboxes if checkbox.isChecked()]
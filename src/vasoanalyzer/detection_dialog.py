@@ -0,0 +1,141 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from PyQt5.QtCore import Qt, QTimer
+from PyQt5.QtWidgets import (
+	QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QFormLayout, QDoubleSpinBox,
+	QTableWidget, QTableWidgetItem, QMessageBox
+)
+
+from vasoanalyzer.event_detection import (
+	detect_events, event_label, DEFAULT_THRESHOLD, DEFAULT_MIN_STEP_UM,
+	DEFAULT_WINDOW_SEC, DEFAULT_MIN_GAP_SEC
+)
+
+DETECTION_POLL_MS = 100
+
+class EventDetectionDialog(QDialog):
+	"""Find candidate events in the diameter trace and pick which to add.
+
+	Detection runs on a worker thread (NumPy releases the GIL for the heavy
+	parts) so the window stays responsive on long traces. ``on_preview`` is
+	called with the candidate times whenever they change, e.g. to mark them
+	on the plot.
+	"""
+
+	def __init__(self, parent, time_trace, diam_trace, on_preview=None):
+		super().__init__(parent)
+		self.setWindowTitle("Detect Events")
+		self.setMinimumWidth(460)
+		self.time_trace = time_trace
+		self.diam_trace = diam_trace
+		self.on_preview = on_preview
+		self.candidates = []			# [(time, step, score)]
+		self._executor = ThreadPoolExecutor(max_workers=1)
+		self._future = None
+		self._timer = QTimer(self)
+		self._timer.setInterval(DETECTION_POLL_MS)
+		self._timer.timeout.connect(self.check_detection)
+
+		main_layout = QVBoxLayout(self)
+		form = QFormLayout()
+		self.threshold = self.spin_box(1, 100, DEFAULT_THRESHOLD, 0.5, "Lower finds more (and weaker) steps")
+		self.min_step = self.spin_box(0, 500, DEFAULT_MIN_STEP_UM, 0.5, "Smallest diameter change to report (µm)")
+		self.window = self.spin_box(1, 600, DEFAULT_WINDOW_SEC, 5, "Mean diameter before/after each point is taken over this long (s)")
+		self.min_gap = self.spin_box(1, 3600, DEFAULT_MIN_GAP_SEC, 10, "Keep only the strongest step within this time (s)")
+		form.addRow("Sensitivity threshold:", self.threshold)
+		form.addRow("Min step (µm):", self.min_step)
+		form.addRow("Window (s):", self.window)
+		form.addRow("Min gap (s):", self.min_gap)
+		main_layout.addLayout(form)
+
+		detect_row = QHBoxLayout()
+		self.detect_btn = QPushButton("Detect")
+		self.detect_btn.clicked.connect(self.start_detection)
+		self.status_label = QLabel("")
+		detect_row.addWidget(self.detect_btn)
+		detect_row.addWidget(self.status_label)
+		detect_row.addStretch()
+		main_layout.addLayout(detect_row)
+
+		self.table = QTableWidget(0, 3)
+		self.table.setHorizontalHeaderLabels(["Event (uncheck to skip)", "Time (s)", "Step (µm)"])
+		self.table.horizontalHeader().setStretchLastSection(True)
+		main_layout.addWidget(self.table)
+
+		btn_row = QHBoxLayout()
+		self.add_btn = QPushButton("Add Checked Events")
+		self.add_btn.setEnabled(False)
+		self.add_btn.clicked.connect(self.accept)
+		self.cancel_btn = QPushButton("Cancel")
+		self.cancel_btn.clicked.connect(self.reject)
+		btn_row.addStretch()
+		btn_row.addWidget(self.cancel_btn)
+		btn_row.addWidget(self.add_btn)
+		main_layout.addLayout(btn_row)
+
+		self.start_detection()
+
+	def spin_box(self, low, high, value, step, tooltip):
+		box = QDoubleSpinBox()
+		box.setRange(low, high)
+		box.setSingleStep(step)
+		box.setValue(value)
+		box.setToolTip(tooltip)
+		return box
+
+	def start_detection(self):
+		if self._future is not None:
+			return
+		self.detect_btn.setEnabled(False)
+		self.status_label.setText("Detecting…")
+		self._future = self._executor.submit(
+			detect_events, self.time_trace, self.diam_trace,
+			threshold=self.threshold.value(), min_step=self.min_step.value(),
+			window_sec=self.window.value(), min_gap_sec=self.min_gap.value()
+		)
+		self._timer.start()
+
+	def check_detection(self):
+		if self._future is None or not self._future.done():
+			return
+		self._timer.stop()
+		future, self._future = self._future, None
+		self.detect_btn.setEnabled(True)
+		try:
+			times, steps, scores = future.result()
+		except Exception as e:
+			self.status_label.setText("")
+			QMessageBox.warning(self, "Detection Error", f"Event detection failed:\n{e}")
+			return
+		self.candidates = list(zip(times, steps, scores))
+		self.status_label.setText(f"{len(self.candidates)} candidate events")
+		self.populate_table()
+		if self.on_preview:
+			self.on_preview(list(times))
+
+	def populate_table(self):
+		self.table.setRowCount(len(self.candidates))
+		for row, (t, step, _) in enumerate(self.candidates):
+			label_item = QTableWidgetItem(event_label(step))
+			label_item.setFlags(label_item.flags() | Qt.ItemIsUserCheckable | Qt.ItemIsEditable)
+			label_item.setCheckState(Qt.Checked)
+			self.table.setItem(row, 0, label_item)
+			for col, value in ((1, f"{t:.2f}"), (2, f"{step:+.2f}")):
+				item = QTableWidgetItem(value)
+				item.setFlags(item.flags() & ~Qt.ItemIsEditable)
+				self.table.setItem(row, col, item)
+		self.table.resizeColumnsToContents()
+		self.add_btn.setEnabled(bool(self.candidates))
+
+	def accepted_events(self):
+		"""``[(label, time)]`` of the checked candidates (labels as edited)."""
+		return [
+			(self.table.item(row, 0).text().strip() or event_label(step), float(t))
+			for row, (t, step, _) in enumerate(self.candidates)
+			if self.table.item(row, 0).checkState() == Qt.Checked
+		]
+
+	def done(self, result):
+		self._timer.stop()
+		self._executor.shutdown(wait=False)
+		super().done(result)
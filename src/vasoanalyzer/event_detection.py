@@ -0,0 +1,100 @@
+import bisect
+
+import numpy as np
+
+from vasoanalyzer.profiling import profiled
+
+# Step detection runs on the trace averaged down to at most DETECTION_BINS
+# points: responses to drugs and pressure steps last tens of seconds, so
+# the detail lost is far below what the detector looks at, and the cost
+# stays flat however long the recording is.
+DETECTION_BINS = 20000
+DEFAULT_THRESHOLD = 8.0		# Sensitivity: step size in noise standard errors (lower finds more)
+DEFAULT_MIN_STEP_UM = 2.0	# Ignore steps smaller than this, however clean
+DEFAULT_WINDOW_SEC = 20.0	# Compare the mean of this long before and after each point
+DEFAULT_MIN_GAP_SEC = 60.0	# Keep only the strongest step within this distance
+
+def bin_means(time_trace, values, n_bins=DETECTION_BINS):
+	"""Average ``time_trace``/``values`` over consecutive blocks to at most ``n_bins`` points.
+
+	NaN samples are ignored; blocks with no finite sample are bridged by
+	linear interpolation.
+	"""
+	time_trace = np.asarray(time_trace, dtype=float)
+	values = np.asarray(values, dtype=float)
+	block = max(1, -(-len(values) // n_bins))
+	n = -(-len(values) // block) * block
+	t = np.pad(time_trace, (0, n - len(time_trace)), constant_values=np.nan).reshape(-1, block)
+	v = np.pad(values, (0, n - len(values)), constant_values=np.nan).reshape(-1, block)
+
+	finite = np.isfinite(v)
+	counts = finite.sum(axis=1)
+	means = np.where(finite, v, 0.0).sum(axis=1) / np.maximum(counts, 1)
+	t_means = np.nanmean(t, axis=1)
+	if counts.any() and not counts.all():
+		means[counts == 0] = np.interp(t_means[counts == 0], t_means[counts > 0], means[counts > 0])
+	return t_means, means
+
+def step_scores(values, window):
+	"""Mean of the ``window`` points after each index minus the mean of the ``window`` before it.
+
+	Returns ``(steps, scores)``; scores are steps in units of the standard
+	error of that difference, with the noise level estimated robustly from
+	the point-to-point differences (insensitive to slow drift and the steps
+	themselves). Indices closer than ``window`` to either end score 0.
+	"""
+	n = len(values)
+	steps = np.zeros(n)
+	if n <= 2 * window:
+		return steps, steps.copy()
+	csum = np.concatenate(([0.0], np.cumsum(values)))
+	i = np.arange(window, n - window + 1)
+	steps[window:n - window + 1] = ((csum[i + window] - csum[i]) - (csum[i] - csum[i - window])) / window
+
+	sigma = 1.4826 * np.median(np.abs(np.diff(values))) / np.sqrt(2)
+	standard_error = max(sigma, 1e-9) * np.sqrt(2.0 / window)
+	return steps, np.abs(steps) / standard_error
+
+@profiled("detect_events")
+def detect_events(time_trace, diam_trace, threshold=DEFAULT_THRESHOLD, min_step=DEFAULT_MIN_STEP_UM,
+		window_sec=DEFAULT_WINDOW_SEC, min_gap_sec=DEFAULT_MIN_GAP_SEC, n_bins=DETECTION_BINS):
+	"""Propose events where the diameter steps up or down.
+
+	Returns ``(times, steps, scores)`` sorted by time: the time of each
+	change, its size in µm (negative = constriction) and its strength in
+	noise standard errors. A point is a candidate when its step score is a
+	local maximum, at least ``threshold`` and at least ``min_step`` µm;
+	within ``min_gap_sec`` only the strongest candidate is kept.
+	"""
+	empty = np.array([]), np.array([]), np.array([])
+	if len(diam_trace) < 3:
+		return empty
+	t, d = bin_means(time_trace, diam_trace, n_bins)
+	dt = np.median(np.diff(t)) if len(t) > 1 else 0
+	if not dt > 0:
+		return empty
+	window = max(1, int(round(window_sec / dt)))
+	steps, scores = step_scores(d, window)
+
+	interior = scores[1:-1]
+	peaks = np.flatnonzero(
+		(interior >= scores[:-2]) & (interior > scores[2:])
+		& (interior >= threshold) & (np.abs(steps[1:-1]) >= min_step)
+	) + 1
+	if not len(peaks):
+		return empty
+
+	# Strongest first; drop any peak within min_gap of one already kept
+	kept, kept_times = [], []		# kept_times stays sorted for bisect
+	for idx in peaks[np.argsort(-scores[peaks], kind="stable")]:
+		pos = bisect.bisect_left(kept_times, t[idx])
+		neighbours = kept_times[max(0, pos - 1):pos + 1]
+		if all(abs(t[idx] - other) >= min_gap_sec for other in neighbours):
+			kept_times.insert(pos, t[idx])
+			kept.append(idx)
+	kept = np.sort(kept)
+	return t[kept], steps[kept], scores[kept]
+
+def event_label(step):
+	"""Default label for a detected step, e.g. ``"Auto ↓ 12.3 µm"``."""
+	return f"Auto {'↓' if step < 0 else '↑'} {abs(step):.1f} µm"
@@ -1,13 +1,34 @@
 import pandas as pd
 
-def load_events(file_path):
+from vasoanalyzer.profiling import profiled
+
+@profiled("load_events")
+def load_events(file_path, cache=None):
+	"""``(labels, times_sec, frames)`` from an event table (cached like ``load_trace``)."""
+	from vasoanalyzer.cache import default_cache
+
+	cache = default_cache() if cache is None else cache
+	key = None
+	if cache:
+		key = cache.key(file_path, "events")
+		cached = cache.get(key)
+		if cached is not None:
+			meta = cached[0]
+			return meta["labels"], meta["times"], meta["frames"]
+
 	# Try to auto-detect delimiter
 	with open(file_path, 'r') as f:
 		first_line = f.readline()
 		delimiter = ',' if ',' in first_line else '\t'
 
 	df = pd.read_csv(file_path, delimiter=delimiter)
+	labels, times, frames = parse_events(df)
+	if key is not None:
+		cache.put(key, {"labels": labels, "times": times, "frames": frames})
+	return labels, times, frames
 
+def parse_events(df):
+	"""Extract ``(labels, times_sec, frames)`` from an event table DataFrame."""
 	# Auto-detect columns
 	label_col = next((col for col in df.columns if 'label' in col.lower()), df.columns[0])
 	time_col  = next((col for col in df.columns if 'time' in col.lower()), df.columns[1])
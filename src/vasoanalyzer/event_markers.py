@@ -0,0 +1,80 @@
+import numpy as np
+from matplotlib.collections import LineCollection
+
+from vasoanalyzer.labels import CachedText, LabelSet
+
+# Event markers on the trace plot: every dashed vertical line is a segment
+# of one LineCollection and every label is stamped by one LabelSet, so a plot
+# with hundreds of events costs two artists to draw and restyle. Labels hang
+# from just below the top of the view; their height is worked out when the
+# axes draw, so zooming or panning needs no per-label updates.
+
+class EventLabels(LabelSet):
+	"""Event labels at their event's x, just below the top of the current y-range."""
+
+	def anchors(self):
+		y_min, y_max = self.template.axes.get_ylim()
+		return self.xs, np.full(len(self.xs), min(y_max - 5, y_max * 0.95))
+
+class EventMarkers:
+	"""Events of ``ax`` as ``(label, x)``: one line collection and one label set."""
+
+	def __init__(self, ax):
+		self.label_style = {"fontsize": 8}
+		self.attach(ax)
+
+	def attach(self, ax):
+		"""Create the (empty) artists on ``ax``, e.g. after ``ax.clear()`` removed them."""
+		self.ax = ax
+		self.lines = LineCollection([], colors='black', linestyles='--', linewidths=0.8, transform=ax.get_xaxis_transform())
+		ax.add_collection(self.lines, autolim=False)
+		template = CachedText(
+			0, 0, "",
+			rotation=90,
+			verticalalignment='top',
+			horizontalalignment='right',
+			color='black',
+			clip_on=True,
+			transform=ax.transData,
+			**self.label_style
+		)
+		self.labels = EventLabels(ax, template)
+
+	def __len__(self):
+		return len(self.labels)
+
+	@property
+	def xs(self):
+		return self.labels.xs
+
+	def positions(self):
+		"""``[(label, x)]`` with plain floats (plot documents)."""
+		return [(label, float(x)) for label, x in zip(self.labels.strings, self.labels.xs)]
+
+	def _update_lines(self):
+		xs = self.labels.xs
+		self.lines.set_segments(np.stack([np.column_stack([xs, np.zeros_like(xs)]), np.column_stack([xs, np.ones_like(xs)])], axis=1))
+
+	def set_events(self, labels, xs):
+		xs = np.asarray(xs, dtype=float)
+		self.labels.set_labels(labels, xs, np.zeros_like(xs))
+		self._update_lines()
+
+	def insert(self, index, label, x):
+		self.labels.insert(index, label, x, 0.0)
+		self._update_lines()
+
+	def append(self, label, x):
+		self.insert(len(self), label, x)
+
+	def remove(self, index):
+		self.labels.remove_label(index)
+		self._update_lines()
+
+	def clear(self):
+		self.set_events([], [])
+
+	def set_style(self, label_style):
+		"""Label font (``fontsize``, ``fontname``, …) for current and future events."""
+		self.label_style = dict(label_style)
+		self.labels.set_style(**self.label_style)
@@ -0,0 +1,51 @@
+import numpy as np
+
+from vasoanalyzer.profiling import profiled
+
+def nearest_index(time_trace, t):
+	"""Index of the sample nearest to ``t`` (scalar or array) in a sorted time array.
+
+	Equivalent to ``np.argmin(np.abs(time_trace - t))`` per query, but
+	O(log n) via binary search instead of a full pass over the trace.
+	"""
+	time_trace = np.asarray(time_trace)
+	t = np.asarray(t, dtype=float)
+	right = np.clip(np.searchsorted(time_trace, t), 1, len(time_trace) - 1)
+	left = right - 1
+	use_left = np.abs(time_trace[left] - t) <= np.abs(time_trace[right] - t)
+	return np.where(use_left, left, right)
+
+def sample_before_next(time_trace, values, times, offset_sec=2):
+	"""``values`` sampled ``offset_sec`` before each next event; the last event takes the final sample."""
+	time_trace = np.asarray(time_trace)
+	values = np.asarray(values)
+	n_events = len(times)
+	idx_pre = np.full(n_events, len(values) - 1)
+	if n_events > 1 and len(time_trace) > 1:
+		idx_pre[:-1] = nearest_index(time_trace, np.asarray(times[1:], dtype=float) - offset_sec)
+	return values[idx_pre]
+
+@profiled("build_event_table")
+def build_event_table(time_trace, diam_trace, labels, times, frames=None, offset_sec=2):
+	"""Build ``(label, time, frame, ID)`` rows for the event table.
+
+	Each event's ID is the diameter sampled ``offset_sec`` before the next
+	event; the last event uses the final sample of the trace. When the
+	event file has no frame column the event time is used as the frame.
+	"""
+	n_events = len(times)
+	if n_events == 0:
+		return []
+
+	diam_pre = sample_before_next(time_trace, diam_trace, times, offset_sec)
+
+	rows = []
+	for i in range(n_events):
+		frame_number = frames[i] if frames is not None else times[i]
+		rows.append((
+			labels[i],
+			round(times[i], 2),
+			frame_number,
+			round(diam_pre[i], 2)
+		))
+	return rows
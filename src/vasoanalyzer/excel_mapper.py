@@ -1,9 +1,19 @@
 from PyQt5.QtWidgets import (
 	QDialog, QVBoxLayout, QLabel, QPushButton, QFileDialog, QComboBox,
-	QTableWidget, QTableWidgetItem, QHBoxLayout, QMessageBox
+	QTableWidget, QTableWidgetItem, QHBoxLayout, QMessageBox, QCheckBox, QSpinBox
 )
-from openpyxl import load_workbook
-import os, sys, subprocess, time
+from PyQt5.QtGui import QColor, QKeySequence
+from PyQt5.QtCore import QTimer
+from openpyxl import load_workbook, Workbook
+import os, re, sys, subprocess, time
+
+from vasoanalyzer.profiling import profiled
+from vasoanalyzer.undo import UndoStack, SetCells
+
+# Fields of an event-table row, in order: (label, time, frame, ID)
+EVENT_FIELDS = ("EventLabel", "Time (s)", "Frame", "ID (\u00b5m)")
+FUZZY_CUTOFF = 0.75		# difflib ratio needed for a fuzzy label -> description match
+SAVE_DELAY_MS = 1000	# Mapping edits within this delay are saved to the workbook together
 
 class ExcelMappingDialog(QDialog):
 	def __init__(self, parent, event_data):
@@ -15,7 +25,12 @@ class ExcelMappingDialog(QDialog):
 		self.ws = None
 		self.current_row = 3
 		self.selected_column = None
-		self.history = []
+		self.undo_stack = UndoStack(on_change=self.update_undo_buttons)
+		self.save_timer = QTimer(self)		# Coalesces workbook saves while mapping/undoing
+		self.save_timer.setSingleShot(True)
+		self.save_timer.setInterval(SAVE_DELAY_MS)
+		self.save_timer.timeout.connect(self.save_workbook)
+		self.auto_matched = False	# Rows were found from column-A labels (auto-update does the same)
 
 		self.layout = QVBoxLayout(self)
 		self.instructions = QLabel("Step 1: Select Excel file")
@@ -34,6 +49,12 @@ class ExcelMappingDialog(QDialog):
 		self.cell_label = QLabel("Next Excel Cell: N/A")
 		self.layout.addWidget(self.cell_label)
 
+		self.auto_map_button = QPushButton("Auto-Map by Label…")
+		self.auto_map_button.setToolTip("Match every event to the row whose column-A description has its label, preview, then write all at once")
+		self.auto_map_button.setEnabled(False)
+		self.auto_map_button.clicked.connect(self.auto_map_events)
+		self.layout.addWidget(self.auto_map_button)
+
 		self.event_table = QTableWidget()
 		self.event_table.setColumnCount(4)
 		self.event_table.setHorizontalHeaderLabels(["EventLabel", "Time (s)", "Frame", "ID (\u00b5m)"])
@@ -46,16 +67,22 @@ class ExcelMappingDialog(QDialog):
 		self.button_layout = QHBoxLayout()
 		self.skip_button = QPushButton("Skip")
 		self.skip_button.clicked.connect(self.skip_cell)
-		self.undo_button = QPushButton("Undo Last")
+		self.undo_button = QPushButton("Undo")
+		self.undo_button.setShortcut(QKeySequence.Undo)
 		self.undo_button.clicked.connect(self.undo_last)
+		self.redo_button = QPushButton("Redo")
+		self.redo_button.setShortcut(QKeySequence.Redo)
+		self.redo_button.clicked.connect(self.redo_last)
 		self.done_button = QPushButton("Done")
 		self.done_button.clicked.connect(self.finish_and_save)
 		self.button_layout.addWidget(self.skip_button)
 		self.button_layout.addWidget(self.undo_button)
+		self.button_layout.addWidget(self.redo_button)
 		self.button_layout.addWidget(self.done_button)
 		self.layout.addLayout(self.button_layout)
 
 		self.populate_event_table()
+		self.update_undo_buttons()
 
 	def populate_event_table(self):
 		self.event_table.setRowCount(len(self.event_data))
@@ -81,7 +108,8 @@ class ExcelMappingDialog(QDialog):
 				self.ws = self.wb.active
 				self.excel_path = path
 				self.column_selector.setEnabled(True)
-				self.instructions.setText("Step 2: Select column, then click events to assign")
+				self.auto_map_button.setEnabled(True)
+				self.instructions.setText("Step 2: Select column, then click events to assign (or Auto-Map by Label)")
 				self.update_cell_label()
 			except Exception as e:
 				QMessageBox.critical(self, "Error", f"Failed to load Excel file:\n{e}")
@@ -108,57 +136,484 @@ class ExcelMappingDialog(QDialog):
 			return
 		try:
 			col_letter = self.column_selector.currentText()
-			value_raw = self.event_table.item(row, 2).text()
+			value = self.event_value(row)
 			target_cell = f"{col_letter}{self.current_row}"
-			try:
-				value = float(value_raw)
-			except ValueError:
-				value = value_raw
-			prev_value = self.ws[target_cell].value
-			self.history.append((target_cell, prev_value))
-			self.ws[target_cell] = value
-			self.wb.save(self.excel_path)
-			self.current_row += 1
-			self.update_cell_label()
+			self.undo_stack.push(SetCells(self.ws, [(target_cell, self.ws[target_cell].value, value)], self.cells_changed))
 		except Exception as e:
 			QMessageBox.warning(self, "Mapping Error", f"Failed to assign value: {e}")
 
+	def event_value(self, row):
+		value_raw = self.event_table.item(row, 2).text()
+		try:
+			return float(value_raw)
+		except ValueError:
+			return value_raw
+
+	def auto_map_events(self):
+		if not self.ws or not self.column_selector.currentText():
+			return
+		labels = [self.event_table.item(i, 0).text() for i in range(self.event_table.rowCount())]
+		values = [self.event_value(i) for i in range(self.event_table.rowCount())]
+		changes = plan_mapping(self.ws, labels, values, self.column_selector.currentText())
+		preview = MappingPreviewDialog(self, changes)
+		if not preview.exec_():
+			return
+		try:
+			self.undo_stack.push(SetCells(
+				self.ws, [(change["cell"], change["old"], change["new"]) for change in changes],
+				self.cells_changed, text=f"Auto-map {len(changes)} events"
+			))
+		except Exception as e:
+			QMessageBox.warning(self, "Mapping Error", f"Failed to assign values: {e}")
+			return
+		self.auto_matched = True
+
 	def skip_cell(self):
 		self.current_row += 1
 		self.update_cell_label()
 
 	def undo_last(self):
-		if not self.history:
+		command = self.undo_stack.undo()
+		if command is None:
 			QMessageBox.information(self, "Undo", "Nothing to undo.")
 			return
-		cell, old_value = self.history.pop()
-		self.ws[cell] = old_value
-		self.wb.save(self.excel_path)
-		self.current_row = int(''.join(filter(str.isdigit, cell)))
+		# The undone cells are free again: continue mapping from the first of them
+		self.current_row = min(int(''.join(filter(str.isdigit, cell))) for cell, _, _ in command.changes)
+		self.update_cell_label()
+
+	def redo_last(self):
+		self.undo_stack.redo()
+
+	def cells_changed(self, cells):
+		"""Continue after the last written row; save once the edits pause."""
+		self.current_row = max(int(''.join(filter(str.isdigit, cell))) for cell in cells) + 1
 		self.update_cell_label()
+		self.save_timer.start()
+
+	def update_undo_buttons(self):
+		self.undo_button.setEnabled(self.undo_stack.can_undo())
+		self.redo_button.setEnabled(self.undo_stack.can_redo())
+		self.undo_button.setToolTip(f"Undo {self.undo_stack.undo_text()}")
+		self.redo_button.setToolTip(f"Redo {self.undo_stack.redo_text()}")
+
+	def save_workbook(self):
+		self.save_timer.stop()
+		try:
+			self.wb.save(self.excel_path)
+		except Exception as e:
+			QMessageBox.warning(self, "Save Error", f"Failed to save Excel file:\n{e}")
+
+	def done(self, result):
+		# Closing (Done, Esc or the window button) writes any edits not yet saved
+		if self.save_timer.isActive():
+			self.save_workbook()
+		super().done(result)
 
 	def finish_and_save(self):
 		if self.wb and self.excel_path:
 			try:
+				self.save_timer.stop()
 				self.wb.save(self.excel_path)
 				reopen_excel_file_crossplatform(self.excel_path)
 				self.accept()
 			except Exception as e:
 				QMessageBox.critical(self, "Error", f"Failed to save Excel file:\n{e}")
 
+class MappingPreviewDialog(QDialog):
+	"""Show the cells an auto-map would write (old -> new, and how each row was matched)."""
+
+	def __init__(self, parent, changes):
+		super().__init__(parent)
+		self.setWindowTitle("Preview Excel Mapping")
+		self.setMinimumWidth(640)
+		layout = QVBoxLayout(self)
+
+		counts = {}
+		for change in changes:
+			counts[change["how"]] = counts.get(change["how"], 0) + 1
+		summary = ", ".join(f"{n} {how}" for how, n in counts.items())
+		layout.addWidget(QLabel(f"{len(changes)} cells will be written ({summary})."))
+
+		table = QTableWidget(len(changes), 6)
+		table.setHorizontalHeaderLabels(["Cell", "Description (A)", "Event", "Current", "New", "Match"])
+		table.setEditTriggers(QTableWidget.NoEditTriggers)
+		for i, change in enumerate(changes):
+			items = [change["cell"], change["description"], change["label"], change["old"], change["new"], change["how"]]
+			for j, value in enumerate(items):
+				item = QTableWidgetItem("" if value is None else str(value))
+				if change["how"] in ("fuzzy", "position"):
+					item.setBackground(QColor("#FFF3CD"))	# Worth a second look
+				table.setItem(i, j, item)
+		table.resizeColumnsToContents()
+		table.horizontalHeader().setStretchLastSection(True)
+		layout.addWidget(table)
+
+		buttons = QHBoxLayout()
+		apply_button = QPushButton("Write All")
+		apply_button.clicked.connect(self.accept)
+		cancel_button = QPushButton("Cancel")
+		cancel_button.clicked.connect(self.reject)
+		buttons.addStretch()
+		buttons.addWidget(cancel_button)
+		buttons.addWidget(apply_button)
+		layout.addLayout(buttons)
+
 # Auto-update utility
-def update_excel_file(excel_path, event_table_data, start_row=3, column_letter="B"):
+@profiled("update_excel_file")
+def update_excel_file(excel_path, event_table_data, start_row=3, column_letter="B", match_labels=False):
     try:
         wb = load_workbook(excel_path)
         ws = wb.active
-        for i, (_, _, frame, _) in enumerate(event_table_data):  # Now unpacking 4 values
-            cell = f"{column_letter}{start_row + i}"
+        labels = [row[0] for row in event_table_data]
+        if match_labels:  # Rows found from the column-A descriptions (as Auto-Map did)
+            rows = [row for row, _ in LabelMatcher.from_sheet(ws).match(labels, start_row)]
+        else:
+            rows = [start_row + i for i in range(len(labels))]
+        for row, (_, _, frame, _) in zip(rows, event_table_data):  # Now unpacking 4 values
+            cell = f"{column_letter}{row}"
             ws[cell] = frame  # Use frame instead of ID
         wb.save(excel_path)
         print(f"🔄 Excel file updated with frame values in column {column_letter}.")
     except Exception as e:
         print(f"❌ Failed to update Excel file:\n{e}")
 
+# Bulk export: many recordings into one workbook
+def read_event_rows(csv_path):
+	"""``(label, time, frame, ID)`` rows from an ``eventDiameters_output.csv`` export."""
+	import pandas as pd
+
+	df = pd.read_csv(csv_path)
+	return list(df.iloc[:, :len(EVENT_FIELDS)].itertuples(index=False, name=None))
+
+def normalize_label(text):
+	return "".join(str(text).split()).casefold()
+
+def _numbers(text):
+	# A hyphen is a sign only where it doesn't join words ("10^-7", not "U-46619")
+	return re.findall(r"(?:(?<![A-Za-z0-9])-)?\d+(?:\.\d+)?", str(text))
+
+def read_descriptions(ws, start_row=1):
+	"""``(row, text)`` for every non-empty column-A cell of ``ws`` from ``start_row`` down."""
+	return [
+		(row, str(value).strip())
+		for row, (value,) in enumerate(ws.iter_rows(min_row=start_row, max_col=1, values_only=True), start=start_row)
+		if value is not None and str(value).strip()
+	]
+
+def _first_free(rows, taken):
+	for row in rows:
+		if row not in taken:
+			return row
+	return None
+
+class LabelMatcher:
+	"""Column-A descriptions of a template sheet, indexed once, for mapping event labels to rows.
+
+	A label matches, in order of preference: a description with the same
+	text, the same text ignoring case and whitespace, then (``fuzzy``) the
+	most similar descriptions by difflib ratio of at least FUZZY_CUTOFF that
+	contain the same numbers (so "ACh 10^-7" never lands on "ACh 10^-8").
+	Every row is used once, so a repeated label ("Wash") takes successive
+	matching rows.
+	"""
+
+	def __init__(self, descriptions):
+		self.descriptions = dict(descriptions)		# row -> text
+		self.exact = {}
+		self.normalized = {}
+		for row, text in self.descriptions.items():
+			self.exact.setdefault(text, []).append(row)
+			self.normalized.setdefault(normalize_label(text), []).append(row)
+
+	@classmethod
+	def from_sheet(cls, ws, start_row=1):
+		return cls(read_descriptions(ws, start_row))
+
+	def match(self, labels, start_row=3, label_rows=None, fuzzy=True):
+		"""``(row, how)`` for each label; ``how`` is mapped/exact/normalized/fuzzy/position.
+
+		An explicit ``label_rows`` entry wins over the descriptions. Labels
+		without a match never take a row described for another label: they
+		follow the last described row in order (without descriptions they
+		keep their position below ``start_row``), skipping rows already taken.
+		"""
+		import difflib
+
+		label_rows = {normalize_label(k): v for k, v in (label_rows or {}).items()}
+		resolved = [None] * len(labels)
+		taken = set()
+		for i, label in enumerate(labels):
+			key = normalize_label(label)
+			if key in label_rows:
+				resolved[i] = (label_rows[key], "mapped")
+				taken.add(label_rows[key])
+				continue
+			for how, rows in (("exact", self.exact.get(str(label).strip(), ())), ("normalized", self.normalized.get(key, ()))):
+				row = _first_free(rows, taken)
+				if row is not None:
+					resolved[i] = (row, how)
+					taken.add(row)
+					break
+
+		# Fuzzy only after every exact match has claimed its row
+		if fuzzy and self.normalized:
+			for i, label in enumerate(labels):
+				if resolved[i] is not None:
+					continue
+				key = normalize_label(label)
+				for close in difflib.get_close_matches(key, list(self.normalized), n=5, cutoff=FUZZY_CUTOFF):
+					if _numbers(close) != _numbers(key):
+						continue
+					row = _first_free(self.normalized[close], taken)
+					if row is not None:
+						resolved[i] = (row, "fuzzy")
+						taken.add(row)
+						break
+
+		row = max([start_row - 1] + list(self.descriptions)) + 1
+		for i, match in enumerate(resolved):
+			if match is None:
+				if not self.descriptions:
+					row = max(row, start_row + i)
+				while row in taken:
+					row += 1
+				taken.add(row)
+				resolved[i] = (row, "position")
+		return resolved
+
+def plan_mapping(ws, labels, values, column, start_row=3, fuzzy=True, matcher=None):
+	"""Preview of writing ``values`` to ``column`` at the rows matched to ``labels``.
+
+	Returns one dict per event with ``cell``, ``description`` (column A),
+	``label``, ``old`` and ``new`` values and ``how`` the row was found.
+	"""
+	matcher = matcher or LabelMatcher.from_sheet(ws)
+	changes = []
+	for label, value, (row, how) in zip(labels, values, matcher.match(labels, start_row, fuzzy=fuzzy)):
+		cell = f"{column}{row}"
+		changes.append({
+			"cell": cell,
+			"description": matcher.descriptions.get(row, ""),
+			"label": label,
+			"old": ws[cell].value,
+			"new": value,
+			"how": how,
+		})
+	return changes
+
+@profiled("bulk_update_excel")
+def bulk_update_excel(excel_path, recordings, value_field="Frame", label_rows=None,
+		match_labels=True, fuzzy=False, output_path=None, summary_path=None):
+	"""Write many recordings into one workbook with a single load and save.
+
+	Each recording is a dict with ``name``, ``events`` (event-table rows),
+	``column`` and optionally ``sheet`` (default: active sheet, created if
+	missing) and ``start_row`` (default 3). ``value_field`` picks the
+	EVENT_FIELDS entry written, ``label_rows`` maps event labels to rows for
+	every sheet. With ``match_labels`` rows are looked up in the column-A
+	descriptions, indexed once per sheet (see LabelMatcher; ``fuzzy`` also
+	accepts near matches). ``summary_path`` additionally
+	writes all values in long format to a new workbook in write-only mode.
+
+	Returns ``[(recording, label, sheet, cell, value, how)]`` for every write.
+	"""
+	value_index = EVENT_FIELDS.index(value_field)
+	wb = load_workbook(excel_path)
+	matchers = {}
+	writes = []
+	for recording in recordings:
+		sheet = recording.get("sheet") or wb.active.title
+		ws = wb[sheet] if sheet in wb.sheetnames else wb.create_sheet(sheet)
+		if sheet not in matchers:
+			matchers[sheet] = LabelMatcher.from_sheet(ws) if match_labels else LabelMatcher(())
+		events = recording["events"]
+		rows = matchers[sheet].match(
+			[event[0] for event in events], recording.get("start_row", 3), label_rows, fuzzy
+		)
+		column = recording["column"]
+		for event, (row, how) in zip(events, rows):
+			cell = f"{column}{row}"
+			ws[cell] = event[value_index]
+			writes.append((recording["name"], event[0], sheet, cell, event[value_index], how))
+	wb.save(output_path or excel_path)
+
+	if summary_path:
+		summary = Workbook(write_only=True)
+		ws = summary.create_sheet("Summary")
+		ws.append(["Recording", *EVENT_FIELDS])
+		for recording in recordings:
+			for event in recording["events"]:
+				ws.append([recording["name"], *event])
+		ws = summary.create_sheet("Cells")
+		ws.append(["Recording", "EventLabel", "Sheet", "Cell", value_field, "Matched by"])
+		for write in writes:
+			ws.append(list(write))
+		summary.save(summary_path)
+
+	print(f"🔄 Excel file updated with {len(recordings)} recordings ({len(writes)} cells).")
+	return writes
+
+def column_letter(index):
+	"""Spreadsheet column letter for a 1-based column index (1 -> A, 27 -> AA)."""
+	letters = ""
+	while index:
+		index, rem = divmod(index - 1, 26)
+		letters = chr(65 + rem) + letters
+	return letters
+
+class BulkExcelDialog(QDialog):
+	"""Collate many recordings (event-table CSV exports) into one Excel template."""
+
+	def __init__(self, parent, current=None):
+		super().__init__(parent)
+		self.setWindowTitle("Bulk Export to Excel")
+		self.setMinimumWidth(560)
+		self.excel_path = None
+		self.sheet_names = []
+		self.recordings = []			# [(name, event rows)]
+
+		layout = QVBoxLayout(self)
+		self.template_label = QLabel("Step 1: Select Excel template")
+		layout.addWidget(self.template_label)
+		load_button = QPushButton("Load Excel Template")
+		load_button.clicked.connect(self.load_template)
+		layout.addWidget(load_button)
+
+		layout.addWidget(QLabel("Step 2: Add recordings (eventDiameters_output.csv) and pick where each goes:"))
+		self.table = QTableWidget(0, 4)
+		self.table.setHorizontalHeaderLabels(["Recording", "Sheet", "Column", "Start Row"])
+		self.table.horizontalHeader().setStretchLastSection(True)
+		layout.addWidget(self.table)
+
+		row_buttons = QHBoxLayout()
+		add_button = QPushButton("Add Recordings…")
+		add_button.clicked.connect(self.add_recordings_dialog)
+		remove_button = QPushButton("Remove")
+		remove_button.clicked.connect(self.remove_selected)
+		row_buttons.addWidget(add_button)
+		row_buttons.addWidget(remove_button)
+		row_buttons.addStretch()
+		layout.addLayout(row_buttons)
+
+		options = QHBoxLayout()
+		options.addWidget(QLabel("Write:"))
+		self.field_selector = QComboBox()
+		self.field_selector.addItems(list(EVENT_FIELDS[1:]))
+		self.field_selector.setCurrentText("Frame")
+		options.addWidget(self.field_selector)
+		self.match_labels = QCheckBox("Match event labels to column A")
+		self.match_labels.setChecked(True)
+		options.addWidget(self.match_labels)
+		self.write_summary = QCheckBox("Also write summary workbook")
+		options.addWidget(self.write_summary)
+		options.addStretch()
+		layout.addLayout(options)
+
+		buttons = QHBoxLayout()
+		self.export_button = QPushButton("Export")
+		self.export_button.setEnabled(False)
+		self.export_button.clicked.connect(self.export)
+		cancel_button = QPushButton("Cancel")
+		cancel_button.clicked.connect(self.reject)
+		buttons.addStretch()
+		buttons.addWidget(cancel_button)
+		buttons.addWidget(self.export_button)
+		layout.addLayout(buttons)
+
+		if current is not None:
+			self.add_recording(*current)
+
+	def load_template(self):
+		path, _ = QFileDialog.getOpenFileName(self, "Select Excel File", "", "Excel Files (*.xlsx)")
+		if not path:
+			return
+		try:
+			wb = load_workbook(path, read_only=True)
+			self.sheet_names = wb.sheetnames
+			wb.close()
+		except Exception as e:
+			QMessageBox.critical(self, "Error", f"Failed to load Excel file:\n{e}")
+			return
+		self.excel_path = path
+		self.template_label.setText(f"Template: {os.path.basename(path)}")
+		for row in range(self.table.rowCount()):
+			self.table.setCellWidget(row, 1, self.sheet_selector())
+		self.export_button.setEnabled(bool(self.recordings))
+
+	def sheet_selector(self):
+		selector = QComboBox()
+		selector.setEditable(True)		# A new name creates the sheet
+		selector.addItems(self.sheet_names)
+		return selector
+
+	def add_recordings_dialog(self):
+		paths, _ = QFileDialog.getOpenFileNames(self, "Select Event Tables", "", "CSV Files (*.csv)")
+		for path in paths:
+			try:
+				events = read_event_rows(path)
+			except Exception as e:
+				QMessageBox.warning(self, "Load Error", f"Could not read {os.path.basename(path)}:\n{e}")
+				continue
+			# Every export is called eventDiameters_output.csv; name it after its folder
+			self.add_recording(os.path.basename(os.path.dirname(path)) or os.path.basename(path), events)
+
+	def add_recording(self, name, events):
+		row = self.table.rowCount()
+		self.recordings.append((name, events))
+		self.table.insertRow(row)
+		self.table.setItem(row, 0, QTableWidgetItem(f"{name} ({len(events)} events)"))
+		self.table.setCellWidget(row, 1, self.sheet_selector())
+		column = QComboBox()
+		column.addItems([column_letter(i) for i in range(2, 105)])
+		column.setCurrentIndex(min(row, column.count() - 1))	# One column per recording: B, C, D, …
+		self.table.setCellWidget(row, 2, column)
+		start_row = QSpinBox()
+		start_row.setRange(1, 1048576)
+		start_row.setValue(3)
+		self.table.setCellWidget(row, 3, start_row)
+		self.export_button.setEnabled(self.excel_path is not None)
+
+	def remove_selected(self):
+		for row in sorted({index.row() for index in self.table.selectedIndexes()}, reverse=True):
+			self.table.removeRow(row)
+			del self.recordings[row]
+		self.export_button.setEnabled(self.excel_path is not None and bool(self.recordings))
+
+	def mapping(self):
+		"""Recording dicts for bulk_update_excel from the table."""
+		return [
+			{
+				"name": name,
+				"events": events,
+				"sheet": self.table.cellWidget(row, 1).currentText() or None,
+				"column": self.table.cellWidget(row, 2).currentText(),
+				"start_row": self.table.cellWidget(row, 3).value(),
+			}
+			for row, (name, events) in enumerate(self.recordings)
+		]
+
+	def export(self):
+		summary_path = None
+		if self.write_summary.isChecked():
+			summary_path = os.path.splitext(self.excel_path)[0] + "_summary.xlsx"
+		try:
+			writes = bulk_update_excel(
+				self.excel_path, self.mapping(),
+				value_field=self.field_selector.currentText(),
+				match_labels=self.match_labels.isChecked(),
+				summary_path=summary_path
+			)
+		except Exception as e:
+			QMessageBox.critical(self, "Error", f"Failed to write Excel file:\n{e}")
+			return
+		by_position = sum(1 for write in writes if write[-1] == "position")
+		message = f"Wrote {len(writes)} values from {len(self.recordings)} recordings."
+		if self.match_labels.isChecked() and by_position:
+			message += f"\n{by_position} events had no matching column-A label and were written below the labelled rows."
+		QMessageBox.information(self, "Excel Export", message)
+		reopen_excel_file_crossplatform(self.excel_path)
+		self.accept()
+
 # Cross-platform file reopening logic
 def reopen_excel_file_crossplatform(path):
 	try:
@@ -0,0 +1,277 @@
+import os
+
+from vasoanalyzer.workers import process_pool
+
+# Figure exports are rendered in worker processes from a plain-data snapshot
+# of the live figure, so the GUI thread only pays for taking the snapshot.
+# The snapshot holds each axes' placement, limits, labels, lines, line
+# collections and texts (label sets are expanded into their texts);
+# lines backed by a TraceStore are re-read at export resolution instead of
+# reusing the screen-sized envelope. Exports run in worker processes (see
+# vasoanalyzer.workers).
+
+EXPORT_FORMATS = {
+	"tiff": 600,	# dpi for raster formats
+	"png": 600,
+	"svg": None,
+	"pdf": None,
+}
+# Vector output: merge path vertices that deviate less than this (in pixels)
+VECTOR_SIMPLIFY_THRESHOLD = 0.5
+
+def _transform_name(artist, ax):
+	transform = artist.get_transform()
+	if transform is ax.transAxes:
+		return "axes"
+	if transform is ax.get_xaxis_transform():
+		return "xaxis"
+	if transform is ax.get_yaxis_transform():
+		return "yaxis"
+	return "data"
+
+def _transform(ax, name):
+	return {
+		"axes": ax.transAxes,
+		"xaxis": ax.get_xaxis_transform(),
+		"yaxis": ax.get_yaxis_transform(),
+	}.get(name, ax.transData)
+
+def _font(text):
+	return {
+		"fontsize": text.get_fontsize(),
+		"fontfamily": text.get_fontname(),
+		"fontweight": text.get_fontweight(),
+		"fontstyle": text.get_fontstyle(),
+		"color": text.get_color(),
+	}
+
+def _line(line, ax, data=None):
+	x, y = data if data is not None else (line.get_xdata(), line.get_ydata())
+	return {
+		"x": x,
+		"y": y,
+		"transform": _transform_name(line, ax),
+		"color": line.get_color(),
+		"linewidth": line.get_linewidth(),
+		"linestyle": line.get_linestyle(),
+		"marker": line.get_marker(),
+		"markersize": line.get_markersize(),
+		"alpha": line.get_alpha(),
+		"label": line.get_label(),
+		"zorder": line.get_zorder(),
+	}
+
+def _segments(collection, ax):
+	return {
+		"segments": [segment.tolist() for segment in collection.get_segments()],
+		"transform": _transform_name(collection, ax),
+		"colors": collection.get_colors().tolist(),
+		"linewidths": collection.get_linewidths().tolist(),
+		"linestyles": collection.get_linestyles(),
+		"zorder": collection.get_zorder(),
+	}
+
+def _text(text, ax):
+	snap = {
+		"text": text.get_text(),
+		"position": text.get_position(),
+		"transform": _transform_name(text, ax),
+		"rotation": text.get_rotation(),
+		"ha": text.get_horizontalalignment(),
+		"va": text.get_verticalalignment(),
+		"clip_on": text.get_clip_on(),
+		"zorder": text.get_zorder(),
+		**_font(text),
+	}
+	if hasattr(text, "xyann"):	# Annotation
+		snap["xy"] = text.xy
+		snap["xytext"] = text.xyann
+		snap["textcoords"] = text.anncoords
+	patch = text.get_bbox_patch()
+	if patch is not None:
+		snap["bbox"] = {"boxstyle": "round,pad=0.3", "fc": patch.get_facecolor(), "ec": patch.get_edgecolor(), "lw": patch.get_linewidth()}
+	return snap
+
+def snapshot_figure(fig, line_sources=None, n_bins=2000):
+	"""Capture ``fig`` as picklable data for render_snapshot.
+
+	``line_sources`` maps lines to ``(TraceStore, column)``; those lines are
+	re-sampled for the visible range with ``n_bins`` bins (raw samples when
+	zoomed in) rather than copied from the screen rendering.
+	"""
+	from matplotlib.collections import LineCollection
+
+	line_sources = line_sources or {}
+	axes = []
+	for ax in fig.axes:
+		if not ax.get_visible():
+			continue
+		x_min, x_max = ax.get_xlim()
+		lines = []
+		for line in ax.lines:
+			if not line.get_visible():
+				continue
+			source = line_sources.get(line)
+			data = None
+			if source is not None and source[0] is not None and len(source[0]):
+				store, column = source
+				data = store.envelope(column, x_min, x_max, n_bins)
+			lines.append(_line(line, ax, data))
+
+		ticks = ax.xaxis.get_major_ticks()[:1] + ax.yaxis.get_major_ticks()[:1]
+		legend = ax.get_legend()
+		axes.append({
+			"position": ax.get_position().bounds,
+			"zorder": ax.get_zorder(),
+			"patch_visible": ax.patch.get_visible(),
+			"facecolor": ax.get_facecolor(),
+			"xlim": (x_min, x_max),
+			"ylim": ax.get_ylim(),
+			"title": ax.get_title(),
+			"xlabel": {"text": ax.get_xlabel(), "visible": ax.xaxis.label.get_visible(), **_font(ax.xaxis.label)},
+			"ylabel": {"text": ax.get_ylabel(), **_font(ax.yaxis.label)},
+			"y_side": ax.yaxis.get_label_position(),
+			"tick_labelsize": ticks[0].label1.get_fontsize() if ticks else None,
+			"x_tick_color": ticks[0].label1.get_color() if ticks else "black",
+			"y_tick_color": ticks[-1].label1.get_color() if ticks else "black",
+			"x_ticklabels": any(t.label1.get_visible() for t in ax.xaxis.get_major_ticks()),
+			"grid": any(g.get_visible() for g in ax.xaxis.get_gridlines()),
+			"spines": {
+				name: {"visible": spine.get_visible(), "color": spine.get_edgecolor(), "position": spine.get_position()}
+				for name, spine in ax.spines.items()
+			},
+			"lines": lines,
+			"segments": [
+				_segments(collection, ax) for collection in ax.collections
+				if isinstance(collection, LineCollection) and collection.get_visible()
+			],
+			"texts": [_text(text, ax) for text in ax.texts if text.get_visible()] + [
+				_text(text, ax) for label_set in ax.artists if hasattr(label_set, "iter_texts") and label_set.get_visible()
+				for text in label_set.iter_texts()
+			],
+			"legend": None if legend is None else {"loc": getattr(legend, "_loc", "best"), "fontsize": legend.get_texts()[0].get_fontsize() if legend.get_texts() else 8},
+		})
+	return {
+		"figsize": tuple(fig.get_size_inches()),
+		"facecolor": fig.get_facecolor(),
+		"axes": axes,
+	}
+
+def build_figure(snapshot):
+	"""Rebuild a (canvas-less) matplotlib Figure from snapshot_figure data."""
+	import matplotlib
+	from matplotlib.collections import LineCollection
+	from matplotlib.figure import Figure
+
+	fig = Figure(figsize=snapshot["figsize"], facecolor=snapshot["facecolor"])
+	for snap in snapshot["axes"]:
+		ax = fig.add_axes(snap["position"], zorder=snap["zorder"])
+		ax.patch.set_visible(snap["patch_visible"])
+		ax.set_facecolor(snap["facecolor"])
+
+		for line in snap["lines"]:
+			props = dict(line)
+			x, y = props.pop("x"), props.pop("y")
+			transform = _transform(ax, props.pop("transform"))
+			ax.plot(x, y, transform=transform, **props)
+
+		for collection in snap.get("segments", []):
+			props = dict(collection)
+			segments, transform = props.pop("segments"), _transform(ax, props.pop("transform"))
+			# The snapshot holds dash patterns as drawn, already scaled by line width
+			with matplotlib.rc_context({"lines.scale_dashes": False}):
+				collection = LineCollection(segments, transform=transform, **props)
+			ax.add_collection(collection, autolim=False)
+
+		for text in snap["texts"]:
+			props = dict(text)
+			string, transform = props.pop("text"), _transform(ax, props.pop("transform"))
+			position = props.pop("position")
+			if "xy" in props:
+				ax.annotate(string, xy=props.pop("xy"), xytext=props.pop("xytext"), textcoords=props.pop("textcoords"), **props)
+			else:
+				ax.text(position[0], position[1], string, transform=transform, **props)
+
+		if snap["y_side"] == "right":
+			ax.yaxis.tick_right()
+			ax.yaxis.set_label_position("right")
+		label = dict(snap["xlabel"])
+		ax.set_xlabel(label.pop("text"), **{k: v for k, v in label.items() if k != "visible"})
+		ax.xaxis.label.set_visible(label["visible"])
+		label = dict(snap["ylabel"])
+		ax.set_ylabel(label.pop("text"), **label)
+		ax.set_title(snap["title"])
+		ax.tick_params(axis="x", colors=snap["x_tick_color"], labelbottom=snap["x_ticklabels"])
+		ax.tick_params(axis="y", colors=snap["y_tick_color"])
+		if snap["tick_labelsize"]:
+			ax.tick_params(labelsize=snap["tick_labelsize"])
+		for name, spine in snap["spines"].items():
+			ax.spines[name].set_visible(spine["visible"])
+			ax.spines[name].set_edgecolor(spine["color"])
+			ax.spines[name].set_position(spine["position"])
+		if snap["grid"]:
+			ax.grid(True, color='#CCC')
+		if snap["legend"]:
+			ax.legend(loc=snap["legend"]["loc"], fontsize=snap["legend"]["fontsize"])
+		ax.set_xlim(snap["xlim"])
+		ax.set_ylim(snap["ylim"])
+	return fig
+
+def render_snapshot(snapshot, path, fmt, dpi=None):
+	"""Render ``snapshot`` to ``path`` (runs in a worker process); returns ``path``."""
+	import matplotlib
+
+	rc = {}
+	if dpi is None:	# vector output
+		rc = {"path.simplify": True, "path.simplify_threshold": VECTOR_SIMPLIFY_THRESHOLD}
+	with matplotlib.rc_context(rc):
+		fig = build_figure(snapshot)
+		fig.savefig(path, format=fmt, dpi=dpi or "figure", bbox_inches="tight", facecolor=snapshot["facecolor"])
+	return path
+
+class ExportManager:
+	"""Runs figure exports on a process pool and reports finished batches.
+
+	``submit`` returns immediately; call ``finished`` (e.g. from a timer on
+	the GUI thread) to collect ``(paths, errors)`` for batches that are done.
+	"""
+
+	def __init__(self, max_workers=None):
+		self.max_workers = max_workers or min(len(EXPORT_FORMATS), os.cpu_count() or 1)
+		self._executor = None
+		self._batches = []
+
+	def submit(self, snapshot, targets):
+		"""Start rendering ``snapshot`` to each ``(path, fmt)`` in ``targets``."""
+		if self._executor is None:
+			self._executor = process_pool(self.max_workers)
+		futures = [
+			(path, self._executor.submit(render_snapshot, snapshot, path, fmt, EXPORT_FORMATS.get(fmt)))
+			for path, fmt in targets
+		]
+		self._batches.append(futures)
+
+	def pending(self):
+		return bool(self._batches)
+
+	def finished(self):
+		done = [batch for batch in self._batches if all(future.done() for _, future in batch)]
+		self._batches = [batch for batch in self._batches if batch not in done]
+		results = []
+		for batch in done:
+			paths, errors = [], []
+			for path, future in batch:
+				error = future.exception()
+				if error is None:
+					paths.append(path)
+				else:
+					errors.append(f"{os.path.basename(path)}: {error}")
+			results.append((paths, errors))
+		return results
+
+	def shutdown(self, wait=False):
+		"""Stop the pool; with ``wait`` running exports are finished first, else queued ones are dropped."""
+		if self._executor is not None:
+			self._executor.shutdown(wait=wait, cancel_futures=not wait)
+			self._executor = None
+		self._batches.clear()
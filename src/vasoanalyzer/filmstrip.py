@@ -0,0 +1,150 @@
+from collections import OrderedDict
+
+from PyQt5.QtCore import Qt, QTimer, QRect, pyqtSignal
+from PyQt5.QtGui import QPainter, QPixmap, QImage, QColor, QPen
+from PyQt5.QtWidgets import QAbstractScrollArea
+
+FILMSTRIP_POLL_MS = 100
+THUMBNAIL_GAP = 4			# Pixels between thumbnails
+PREFETCH_SCREENS = 1		# Also request this many screen widths either side of the view
+PIXMAP_CACHE = 512			# QPixmaps kept for repainting
+
+class FilmstripWidget(QAbstractScrollArea):
+	"""Horizontal strip of TIFF frame thumbnails; click one to jump to that frame.
+
+	Virtualised: only thumbnails in (or near) the visible range are
+	requested from the ThumbnailStore and painted, so a stack of any length
+	costs the same to show and scroll.
+	"""
+
+	frameClicked = pyqtSignal(int)
+
+	def __init__(self, parent=None):
+		super().__init__(parent)
+		self.store = None
+		self.current = -1
+		self._pixmaps = OrderedDict()		# position -> QPixmap
+		self.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+		self.setHorizontalScrollBarPolicy(Qt.ScrollBarAsNeeded)
+		self.horizontalScrollBar().valueChanged.connect(self.viewport().update)
+		self.setToolTip("Click a thumbnail to show that frame")
+		self._timer = QTimer(self)
+		self._timer.setInterval(FILMSTRIP_POLL_MS)
+		self._timer.timeout.connect(self.collect_thumbnails)
+		self.hide()
+
+	def set_store(self, store):
+		"""Show ``store`` (a ThumbnailStore), or nothing if None."""
+		if self.store is not None:
+			self.store.close()
+		self.store = store
+		self.current = -1
+		self._pixmaps.clear()
+		if store is None:
+			self._timer.stop()
+			self.hide()
+			return
+		height, _ = store.shape
+		self.setFixedHeight(height + 2 * THUMBNAIL_GAP + self.horizontalScrollBar().sizeHint().height() + 2)
+		self.update_scroll_range()
+		self.horizontalScrollBar().setValue(0)
+		self.show()
+		self.viewport().update()
+
+	def cell_width(self):
+		return self.store.shape[1] + THUMBNAIL_GAP
+
+	def update_scroll_range(self):
+		if self.store is None:
+			return
+		total = len(self.store) * self.cell_width()
+		bar = self.horizontalScrollBar()
+		bar.setRange(0, max(0, total - self.viewport().width()))
+		bar.setPageStep(self.viewport().width())
+		bar.setSingleStep(self.cell_width())
+
+	def visible_range(self, margin=0):
+		offset = self.horizontalScrollBar().value()
+		first = offset // self.cell_width()
+		last = (offset + self.viewport().width()) // self.cell_width() + 1
+		return max(0, first - margin), min(len(self.store), last + margin)
+
+	def set_current(self, position):
+		"""Highlight ``position`` and scroll it into view."""
+		self.current = position
+		if self.store is None:
+			return
+		left = position * self.cell_width()
+		bar = self.horizontalScrollBar()
+		if left < bar.value() or left + self.cell_width() > bar.value() + self.viewport().width():
+			bar.setValue(left - (self.viewport().width() - self.cell_width()) // 2)
+		self.viewport().update()
+
+	def pixmap(self, position):
+		pixmap = self._pixmaps.get(position)
+		if pixmap is not None:
+			self._pixmaps.move_to_end(position)
+			return pixmap
+		image = self.store.get(position)
+		if image is None:
+			return None
+		height, width = image.shape
+		q_img = QImage(bytes(image), width, height, width, QImage.Format_Grayscale8)
+		pixmap = QPixmap.fromImage(q_img)
+		self._pixmaps[position] = pixmap
+		while len(self._pixmaps) > PIXMAP_CACHE:
+			self._pixmaps.popitem(last=False)
+		return pixmap
+
+	def collect_thumbnails(self):
+		if self.store is None:
+			return
+		arrived = self.store.collect()
+		first, last = self.visible_range()
+		if any(first <= position < last for position in arrived):
+			self.viewport().update()
+		if not self.store.pending():
+			self._timer.stop()
+
+	# ----- Qt events -----
+	def paintEvent(self, event):
+		if self.store is None:
+			return
+		painter = QPainter(self.viewport())
+		height, width = self.store.shape
+		offset = self.horizontalScrollBar().value()
+		first, last = self.visible_range()
+		missing = False
+		for position in range(first, last):
+			rect = QRect(position * self.cell_width() - offset + THUMBNAIL_GAP // 2, THUMBNAIL_GAP, width, height)
+			pixmap = self.pixmap(position)
+			if pixmap is None:
+				painter.fillRect(rect, QColor("#DDD"))
+				missing = True
+			else:
+				painter.drawPixmap(rect, pixmap)
+			if position == self.current:
+				painter.setPen(QPen(QColor("red"), 2))
+				painter.drawRect(rect.adjusted(1, 1, -1, -1))
+		painter.end()
+
+		if missing:
+			margin = PREFETCH_SCREENS * max(1, self.viewport().width() // self.cell_width())
+			self.store.request(range(*self.visible_range(margin)))
+			if not self._timer.isActive():
+				self._timer.start()
+
+	def resizeEvent(self, event):
+		super().resizeEvent(event)
+		self.update_scroll_range()
+
+	def wheelEvent(self, event):
+		bar = self.horizontalScrollBar()
+		bar.setValue(bar.value() - event.angleDelta().y() - event.angleDelta().x())
+
+	def mousePressEvent(self, event):
+		if self.store is None or event.button() != Qt.LeftButton:
+			return
+		position = (event.pos().x() + self.horizontalScrollBar().value()) // self.cell_width()
+		if 0 <= position < len(self.store):
+			self.frameClicked.emit(position)
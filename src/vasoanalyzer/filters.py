@@ -0,0 +1,157 @@
+from collections import OrderedDict
+
+import numpy as np
+
+from vasoanalyzer.profiling import profiled
+
+FILTER_COLUMN = 'Inner Diameter'
+MEDIAN_CHUNK_ROWS = 1 << 16	# windows per np.median call (bounds the temporary copy)
+# Filtering part of a trace reads this many windows of samples either side;
+# exact for the median and Savitzky–Golay filters (which only reach half a
+# window), and enough for the Butterworth filter's response to die out
+FILTER_MARGIN_WINDOWS = 8
+
+def _odd_window(window):
+	window = max(3, int(window))
+	return window if window % 2 else window + 1
+
+def median_filter(values, window):
+	"""Rolling median over ``window`` samples (odd, centred; edges repeat the end samples).
+
+	Uses SciPy's running median when it is installed; the NumPy fallback
+	sorts every window and gets slow for wide windows on long traces.
+	"""
+	window = _odd_window(window)
+	try:
+		from scipy.ndimage import median_filter as scipy_median
+	except ImportError:
+		pass
+	else:
+		return scipy_median(values, window, mode='nearest')
+
+	half = window // 2
+	padded = np.pad(values, half, mode='edge')
+	windows = np.lib.stride_tricks.sliding_window_view(padded, window)
+	out = np.empty(len(values))
+	for start in range(0, len(values), MEDIAN_CHUNK_ROWS):
+		stop = start + MEDIAN_CHUNK_ROWS
+		out[start:stop] = np.median(windows[start:stop], axis=1)
+	return out
+
+def savgol_coefficients(window, order=2):
+	"""Least-squares smoothing weights of a centred Savitzky–Golay filter."""
+	half = window // 2
+	positions = np.arange(-half, half + 1, dtype=float)
+	vander = np.vander(positions, order + 1, increasing=True)
+	return np.linalg.pinv(vander)[0]
+
+def savgol_filter(values, window, order=2):
+	"""Savitzky–Golay smoothing: a local degree-``order`` polynomial fit over ``window`` samples."""
+	window = _odd_window(window)
+	order = min(order, window - 1)
+	padded = np.pad(values, window // 2, mode='edge')
+	return np.convolve(padded, savgol_coefficients(window, order)[::-1], mode='valid')
+
+def butterworth_filter(values, window, order=4):
+	"""Zero-phase Butterworth low-pass with its cutoff at 1/``window`` of the sampling rate.
+
+	Needs SciPy (optional dependency).
+	"""
+	try:
+		from scipy.signal import butter, sosfiltfilt
+	except ImportError:
+		raise ImportError("The Butterworth filter needs SciPy (pip install scipy).")
+	window = max(3, int(window))
+	sos = butter(order, 2.0 / window, output='sos')
+	if len(values) <= 3 * (2 * len(sos) + 1):
+		return np.array(values, dtype=float)
+	return sosfiltfilt(sos, values)
+
+def filter_reach(window):
+	"""Samples either side of a point that (effectively) determine its filtered value."""
+	return FILTER_MARGIN_WINDOWS * _odd_window(window)
+
+# Name shown in the GUI -> filter function taking (values, window)
+FILTERS = {
+	"Median": median_filter,
+	"Savitzky–Golay": savgol_filter,
+	"Butterworth low-pass": butterworth_filter,
+}
+
+@profiled("apply_filter")
+def apply_filter(name, values, window):
+	"""Filter ``values`` with FILTERS[name]; NaN gaps are bridged for filtering and kept as NaN."""
+	values = np.asarray(values, dtype=float)
+	if len(values) == 0:
+		return values.copy()
+	gaps = ~np.isfinite(values)
+	if gaps.any():
+		if gaps.all():
+			return values.copy()
+		index = np.arange(len(values))
+		values = values.copy()
+		values[gaps] = np.interp(index[gaps], index[~gaps], values[~gaps])
+	out = FILTERS[name](values, window)
+	out[gaps] = np.nan
+	return out
+
+class FilterCache:
+	"""Filtered copies of a TraceStore, keyed by (trace, filter, window).
+
+	Switching between raw and filtered views (or between recently used
+	settings) returns the cached store instead of refiltering. When a trace
+	grows (follow mode) its copy is extended: only the new rows and the
+	last ``filter_reach`` rows before them, which were filtered against the
+	old end of the trace, are filtered again. Copies of traces with a spill
+	limit are built chunk by chunk and spill like their source.
+	"""
+
+	def __init__(self, max_entries=16):
+		self.max_entries = max_entries
+		self._entries = OrderedDict()
+
+	def get(self, store, name, window, column=FILTER_COLUMN):
+		from vasoanalyzer.trace_loader import TraceStore
+
+		key = (id(store), name, window, column)
+		entry = self._entries.get(key)
+		if entry is not None and entry[0] is store:
+			self._entries.move_to_end(key)
+			filtered = entry[1]
+			if len(filtered) == len(store):
+				return filtered
+			if len(filtered) < len(store) and not store.max_rows:
+				self._extend(store, filtered, name, window, column)
+				return filtered
+
+		if store.max_memory_chunks is None:
+			arrays = {col: store[col] for col in store.columns}
+			arrays[column] = apply_filter(name, arrays[column], window)
+			filtered = TraceStore.from_arrays(arrays, time_column=store.time_column)
+		else:
+			filtered = TraceStore(store.columns, time_column=store.time_column, max_memory_chunks=store.max_memory_chunks)
+			self._extend(store, filtered, name, window, column)
+		self._entries[key] = (store, filtered)
+		while len(self._entries) > self.max_entries:
+			self._entries.popitem(last=False)
+		return filtered
+
+	def _extend(self, store, filtered, name, window, column):
+		"""Bring ``filtered`` up to ``store``'s length, a chunk at a time."""
+		from vasoanalyzer.trace_loader import CHUNK_ROWS
+
+		reach = filter_reach(window)
+		done, n = len(filtered), len(store)
+		for b0 in range(max(0, done - reach), n, CHUNK_ROWS):
+			b1 = min(b0 + CHUNK_ROWS, n)
+			a0, a1 = max(0, b0 - reach), min(n, b1 + reach)
+			out = apply_filter(name, store.rows(a0, a1, [column])[column], window)[b0 - a0:b1 - a0]
+			if b0 < done:
+				filtered.overwrite(b0, {column: out[:done - b0]})
+			if b1 > done:
+				rows = store.rows(max(b0, done), b1)
+				rows[column] = out[max(0, done - b0):]
+				filtered.append(rows)
+
+	def clear(self):
+		self._entries.clear()
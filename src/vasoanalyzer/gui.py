@@ -1,11 +1,7 @@
 # [A] ========================= IMPORTS AND GLOBAL CONFIG ============================
-import sys, os, pickle
+import sys, os
 import numpy as np
-import pandas as pd
-import tifffile
-import matplotlib.pyplot as plt
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
-from matplotlib.backends.backend_qt5agg import NavigationToolbar2QT as NavigationToolbar
 from matplotlib.figure import Figure
 from matplotlib import rcParams
 rcParams.update({
@@ -23,17 +19,42 @@ from PyQt5.QtWidgets import (
 	QMainWindow, QWidget, QPushButton, QFileDialog, QVBoxLayout, QHBoxLayout,
 	QSlider, QLabel, QTableWidget, QTableWidgetItem, QAbstractItemView,
 	QHeaderView, QMessageBox, QInputDialog, QMenu, QSizePolicy, QAction,
-	QToolBar, QToolButton, QSpacerItem
+	QToolBar, QToolButton, QSpacerItem, QComboBox, QSpinBox
 )
 
-from PyQt5.QtGui import QPixmap, QImage, QIcon
+from PyQt5.QtGui import QPixmap, QImage, QIcon, QKeySequence
 from PyQt5.QtCore import Qt, QTimer, QSize
 
-from vasoanalyzer.trace_loader import load_trace
-from vasoanalyzer.tiff_loader import load_tiff
-from vasoanalyzer.event_loader import load_events
-from .excel_mapper import ExcelMappingDialog
-from vasoanalyzer.excel_mapper import update_excel_file
+from vasoanalyzer.profiling import profiled
+from vasoanalyzer.metrics import METRIC_COLUMNS, BASELINE_SEC, compute_event_metrics
+from vasoanalyzer.filters import FILTERS, FilterCache
+from vasoanalyzer.overlay import TraceOverlay, OVERLAY, STACKED
+from vasoanalyzer.filmstrip import FilmstripWidget
+from vasoanalyzer.pins import PinSet
+from vasoanalyzer.event_markers import EventMarkers
+from vasoanalyzer.views import ViewToolbar
+from vasoanalyzer.navigation import EventNavigator
+from vasoanalyzer.plugins import load_plugins, plugin_columns
+from vasoanalyzer.undo import UndoStack, Group, SetEventValue, InsertEvents, AddPin, RemovePin
+
+# Live-tail refresh period; new rows are batched between ticks
+FOLLOW_REFRESH_MS = 500
+# Sealed 65k-row chunks kept in RAM while following; older ones spill to disk
+FOLLOW_MEMORY_CHUNKS = 32
+# Poll period for background figure exports
+EXPORT_POLL_MS = 200
+# Poll period for analysis plugins running in the background
+PLUGIN_POLL_MS = 200
+# While following a recording, plugins re-run at most this often (and when following stops)
+PLUGIN_FOLLOW_MS = 10000
+# Edits within this delay are written to the event CSV/Excel file in one export
+AUTO_EXPORT_DELAY_MS = 500
+# Line/axis colours for extra channels (outer diameter, pressure, …) on twin y-axes
+CHANNEL_COLORS = ['tab:blue', 'tab:red', 'tab:green', 'tab:purple', 'tab:orange', 'tab:brown']
+
+# Loaders (pandas, tifffile), the Excel mapper (openpyxl) and the style
+# dialog are imported inside the methods that use them so the window can
+# appear before those modules are loaded; see vasoanalyzer.startup.
 
 # [B] ========================= MAIN CLASS DEFINITION ================================
 class VasoAnalyzerApp(QMainWindow):
@@ -55,19 +76,60 @@ class VasoAnalyzerApp(QMainWindow):
 		# ===== Initialize State =====
 		self.trace_data = None
 		self.trace_file_path = None
+		self.trace_file = None			# Full path of the loaded trace CSV
+		self.tiff_file = None			# Full path of the loaded _Result.tiff
+		self.frames_metadata = []
+		self.plot_style = None			# Last style applied via the style editor
 		self.snapshot_frames = []
 		self.current_frame = 0
 		self.event_labels = []
 		self.event_times = []
-		self.event_text_objects = []
+		self.event_frames = None
+		self.event_markers = None		# EventMarkers on self.ax (created with the axes in initUI)
 		self.event_table_data = []
+		self.event_metrics = {}			# Metric/channel column name -> values aligned with event_table_data
 		self.selected_event_marker = None
-		self.pinned_points = []
+		self.navigator = EventNavigator()	# Keyboard stepping through events
+		self.pins = None				# PinSet on self.ax (created with the axes in initUI)
 		self.slider_marker = None
 		self.recording_interval = 1 #0.14	# 140 ms per frame
-		self.last_replaced_event = None
+		self.undo_stack = UndoStack(on_change=self.update_undo_actions)
 		self.excel_auto_path = None		# Path to Excel file for auto-update
 		self.excel_auto_column = None	# Column letter to use for auto-update
+		self.excel_auto_match = False	# Auto-update finds rows by column-A label instead of from row 3
+		self.trace_line = None
+		self.trace_filter = None		# Name in filters.FILTERS, or None for the raw trace
+		self.filter_window = 11			# Filter window in samples
+		self.filter_cache = FilterCache()
+		self.comparison_files = []		# Extra traces shown by self.overlay
+		self.selected_channels = []		# Extra columns picked at the last trace load
+		self.channel_axes = []			# Twin y-axes, one per extra channel
+		self.channel_lines = []			# (column, line) on self.channel_axes
+		self.trace_tail = None			# Live-tail readers while following a recording
+		self.event_tail = None
+		self.follow_timer = QTimer(self)
+		self.follow_timer.setInterval(FOLLOW_REFRESH_MS)
+		self.follow_timer.timeout.connect(self.follow_tick)
+		self.export_manager = None		# Process pool for figure exports (created on first export)
+		self.detection_preview_lines = []	# Candidate markers while the Detect Events dialog is open
+		self.export_timer = QTimer(self)
+		self.export_timer.setInterval(EXPORT_POLL_MS)
+		self.export_timer.timeout.connect(self.check_figure_exports)
+		self.auto_export_timer = QTimer(self)
+		self.auto_export_timer.setSingleShot(True)
+		self.auto_export_timer.setInterval(AUTO_EXPORT_DELAY_MS)
+		self.auto_export_timer.timeout.connect(self.auto_export_table)
+		self.plugin_runner = None		# Process pool for analysis plugins (created on first run)
+		self.plugin_digest = None		# (trace, channels, TraceDigest) of the trace last given to the plugins
+		self.plugin_timer = QTimer(self)
+		self.plugin_timer.setInterval(PLUGIN_POLL_MS)
+		self.plugin_timer.timeout.connect(self.check_plugin_results)
+		self.plugin_follow_timer = QTimer(self)
+		self.plugin_follow_timer.setSingleShot(True)
+		self.plugin_follow_timer.setInterval(PLUGIN_FOLLOW_MS)
+		self.plugin_follow_timer.timeout.connect(self.start_plugins)
+		if load_plugins():
+			print(f"🧩 Analysis plugins: {', '.join(plugin_columns())}")
 
 		# ===== Axis + Slider State =====
 		self.axis_dragging = False
@@ -104,10 +166,14 @@ class VasoAnalyzerApp(QMainWindow):
 		self.fig = Figure(figsize=(8, 4), facecolor='white')
 		self.canvas = FigureCanvas(self.fig)
 		self.ax = self.fig.add_subplot(111)
+		self.pins = PinSet(self.ax)
+		self.event_markers = EventMarkers(self.ax)
+		self.overlay = TraceOverlay(self.fig, self.ax, prepare=self.filtered, on_xlim=self.refresh_trace_line)
 		self.grid_visible = True  # Track grid visibility
 		
 		# ===== Initialize Matplotlib Toolbar =====
-		self.toolbar = NavigationToolbar(self.canvas, self)
+		self.toolbar = ViewToolbar(self.canvas, self)
+		self.views = self.toolbar.views	# Zoom/pan history and rendered views
 		self.toolbar.setIconSize(QSize(24, 24))
 		self.toolbar.setStyleSheet("""
 			QToolBar {
@@ -200,10 +266,91 @@ class VasoAnalyzerApp(QMainWindow):
 		self.load_snapshot_button.clicked.connect(self.load_snapshot)
 	
 		self.excel_btn = QPushButton("📊 Excel")
-		self.excel_btn.setToolTip("Map Events to Excel Template")
-		self.excel_btn.setEnabled(False)
-		self.excel_btn.clicked.connect(self.open_excel_mapping_dialog)
-	
+		self.excel_btn.setToolTip("Map events to an Excel template, or collate many recordings into one")
+		excel_menu = QMenu(self)
+		self.excel_map_action = excel_menu.addAction("📝 Map Events to Template…", self.open_excel_mapping_dialog)
+		self.excel_map_action.setEnabled(False)
+		excel_menu.addAction("📚 Bulk Export Recordings…", self.open_bulk_excel_dialog)
+		self.excel_btn.setMenu(excel_menu)
+	
+		self.follow_btn = QPushButton("📡 Follow")
+		self.follow_btn.setToolTip("Follow a trace VasoTracker is still writing (reads only appended rows)")
+		self.follow_btn.setCheckable(True)
+		self.follow_btn.setEnabled(False)
+		self.follow_btn.toggled.connect(self.toggle_follow_mode)
+
+		self.session_btn = QPushButton("🗂 Session")
+		self.session_btn.setToolTip("Save or resume the whole analysis (trace, events, edits, pins, TIFF, style)")
+		session_menu = QMenu(self)
+		session_menu.addAction("💾 Save Session…", self.save_session_dialog)
+		session_menu.addAction("📂 Open Session…", self.open_session_dialog)
+		self.session_btn.setMenu(session_menu)
+
+		self.compare_btn = QPushButton("📈 Compare")
+		self.compare_btn.setToolTip("Overlay or stack other traces on this plot for comparison")
+		self.compare_btn.setEnabled(False)
+		compare_menu = QMenu(self)
+		compare_menu.addAction("➕ Add Traces…", self.add_comparison_traces_dialog)
+		compare_menu.addSeparator()
+		self.compare_mode_actions = {}
+		for mode, text in ((OVERLAY, "Overlay"), (STACKED, "Stacked (shared x)")):
+			action = compare_menu.addAction(text, lambda mode=mode: self.set_comparison_mode(mode))
+			action.setCheckable(True)
+			action.setChecked(mode == self.overlay.mode)
+			self.compare_mode_actions[mode] = action
+		compare_menu.addSeparator()
+		compare_menu.addAction("✖ Clear Comparison", self.clear_comparison)
+		self.compare_btn.setMenu(compare_menu)
+
+		self.detect_btn = QPushButton("🔍 Detect Events")
+		self.detect_btn.setToolTip("Find steps in the diameter trace and add them as events")
+		self.detect_btn.setEnabled(False)
+		self.detect_btn.clicked.connect(self.open_event_detection_dialog)
+
+		self.undo_action = QAction("↶ Undo", self)
+		self.undo_action.setShortcut(QKeySequence.Undo)
+		self.undo_action.triggered.connect(self.undo)
+		self.redo_action = QAction("↷ Redo", self)
+		self.redo_action.setShortcut(QKeySequence.Redo)
+		self.redo_action.triggered.connect(self.redo)
+		self.addActions([self.undo_action, self.redo_action])
+		self.undo_btn = QToolButton()
+		self.undo_btn.setDefaultAction(self.undo_action)
+		self.redo_btn = QToolButton()
+		self.redo_btn.setDefaultAction(self.redo_action)
+
+		self.navigate_btn = QPushButton("🧭 Navigate")
+		self.navigate_btn.setToolTip("Step through events with ←/→ and through TIFF frames with Shift+←/→")
+		self.navigate_btn.setCheckable(True)
+		self.navigate_btn.toggled.connect(self.toggle_navigation_mode)
+		self.navigation_actions = []
+		for text, key, slot in (
+			("Previous Event", "Left", lambda: self.step_event(-1)),
+			("Next Event", "Right", lambda: self.step_event(1)),
+			("Previous Frame", "Shift+Left", lambda: self.step_frame(-1)),
+			("Next Frame", "Shift+Right", lambda: self.step_frame(1)),
+		):
+			action = QAction(text, self)
+			action.setShortcut(QKeySequence(key))
+			action.setEnabled(False)
+			action.triggered.connect(slot)
+			self.navigation_actions.append(action)
+		self.addActions(self.navigation_actions)
+
+		self.filter_selector = QComboBox()
+		self.filter_selector.setToolTip("Smooth the diameter trace (used for plotting, event sampling, hover and export)")
+		self.filter_selector.addItem("Raw trace")
+		self.filter_selector.addItems(list(FILTERS))
+		self.filter_selector.currentIndexChanged.connect(self.change_trace_filter)
+
+		self.filter_window_box = QSpinBox()
+		self.filter_window_box.setToolTip("Filter window (samples)")
+		self.filter_window_box.setRange(3, 1001)
+		self.filter_window_box.setSingleStep(2)
+		self.filter_window_box.setValue(self.filter_window)
+		self.filter_window_box.setEnabled(False)
+		self.filter_window_box.editingFinished.connect(self.change_trace_filter)
+
 		self.trace_file_label = QLabel("No trace loaded")
 		self.trace_file_label.setStyleSheet("color: gray; font-size: 12px; padding-left: 10px;")
 		self.trace_file_label.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Preferred)
@@ -211,6 +358,15 @@ class VasoAnalyzerApp(QMainWindow):
 		top_row_layout.addWidget(self.loadTraceBtn)
 		top_row_layout.addWidget(self.load_snapshot_button)
 		top_row_layout.addWidget(self.excel_btn)
+		top_row_layout.addWidget(self.follow_btn)
+		top_row_layout.addWidget(self.session_btn)
+		top_row_layout.addWidget(self.compare_btn)
+		top_row_layout.addWidget(self.detect_btn)
+		top_row_layout.addWidget(self.undo_btn)
+		top_row_layout.addWidget(self.redo_btn)
+		top_row_layout.addWidget(self.navigate_btn)
+		top_row_layout.addWidget(self.filter_selector)
+		top_row_layout.addWidget(self.filter_window_box)
 		top_row_layout.addWidget(self.trace_file_label)
 	
 		main_layout.addLayout(top_row_layout)
@@ -222,6 +378,7 @@ class VasoAnalyzerApp(QMainWindow):
 		self.scroll_slider.setSingleStep(1)
 		self.scroll_slider.setValue(0)
 		self.scroll_slider.valueChanged.connect(self.scroll_plot)
+		self.scroll_slider.sliderReleased.connect(self.views.push)
 		self.scroll_slider.hide()
 		self.scroll_slider.setToolTip("Scroll timeline (X-axis)")
 	
@@ -230,6 +387,10 @@ class VasoAnalyzerApp(QMainWindow):
 		plot_layout.setSpacing(4)
 		plot_layout.addWidget(self.canvas)
 		plot_layout.addWidget(self.scroll_slider)
+
+		# ===== TIFF Filmstrip =====
+		self.filmstrip = FilmstripWidget()
+		plot_layout.addWidget(self.filmstrip)
 	
 		left_layout = QVBoxLayout()
 		left_layout.setSpacing(0)
@@ -249,10 +410,11 @@ class VasoAnalyzerApp(QMainWindow):
 		self.slider.valueChanged.connect(self.change_frame)
 		self.slider.hide()
 		self.slider.setToolTip("Navigate TIFF frames")
+		self.filmstrip.frameClicked.connect(self.slider.setValue)
 	
 		self.event_table = QTableWidget()
-		self.event_table.setColumnCount(4)
-		self.event_table.setHorizontalHeaderLabels(["Event", "Time (s)", "Frame", "ID (µm)"])
+		self.event_table.setColumnCount(4 + len(METRIC_COLUMNS))
+		self.event_table.setHorizontalHeaderLabels(["Event", "Time (s)", "Frame", "ID (µm)"] + list(METRIC_COLUMNS))
 		self.event_table.setMinimumWidth(400)
 		self.event_table.setEditTriggers(QAbstractItemView.DoubleClicked)
 		self.event_table.setSelectionBehavior(QAbstractItemView.SelectRows)
@@ -295,8 +457,6 @@ class VasoAnalyzerApp(QMainWindow):
 		self.hover_label.hide()
 	
 		# ===== Canvas Interactions =====
-		self.canvas.mpl_connect("draw_event", self.update_event_label_positions)
-		self.canvas.mpl_connect("motion_notify_event", self.update_event_label_positions)
 		self.canvas.mpl_connect("motion_notify_event", self.update_hover_label)
 		self.canvas.mpl_connect("button_press_event", self.handle_click_on_plot)
 		self.canvas.mpl_connect("button_release_event", lambda event: QTimer.singleShot(100, lambda: self.on_mouse_release(event)))
@@ -312,6 +472,9 @@ class VasoAnalyzerApp(QMainWindow):
 		menu = QMenu(self)
 		view_metadata_action = menu.addAction("📋 View Frame Metadata")
 		view_metadata_action.triggered.connect(self.show_current_frame_metadata)
+		remeasure_action = menu.addAction("📏 Re-measure Diameter…")
+		remeasure_action.setEnabled(self.trace_data is not None and bool(self.tiff_file))
+		remeasure_action.triggered.connect(self.open_remeasure_dialog)
 		
 		menu.exec_(self.snapshot_label.mapToGlobal(pos))
 
@@ -320,13 +483,30 @@ class VasoAnalyzerApp(QMainWindow):
 		file_path, _ = QFileDialog.getOpenFileName(self, "Select Trace File", "", "CSV Files (*.csv)")
 		if not file_path:
 			return
-	
+
+		self.follow_btn.setChecked(False)
+		from vasoanalyzer.trace_loader import load_trace
+		from vasoanalyzer.event_loader import load_events
+		from vasoanalyzer.event_table import build_event_table
+
+		channels = self.choose_channels(file_path)
+		if channels is None:
+			return
+		self.flush_auto_export()
+		self.undo_stack.clear()
+		self.pins.clear()
+
 		try:
-			# Load trace
-			self.trace_data = load_trace(file_path)
+			# Load trace (only the time, diameter and selected channel columns are parsed)
+			self.trace_data = load_trace(file_path, columns=channels)
+			self.filter_cache.clear()
+			self.trace_file = file_path
 			self.trace_file_path = os.path.dirname(file_path)
 			trace_filename = os.path.basename(file_path)
 			self.trace_file_label.setText(f"🧪 {trace_filename}")
+			self.follow_btn.setEnabled(True)
+			self.compare_btn.setEnabled(True)
+			self.detect_btn.setEnabled(True)
 			self.update_plot()
 		except Exception as e:
 			QMessageBox.critical(self, "Trace Load Error", f"Failed to load trace file:\n{e}")
@@ -342,39 +522,68 @@ class VasoAnalyzerApp(QMainWindow):
 				self.event_labels, self.event_times, self.event_frames = load_events(event_path)
 	
 				# Generate table data by sampling diameters
-				diam_trace = self.trace_data['Inner Diameter']
-				time_trace = self.trace_data['Time (s)']
-				self.event_table_data = []
-	
-				for i in range(len(self.event_times)):
-					if i < len(self.event_times) - 1:
-						t_sample = self.event_times[i+1] - 2  # 2 sec before next
-						idx_pre = np.argmin(np.abs(time_trace - t_sample))
-					else:
-						idx_pre = -1
-
-					# Calculate frame number based on event time and recording interval
-					frame_number = self.event_times[i]
-
-					diam_pre = diam_trace.iloc[idx_pre]
-					self.event_table_data.append((
-						self.event_labels[i],
-						round(self.event_times[i], 2),
-						frame_number,  # Using actual frame number
-						round(diam_pre, 2)
-					))
+				trace = self.filtered_trace()
+				# A followed file may have events before its first trace row
+				self.event_table_data = build_event_table(
+					trace['Time (s)'],
+					trace['Inner Diameter'],
+					self.event_labels,
+					self.event_times,
+					self.event_frames
+				) if len(trace) else []
 	
 				self.populate_table()
 				self.update_plot()
-				self.excel_btn.setEnabled(True)
+				self.excel_map_action.setEnabled(True)
 			except Exception as e:
 				QMessageBox.warning(self, "Event Load Error", f"Trace loaded, but failed to load events:\n{e}")
 		else:
-			QMessageBox.information(self, "Event File Not Found", f"No matching event file found:\n{event_filename}")
+			# Events of the previously loaded trace don't belong to this one
+			self.event_labels, self.event_times, self.event_frames = [], [], None
+			self.event_table_data = []
+			self.populate_table()
+			self.update_plot()
+			self.excel_map_action.setEnabled(False)
+			reply = QMessageBox.question(
+				self, "Event File Not Found",
+				f"No matching event file found:\n{event_filename}\n\nDetect events from the diameter trace instead?",
+				QMessageBox.Yes | QMessageBox.No
+			)
+			if reply == QMessageBox.Yes:
+				self.open_event_detection_dialog()
+
+	def choose_channels(self, file_path):
+		"""Ask which extra columns to load; returns a list, or None if cancelled."""
+		from vasoanalyzer.trace_loader import read_trace_columns, TIME_COLUMN, DIAMETER_COLUMN
+
+		try:
+			columns = read_trace_columns(file_path)
+		except Exception as e:
+			QMessageBox.critical(self, "Trace Load Error", f"Failed to read trace file:\n{e}")
+			return None
+		candidates = [col for col in columns if col not in (TIME_COLUMN, DIAMETER_COLUMN)]
+		if not candidates:
+			return []
+
+		from vasoanalyzer.channel_dialog import ChannelSelectionDialog
+
+		dialog = ChannelSelectionDialog(self, candidates, self.selected_channels)
+		if not dialog.exec_():
+			return None
+		self.selected_channels = dialog.selected_columns()
+		return self.selected_channels
+
+	def channels(self):
+		"""Loaded trace columns besides time and inner diameter."""
+		if self.trace_data is None:
+			return []
+		return [col for col in self.trace_data.columns if col not in ('Time (s)', 'Inner Diameter')]
 
 	def load_snapshot(self):
 		file_path, _ = QFileDialog.getOpenFileName(self, "Open Result TIFF", "", "TIFF Files (*.tif *.tiff)")
 		if file_path:
+			from vasoanalyzer.tiff_loader import load_tiff
+
 			try:
 				frames, frames_metadata = load_tiff(file_path)
 				valid_frames = []
@@ -392,31 +601,50 @@ class VasoAnalyzerApp(QMainWindow):
 				if len(valid_frames) < len(frames):
 					QMessageBox.warning(self, "TIFF Warning", "Some TIFF frames were empty or corrupted and were skipped.")
 
-				self.snapshot_frames = valid_frames
-				self.frames_metadata = valid_metadata
-				
-				if self.snapshot_frames:
-					self.display_frame(0)
-					self.slider.setMaximum(len(self.snapshot_frames) - 1)
-					self.slider.setValue(0)
-					self.snapshot_label.show()
-					self.slider.show()
-					self.slider_marker = None
-					
-					# Create metadata button if it doesn't exist
-					if not hasattr(self, 'metadata_btn'):
-						self.metadata_btn = QPushButton("📋 View Metadata")
-						self.metadata_btn.clicked.connect(self.show_current_frame_metadata)
-						
-						# Find the layout containing the snapshot label
-						right_layout = self.snapshot_label.parent().layout()
-						right_layout.addWidget(self.metadata_btn)
-					else:
-						self.metadata_btn.show()
+				self.tiff_file = file_path
+				self.show_snapshot_frames(valid_frames, valid_metadata)
 				
 			except Exception as e:
 				QMessageBox.critical(self, "Error", f"Failed to load TIFF file:\n{e}")
 
+	def show_snapshot_frames(self, frames, frames_metadata):
+		self.snapshot_frames = frames
+		self.frames_metadata = frames_metadata
+
+		if self.snapshot_frames:
+			self.display_frame(0)
+			self.slider.setMaximum(len(self.snapshot_frames) - 1)
+			self.slider.setValue(0)
+			self.snapshot_label.show()
+			self.slider.show()
+			self.slider_marker = None
+			self.show_filmstrip(frames_metadata)
+			self.navigator.set_frames([self.frame_x(i) for i in range(len(self.snapshot_frames))])
+			
+			# Create metadata button if it doesn't exist
+			if not hasattr(self, 'metadata_btn'):
+				self.metadata_btn = QPushButton("📋 View Metadata")
+				self.metadata_btn.clicked.connect(self.show_current_frame_metadata)
+				
+				# Find the layout containing the snapshot label
+				right_layout = self.snapshot_label.parent().layout()
+				right_layout.addWidget(self.metadata_btn)
+			else:
+				self.metadata_btn.show()
+
+	def show_filmstrip(self, frames_metadata):
+		"""Thumbnails of the shown frames under the trace (cached per TIFF, rendered in the background)."""
+		from vasoanalyzer.thumbnails import ThumbnailStore
+
+		store = None
+		if self.tiff_file:
+			try:
+				store = ThumbnailStore(self.tiff_file, [meta.get('index', i) for i, meta in enumerate(frames_metadata)])
+			except Exception as e:
+				print(f"⚠️ Thumbnails unavailable: {e}")
+		self.filmstrip.set_store(store)
+		self.filmstrip.set_current(self.slider.value())
+
 	def show_current_frame_metadata(self):
 		"""Show metadata for the currently displayed frame"""
 		if not hasattr(self, 'frames_metadata') or not self.frames_metadata:
@@ -456,6 +684,7 @@ class VasoAnalyzerApp(QMainWindow):
 		
 		msg.exec_()
 
+	@profiled("display_frame")
 	def display_frame(self, index):
 		if not self.snapshot_frames:
 			return
@@ -497,6 +726,7 @@ class VasoAnalyzerApp(QMainWindow):
 		idx = self.slider.value()
 		self.current_frame = idx
 		self.display_frame(idx)
+		self.filmstrip.set_current(idx)
 		self.update_slider_marker()
 
 		# Add a small indicator that shows metadata is available
@@ -504,38 +734,33 @@ class VasoAnalyzerApp(QMainWindow):
 			num_tags = len(self.frames_metadata[idx])
 			self.metadata_btn.setText(f"📋 View Metadata ({num_tags} tags)")
 
-	def update_slider_marker(self):
-		if self.trace_data is None or not self.snapshot_frames:
-			return
-
-		current_frame_idx = self.slider.value()
-		
+	def frame_x(self, frame_idx):
+		"""Plot x of the TIFF frame at slider position ``frame_idx``."""
 		# Get the actual frame number from metadata if available
-		if hasattr(self, 'frames_metadata') and current_frame_idx < len(self.frames_metadata):
-			frame_meta = self.frames_metadata[current_frame_idx]
+		if hasattr(self, 'frames_metadata') and frame_idx < len(self.frames_metadata):
+			frame_meta = self.frames_metadata[frame_idx]
 			
 			if 'FrameNumber' in frame_meta:
 				# Use the actual frame number from metadata
-				frame_number = frame_meta['FrameNumber']
-				# Convert frame number to time using recording interval
-				t_current = frame_number
-				print(f"Using FrameNumber {frame_number} → time: {t_current:.2f}s")
-			else:
-				# Fall back to slider index if frame number isn't available
-				t_current = current_frame_idx
-				print(f"No FrameNumber in metadata, using slider index: {t_current:.2f}s")
-		else:
-			# Fall back to slider index if no metadata is available
-			t_current = current_frame_idx
-			print(f"No metadata available, using slider index: {t_current:.2f}s")
+				return frame_meta['FrameNumber']
+		# Fall back to slider index if no frame number is available
+		return frame_idx
 
-		if self.slider_marker is None:
-			self.slider_marker = self.ax.axvline(x=t_current, color='red', linestyle='--', linewidth=1.5, label="TIFF Frame")
+	def update_slider_marker(self):
+		if self.trace_data is None or not self.snapshot_frames:
+			return
+
+		t_current = self.frame_x(self.slider.value())
+
+		# Blitted over the plot: moving it does not redraw the trace
+		if self.slider_marker is None or self.slider_marker.axes is None:
+			self.slider_marker = self.views.add_animated(
+				self.ax.axvline(x=t_current, color='red', linestyle='--', linewidth=1.5, label="TIFF Frame")
+			)
 		else:
 			self.slider_marker.set_xdata([t_current, t_current])
 
-		self.canvas.draw_idle()
-		self.canvas.flush_events()
+		self.views.update_animated()
 
 	def populate_event_table_from_df(self, df):
 		self.event_table.setRowCount(len(df))
@@ -544,19 +769,9 @@ class VasoAnalyzerApp(QMainWindow):
 			self.event_table.setItem(row, 1, QTableWidgetItem(str(df.iloc[row].get("Time (s)", ""))))
 			self.event_table.setItem(row, 2, QTableWidgetItem(str(df.iloc[row].get("ID (µm)", ""))))
 
-
-	def update_event_label_positions(self, event=None):
-		if not hasattr(self, 'event_text_objects') or not self.event_text_objects:
-			return
-
-		y_min, y_max = self.ax.get_ylim()
-		y_top = min(y_max - 5, y_max * 0.95)
-
-		for txt, x in self.event_text_objects:
-			txt.set_position((x, y_top))
-
 # [E] ========================= PLOTTING AND EVENT SYNC ============================
-	def update_plot(self):
+	@profiled("update_plot")
+	def update_plot(self, rebuild_table=True):
 		if self.trace_data is None:
 			return
 
@@ -566,71 +781,183 @@ class VasoAnalyzerApp(QMainWindow):
 		self.ax.xaxis.label.set_color('black')
 		self.ax.yaxis.label.set_color('black')
 		self.ax.title.set_color('black')
-		self.event_text_objects = []
-
-		# Plot trace
-		t = self.trace_data['Time (s)']
-		d = self.trace_data['Inner Diameter']
-		self.ax.plot(t, d, 'k-', linewidth=1.5)
+		self.event_markers.attach(self.ax)
+		self.pins.attach(self.ax)
+
+		# Plot trace: the line holds only what the visible x-range needs
+		# (raw samples when zoomed in, a min/max envelope when zoomed out)
+		self.trace_line = self.ax.plot([], [], 'k-', linewidth=1.5)[0]
+		self.overlay.render(self.trace_line, os.path.basename(self.trace_file or ""))
+		t_min, t_max = self.trace_data.t_min, self.trace_data.t_max
+		if self.overlay.t_range():
+			t_min, t_max = min(t_min, self.overlay.t_range()[0]), max(t_max, self.overlay.t_range()[1])
+		self.render_channel_axes()
+		self.refresh_trace_line(t_min, t_max)
+		self.overlay.autoscale()
+		self.autoscale_channel_axes()
+		self.ax.callbacks.connect('xlim_changed', lambda ax: self.refresh_trace_line())
 		self.ax.set_xlabel("Time (s or frames)")
 		self.ax.set_ylabel("Inner Diameter (µm)")
 		self.ax.grid(True, color='#CCC')
 
 		# Plot events if available
 		if self.event_labels and self.event_times:
-			self.event_table_data = []
-			offset_sec = 2
-			nEv = len(self.event_times)
-			diam_trace = self.trace_data['Inner Diameter']
-			time_trace = self.trace_data['Time (s)']
-
-			for i in range(nEv):
-				idx_ev = np.argmin(np.abs(time_trace - self.event_times[i]))
-				diam_at_ev = diam_trace.iloc[idx_ev]
-
-				if i < nEv - 1:
-					t_sample = self.event_times[i+1] - offset_sec
-					idx_pre = np.argmin(np.abs(time_trace - t_sample))
-				else:
-					idx_pre = -1
-				diam_pre = diam_trace.iloc[idx_pre]
-
-				frame_number = self.event_frames[i]
-
-				# Vertical line
-				self.ax.axvline(x=frame_number, color='black', linestyle='--', linewidth=0.8)
-
-				# Label on plot
-				txt = self.ax.text(
-					frame_number, 0, self.event_labels[i],
-					rotation=90,
-					verticalalignment='top',
-					horizontalalignment='right',
-					fontsize=8,
-					color='black',
-					clip_on=True
-				)
-				self.event_text_objects.append((txt, frame_number))
-
-				# Table entry
-				self.event_table_data.append((
-					self.event_labels[i],
-					round(self.event_times[i], 2),
-					frame_number,
-					round(diam_pre, 2)
-				))
+			from vasoanalyzer.event_table import build_event_table
+
+			if rebuild_table:
+				# Undo commands refer to the rows they were made on; a
+				# regenerated table can differ (other filter, channel or data)
+				self.undo_stack.clear()
+				trace = self.filtered_trace()
+				# A followed file may have events before its first trace row
+				self.event_table_data = build_event_table(
+					trace['Time (s)'],
+					trace['Inner Diameter'],
+					self.event_labels,
+					self.event_times,
+					self.event_frames
+				) if len(trace) else []
+
+			self.event_markers.set_events(
+				[row[0] for row in self.event_table_data],
+				[row[2] for row in self.event_table_data]
+			)
 
 			self.populate_table()
 			self.auto_export_table()
 
+		self.refresh_navigation()
+
+		# New content and a new overview: start the zoom/pan history here
+		self.toolbar.update()
 		self.canvas.draw_idle()
 
+	def redraw(self):
+		"""Redraw after the plot's content (not just its view) changed."""
+		self.views.invalidate()
+		self.canvas.draw_idle()
+
+	def refresh_trace_line(self, x_min=None, x_max=None):
+		"""Fill the trace line for [x_min, x_max] (default: current view) from the TraceStore."""
+		if self.trace_data is None or self.trace_line is None:
+			return
+		if x_min is None:
+			x_min, x_max = self.ax.get_xlim()
+		n_bins = max(200, int(self.ax.bbox.width))
+		t, d = self.filtered_trace().envelope('Inner Diameter', x_min, x_max, n_bins)
+		self.trace_line.set_data(t, d)
+		for column, line in self.channel_lines:
+			line.set_data(*self.trace_data.envelope(column, x_min, x_max, n_bins))
+		self.overlay.refresh(x_min, x_max, n_bins)
+
+	def render_channel_axes(self):
+		"""(Re)create one twin y-axis per extra channel, sharing the main x-axis."""
+		for ax in self.channel_axes:
+			self.fig.delaxes(ax)
+		self.channel_axes = []
+		self.channel_lines = []
+
+		channels = self.channels()
+		# Main axes on top (transparent) so clicks, hover and pins keep targeting it
+		self.ax.patch.set_visible(not channels)
+		# Leave room for the offset spines of the 2nd, 3rd, … channel
+		right = rcParams['figure.subplot.right']
+		self.fig.subplots_adjust(right=max(0.5, right - 0.12 * max(0, len(channels) - 1)))
+		for i, column in enumerate(channels):
+			color = CHANNEL_COLORS[i % len(CHANNEL_COLORS)]
+			ax = self.ax.twinx()
+			ax.set_zorder(self.ax.get_zorder() - 1)
+			ax.spines['right'].set_position(('axes', 1 + 0.15 * i))
+			ax.spines['right'].set_color(color)
+			ax.set_ylabel(column, color=color)
+			ax.tick_params(axis='y', colors=color)
+			line, = ax.plot([], [], '-', color=color, linewidth=1.0)
+			self.channel_axes.append(ax)
+			self.channel_lines.append((column, line))
+
+	def autoscale_channel_axes(self):
+		for ax in self.channel_axes:
+			ax.relim()
+			ax.autoscale_view(scalex=False)
+
+	def filtered_trace(self):
+		"""The trace that is plotted, sampled and exported: raw, or its cached filtered copy."""
+		return self.filtered(self.trace_data)
+
+	def filtered(self, store):
+		if store is None or self.trace_filter is None or not len(store):
+			return store
+		return self.filter_cache.get(store, self.trace_filter, self.filter_window)
+
+	def set_trace_filter(self, name, window):
+		"""Select a filter without replotting (used when restoring a session)."""
+		name = name if name in FILTERS else None
+		self.trace_filter, self.filter_window = name, window
+		for widget in (self.filter_selector, self.filter_window_box):
+			widget.blockSignals(True)
+		self.filter_selector.setCurrentIndex(list(FILTERS).index(name) + 1 if name else 0)
+		self.filter_window_box.setValue(window)
+		self.filter_window_box.setEnabled(name is not None)
+		for widget in (self.filter_selector, self.filter_window_box):
+			widget.blockSignals(False)
+
+	def change_trace_filter(self):
+		index = self.filter_selector.currentIndex()
+		name = self.filter_selector.currentText() if index > 0 else None
+		self.filter_window_box.setEnabled(name is not None)
+		window = self.filter_window_box.value()
+		if (name, window) == (self.trace_filter, self.filter_window):
+			return
+
+		previous = (self.trace_filter, self.filter_window)
+		self.trace_filter, self.filter_window = name, window
+		if self.trace_data is None:
+			return
+		try:
+			self.filtered_trace()
+		except ImportError as e:
+			QMessageBox.warning(self, "Filter Unavailable", str(e))
+			self.set_trace_filter(*previous)
+			return
+
+		# Keep the current view; resample the events and metrics from the new trace
+		xlim, ylim = self.ax.get_xlim(), self.ax.get_ylim()
+		self.resample_event_ids(f"Resample IDs from the {name or 'raw'} trace")
+		self.update_plot(rebuild_table=False)
+		self.ax.set_xlim(xlim)
+		self.ax.set_ylim(ylim)
+		self.views.push()
+		self.canvas.draw_idle()
+
+	def resample_event_ids(self, text):
+		"""Resample every event ID from the plotted trace as one undoable step (edited IDs included)."""
+		from vasoanalyzer.event_table import build_event_table
+
+		if not self.event_table_data or len(self.event_table_data) != len(self.event_labels):
+			return
+		trace = self.filtered_trace()
+		rows = build_event_table(
+			trace['Time (s)'], trace['Inner Diameter'],
+			self.event_labels, self.event_times, self.event_frames
+		)
+		commands = [
+			SetEventValue(self, i, old[3], new[3], old[0])
+			for i, (old, new) in enumerate(zip(self.event_table_data, rows))
+			if old[3] != new[3] and not (np.isnan(old[3]) and np.isnan(new[3]))
+		]
+		if commands:
+			self.undo_stack.push(Group(commands, text))
+
+	def draw_event_marker(self, label, frame_number, index=None):
+		"""Draw an event's line and label; ``index`` inserts them among the others (default: append)."""
+		self.event_markers.insert(len(self.event_markers) if index is None else index, label, frame_number)
+
 	def scroll_plot(self):
 		if self.trace_data is None:
 			return
 
-		full_t_min = self.trace_data['Time (s)'].min()
-		full_t_max = self.trace_data['Time (s)'].max()
+		full_t_min = self.trace_data.t_min
+		full_t_max = self.trace_data.t_max
 		xlim = self.ax.get_xlim()
 		window_width = xlim[1] - xlim[0]
 
@@ -642,18 +969,135 @@ class VasoAnalyzerApp(QMainWindow):
 		new_right = new_left + window_width
 
 		self.ax.set_xlim(new_left, new_right)
+		if not self.scroll_slider.isSliderDown():	# Drags are recorded once, on release
+			self.views.push()
 		self.canvas.draw_idle()
 
 # [F] ========================= EVENT TABLE MANAGEMENT ================================
 	def populate_table(self):
+		self.update_table_rows(0)
+
+	def update_table_rows(self, start):
+		"""Re-render table rows from ``start`` onwards (rows before it are untouched)."""
+		self.update_event_metrics(start)
+		extra_columns = self.extra_table_columns()
 		self.event_table.blockSignals(True)
+		if start == 0:
+			self.event_table.setColumnCount(4 + len(extra_columns))
+			self.event_table.setHorizontalHeaderLabels(["Event", "Time (s)", "Frame", "ID (µm)"] + extra_columns)
 		self.event_table.setRowCount(len(self.event_table_data))
-		for row, (label, t, frame, d) in enumerate(self.event_table_data):
+		for row in range(start, len(self.event_table_data)):
+			label, t, frame, d = self.event_table_data[row]
 			self.event_table.setItem(row, 0, QTableWidgetItem(str(label)))
 			self.event_table.setItem(row, 1, QTableWidgetItem(str(t)))
 			self.event_table.setItem(row, 2, QTableWidgetItem(str(frame)))
 			self.event_table.setItem(row, 3, QTableWidgetItem(str(d)))
+			for col, name in enumerate(extra_columns, start=4):
+				self.event_table.setItem(row, col, self.metric_item(self.event_metrics[name][row]))
 		self.event_table.blockSignals(False)
+		self.run_plugins()
+
+	def metric_item(self, value):
+		item = QTableWidgetItem("" if np.isnan(value) else f"{value:.2f}")
+		item.setFlags(item.flags() & ~Qt.ItemIsEditable)
+		return item
+
+	def extra_table_columns(self):
+		"""Derived columns after ID: per-event metrics, plugin columns, then each channel sampled like ID."""
+		return list(METRIC_COLUMNS) + plugin_columns() + self.channels()
+
+	def update_event_metrics(self, start=0):
+		"""Recompute the derived metric and channel columns for table rows from ``start`` onwards."""
+		from vasoanalyzer.event_table import sample_before_next
+
+		times = [row[1] for row in self.event_table_data[start:]]
+		trace = self.filtered_trace()
+		channels = self.channels()
+		values = {name: np.full(len(times), np.nan) for name in self.extra_table_columns()}
+		if trace is not None and len(trace) and times:
+			columns = ['Time (s)', 'Inner Diameter'] + channels
+			if start == 0:
+				window = {col: trace[col] for col in columns}
+			else:
+				# Only the trace from the first affected baseline window onwards is needed
+				window = trace.window(min(times) - BASELINE_SEC, trace.t_max, columns)
+			metrics = compute_event_metrics(window['Time (s)'], window['Inner Diameter'], times)
+			values.update({name: metrics[key] for name, key in METRIC_COLUMNS.items()})
+			for column in channels:
+				values[column] = sample_before_next(window['Time (s)'], window[column], times)
+
+		for name in self.extra_table_columns():
+			kept = list(self.event_metrics.get(name, []))[:start]
+			kept += [np.nan] * (start - len(kept))
+			self.event_metrics[name] = kept + list(values[name])
+
+	def run_plugins(self):
+		"""Queue the analysis plugins on the current trace and events; their columns fill in as they finish.
+
+		Until then (they run on worker processes) the rows being recomputed
+		show blanks; results cached for the same data appear at once. While
+		following a recording, runs are batched every PLUGIN_FOLLOW_MS.
+		"""
+		if not plugin_columns():
+			return
+		if self.follow_timer.isActive():
+			if not self.plugin_follow_timer.isActive():
+				self.plugin_follow_timer.start()
+			return
+		self.start_plugins()
+
+	def start_plugins(self):
+		from vasoanalyzer.plugins import PluginRunner, EventWindows, TraceDigest, digest_columns
+		from vasoanalyzer.filters import filter_reach
+
+		self.plugin_follow_timer.stop()
+		if not plugin_columns():
+			return
+		if self.plugin_runner is None:
+			self.plugin_runner = PluginRunner()
+		self.plugin_runner.cancel()		# Results for the previous events are no use now
+		if self.trace_data is None or not self.event_table_data:
+			return
+
+		trace = self.filtered_trace()
+		channels = {column: trace[column] for column in self.channels()}
+		# Hashing the trace is the costly part of a cache key: keep the hashes of
+		# its settled rows, so a grown trace (follow mode) only hashes new rows
+		if self.plugin_digest is None or self.plugin_digest[0] is not trace or self.plugin_digest[1] != tuple(channels):
+			self.plugin_digest = (trace, tuple(channels), TraceDigest(digest_columns(channels)))
+		# A filtered trace's last rows are refiltered as it grows
+		settled = len(trace) - (filter_reach(self.filter_window) if self.trace_filter else 0)
+		digest = self.plugin_digest[2].hexdigest(trace.rows, len(trace), settled)
+		windows = EventWindows(
+			trace['Time (s)'],
+			trace['Inner Diameter'],
+			[row[0] for row in self.event_table_data],
+			[row[1] for row in self.event_table_data],
+			channels,
+			digest=digest
+		)
+		self.plugin_runner.submit(self.trace_file, windows)
+		self.check_plugin_results()
+		if self.plugin_runner.pending():
+			self.plugin_timer.start()
+
+	def check_plugin_results(self):
+		for _, columns, errors in self.plugin_runner.finished():
+			for error in errors:
+				print(f"⚠️ Analysis plugin failed: {error}")
+			extra_columns = self.extra_table_columns()
+			self.event_table.blockSignals(True)
+			for name, values in columns.items():
+				if len(values) != len(self.event_table_data):
+					continue
+				self.event_metrics[name] = list(values)
+				col = 4 + extra_columns.index(name)
+				for row, value in enumerate(values):
+					self.event_table.setItem(row, col, self.metric_item(value))
+			self.event_table.blockSignals(False)
+			self.schedule_auto_export()
+		if not self.plugin_runner.pending():
+			self.plugin_timer.stop()
 
 	def handle_table_edit(self, item):
 		row = item.row()
@@ -671,28 +1115,17 @@ class VasoAnalyzerApp(QMainWindow):
 			self.populate_table()
 			return
 
-		label = self.event_table_data[row][0]
 		time = self.event_table_data[row][1]
-		frame = self.event_table_data[row][2]  # Get the frame value
-		old_val = self.event_table_data[row][3]  # Changed from index 2 to 3
-		
-		self.last_replaced_event = (row, old_val)
-		self.event_table_data[row] = (label, time, frame, round(new_val, 2))  # Include frame in tuple
-
-		self.auto_export_table()
+		old_val = self.event_table_data[row][3]
+		self.undo_stack.push(SetEventValue(self, row, old_val, round(new_val, 2)))
 		print(f"✏️ ID updated at {time:.2f}s → {new_val:.2f} µm")
 
 	def table_row_clicked(self, row, col):
 		if not self.event_table_data:
 			return
 
-		t = self.event_table_data[row][1]
-
-		if self.selected_event_marker:
-			self.selected_event_marker.remove()
-
-		self.selected_event_marker = self.ax.axvline(x=t, color='blue', linestyle='--', linewidth=1.2)
-		self.canvas.draw()
+		self.navigator.current = row
+		self.select_event(row, center=False)
 		
 # [G] ========================= PIN INTERACTION LOGIC ================================
 	def handle_click_on_plot(self, event):
@@ -705,58 +1138,41 @@ class VasoAnalyzerApp(QMainWindow):
 	
 		# 🔴 Right-click = open pin context menu
 		if event.button == 3:
-			click_x, click_y = event.x, event.y
-	
-			for marker, label in self.pinned_points:
-				data_x = marker.get_xdata()[0]
-				data_y = marker.get_ydata()[0]
-				pixel_x, pixel_y = self.ax.transData.transform((data_x, data_y))
-				pixel_distance = np.hypot(pixel_x - click_x, pixel_y - click_y)
-	
-				if pixel_distance < 10:
-					menu = QMenu(self)
-					replace_action = menu.addAction("Replace Event Value…")
-					delete_action = menu.addAction("Delete Pin")
-					undo_action = menu.addAction("Undo Last Replacement")
-					add_new_action = menu.addAction("➕ Add as New Event")
-	
-					action = menu.exec_(self.canvas.mapToGlobal(event.guiEvent.pos()))
-					if action == delete_action:
-						marker.remove()
-						label.remove()
-						self.pinned_points.remove((marker, label))
-						self.canvas.draw_idle()
-						return
-					elif action == replace_action:
-						self.handle_event_replacement(data_x, data_y)
-						return
-					elif action == undo_action:
-						self.undo_last_replacement()
-						return
-					elif action == add_new_action:
-						self.prompt_add_event(data_x, data_y)
-						return
+			index = self.pins.hit(event.x, event.y)
+			if index is None:
+				return
+			data_x, data_y = float(self.pins.xs[index]), float(self.pins.ys[index])
+
+			menu = QMenu(self)
+			replace_action = menu.addAction("Replace Event Value…")
+			delete_action = menu.addAction("Delete Pin")
+			undo_action = menu.addAction(self.undo_action.text())
+			undo_action.setEnabled(self.undo_stack.can_undo())
+			add_new_action = menu.addAction("➕ Add as New Event")
+
+			action = menu.exec_(self.canvas.mapToGlobal(event.guiEvent.pos()))
+			if action == delete_action:
+				self.undo_stack.push(RemovePin(self, index))
+			elif action == replace_action:
+				self.handle_event_replacement(data_x, data_y)
+			elif action == undo_action:
+				self.undo()
+			elif action == add_new_action:
+				self.prompt_add_event(data_x, data_y)
 			return
 	
 		# 🟢 Left-click = add pin (unless toolbar zoom/pan is active)
 		if event.button == 1 and not self.toolbar.mode:
-			time_array = self.trace_data['Time (s)'].values
-			id_array = self.trace_data['Inner Diameter'].values
-			nearest_idx = np.argmin(np.abs(time_array - x))
-			y = id_array[nearest_idx]
-	
-			marker = self.ax.plot(x, y, 'ro', markersize=6)[0]
-			label = self.ax.annotate(
-				f"{x:.2f} s\n{y:.1f} µm",
-				xy=(x, y),
-				xytext=(6, 6),
-				textcoords='offset points',
-				bbox=dict(boxstyle="round,pad=0.3", fc="white", ec="gray", lw=1),
-				fontsize=8
-			)
-	
-			self.pinned_points.append((marker, label))
-			self.canvas.draw_idle()
+			_, y = self.filtered_trace().value_at(x, 'Inner Diameter')
+			self.undo_stack.push(AddPin(self, x, y))
+
+	def insert_pin(self, index, x, y):
+		self.pins.insert(index, x, y)
+		self.redraw()
+
+	def remove_pin(self, index):
+		self.pins.remove(index)
+		self.redraw()
 	
 	def handle_event_replacement(self, x, y):
 		if not self.event_labels or not self.event_times:
@@ -786,12 +1202,8 @@ class VasoAnalyzerApp(QMainWindow):
 			)
 	
 			if confirm == QMessageBox.Yes:
-				old_value = self.event_table_data[index][2]
-				self.last_replaced_event = (index, old_value)
-				frame_num = self.event_table_data[index][2]
-				self.event_table_data[index] = (event_label, round(event_time, 2), round(y, 2))
-				self.populate_table()
-				self.auto_export_table()
+				old_value = self.event_table_data[index][3]
+				self.undo_stack.push(SetEventValue(self, index, old_value, round(y, 2)))
 				print(f"✅ Replaced value at {event_time:.2f}s with {y:.1f} µm.")
 	
 	def prompt_add_event(self, x, y):
@@ -800,7 +1212,7 @@ class VasoAnalyzerApp(QMainWindow):
 			return
 	
 		# Build label options and insertion points
-		insert_labels = [f"{label} at {t:.2f}s" for label, t, _ in self.event_table_data]
+		insert_labels = [f"{label} at {t:.2f}s" for label, t, _, _ in self.event_table_data]
 		insert_labels.append("↘️ Add to end")  # final option
 	
 		selected, ok = QInputDialog.getItem(
@@ -828,38 +1240,96 @@ class VasoAnalyzerApp(QMainWindow):
 		insert_idx = insert_labels.index(selected)
 
 		# Calculate frame number based on time
-		frame_number = int(x / self.recording_interval)
+		frame_number = int(x / self.recording_interval) if self.event_frames is not None else round(x, 2)
 
-		new_entry = (new_label.strip(), round(x, 2), round(y, 2))
-	
-		# Insert into data
-		if insert_idx == len(self.event_table_data):  # Add to end
-			self.event_labels.append(new_label.strip())
-			self.event_times.append(x)
-			self.event_table_data.append(new_entry)
-		else:
-			self.event_labels.insert(insert_idx, new_label.strip())
-			self.event_times.insert(insert_idx, x)
-			self.event_table_data.insert(insert_idx, new_entry)
-	
-		self.populate_table()
-		self.auto_export_table()
+		new_entry = (new_label.strip(), round(x, 2), frame_number, round(y, 2))
+		self.undo_stack.push(InsertEvents(self, [(insert_idx, new_entry)]))
 		print(f"➕ Inserted new event: {new_entry}")
-	
-	def undo_last_replacement(self):
-		if self.last_replaced_event is None:
-			QMessageBox.information(self, "Undo", "No replacement to undo.")
-			return
-	
-		index, old_val = self.last_replaced_event
-		label, time, frame, _ = self.event_table_data[index]
-	
-		self.event_table_data[index] = (label, time, frame, old_val)
-		self.populate_table()
-		self.auto_export_table()
-	
-		QMessageBox.information(self, "Undo", f"Restored value for '{label}' at {time:.2f}s.")
-		self.last_replaced_event = None
+
+# [G2] ======================== UNDO / REDO AND EDIT PRIMITIVES =====================
+	def undo(self):
+		command = self.undo_stack.undo()
+		if command is not None:
+			print(f"↶ Undid: {command.text}")
+
+	def redo(self):
+		command = self.undo_stack.redo()
+		if command is not None:
+			print(f"↷ Redid: {command.text}")
+
+	def update_undo_actions(self):
+		for action, enabled, text, name in (
+			(self.undo_action, self.undo_stack.can_undo(), self.undo_stack.undo_text(), "↶ Undo"),
+			(self.redo_action, self.undo_stack.can_redo(), self.undo_stack.redo_text(), "↷ Redo"),
+		):
+			action.setEnabled(enabled)
+			action.setToolTip(f"{name} {text}" if text else name)
+
+	def set_event_value(self, row, value):
+		"""Set one event's ID; only that table cell is redrawn and the export is deferred."""
+		label, t, frame, _ = self.event_table_data[row]
+		self.event_table_data[row] = (label, t, frame, value)
+		self.event_table.blockSignals(True)
+		self.event_table.setItem(row, 3, QTableWidgetItem(str(value)))
+		self.event_table.blockSignals(False)
+		self.schedule_auto_export()
+
+	def insert_event(self, index, row):
+		"""Insert an event-table row ``(label, time, frame, ID)`` and its marker at ``index``."""
+		label, t, frame, _ = row
+		self.event_labels.insert(index, label)
+		self.event_times.insert(index, t)
+		if self.event_frames is not None:
+			self.event_frames.insert(index, frame)
+		self.event_table_data.insert(index, row)
+		self.draw_event_marker(label, frame, index)
+
+	def remove_event(self, index):
+		del self.event_labels[index]
+		del self.event_times[index]
+		if self.event_frames is not None:
+			del self.event_frames[index]
+		del self.event_table_data[index]
+		self.event_markers.remove(index)
+
+	def events_changed(self, first):
+		"""Refresh the table from row ``first`` on (metrics of the row before may change too)."""
+		self.refresh_navigation()
+		self.update_table_rows(max(0, first - 1))
+		self.excel_map_action.setEnabled(bool(self.event_table_data))
+		self.schedule_auto_export()
+		self.redraw()
+
+	def schedule_auto_export(self):
+		"""Export the event table once edits pause (a burst of edits costs one export)."""
+		self.auto_export_timer.start()
+
+	def flush_auto_export(self):
+		"""Write a pending export now (before the trace it belongs to is replaced)."""
+		if self.auto_export_timer.isActive():
+			self.auto_export_timer.stop()
+			self.auto_export_table()
+
+	def closeEvent(self, event):
+		if self.export_manager is not None:
+			wait = False
+			if self.export_manager.pending():
+				answer = QMessageBox.question(
+					self, "Exports Running",
+					"Plot exports are still being written.\nWait for them to finish before closing?",
+					QMessageBox.Yes | QMessageBox.No | QMessageBox.Cancel, QMessageBox.Yes
+				)
+				if answer == QMessageBox.Cancel:
+					event.ignore()
+					return
+				wait = answer == QMessageBox.Yes
+			self.export_timer.stop()
+			self.export_manager.shutdown(wait)
+		self.flush_auto_export()
+		self.filmstrip.set_store(None)
+		if self.plugin_runner is not None:
+			self.plugin_runner.shutdown()
+		super().closeEvent(event)
 
 # [H] ========================= HOVER LABEL AND CURSOR SYNC ===========================
 	def update_hover_label(self, event):
@@ -872,14 +1342,14 @@ class VasoAnalyzerApp(QMainWindow):
 			self.hover_label.hide()
 			return
 	
-		time_array = self.trace_data['Time (s)'].values
-		id_array = self.trace_data['Inner Diameter'].values
-		nearest_idx = np.argmin(np.abs(time_array - x_val))
-		y_val = id_array[nearest_idx]
+		_, y_val = self.filtered_trace().value_at(x_val, 'Inner Diameter')
 	
 		frame_num = int(x_val)
 		time_val = frame_num * self.recording_interval
 		text = f"Frame: {frame_num}\nTime: {time_val:.2f} s\nID: {y_val:.2f} µm"
+		for column in self.channels():
+			_, value = self.trace_data.value_at(x_val, column)
+			text += f"\n{column}: {value:.2f}"
 
 		self.hover_label.setText(text)
 	
@@ -894,8 +1364,6 @@ class VasoAnalyzerApp(QMainWindow):
 
 # [I] ========================= ZOOM + SLIDER LOGIC ================================
 	def on_mouse_release(self, event):
-		self.update_event_label_positions(event)
-
 		# Deselect zoom after box zoom
 		if self.toolbar.mode == 'zoom':
 			self.toolbar.zoom()	 # toggles off
@@ -909,8 +1377,8 @@ class VasoAnalyzerApp(QMainWindow):
 		if self.trace_data is None:
 			return
 
-		full_t_min = self.trace_data['Time (s)'].min()
-		full_t_max = self.trace_data['Time (s)'].max()
+		full_t_min = self.trace_data.t_min
+		full_t_max = self.trace_data.t_max
 		xlim = self.ax.get_xlim()
 		self.window_width = xlim[1] - xlim[0]
 
@@ -919,11 +1387,58 @@ class VasoAnalyzerApp(QMainWindow):
 		else:
 			self.scroll_slider.hide()
 
+# [I2] ======================== KEYBOARD EVENT NAVIGATION ===========================
+	def toggle_navigation_mode(self, checked):
+		for action in self.navigation_actions:
+			action.setEnabled(checked)
+		if checked:
+			self.canvas.setFocus()
+
+	def refresh_navigation(self):
+		"""Recompute event windows and nearest TIFF frames after the events or the trace changed."""
+		trace = self.filtered_trace() if self.trace_data is not None else None
+		self.navigator.set_events(
+			[row[1] for row in self.event_table_data],
+			[row[2] for row in self.event_table_data],
+			trace
+		)
+
+	def step_event(self, delta):
+		row = self.navigator.step(delta)
+		if row >= 0:
+			self.select_event(row)
+
+	def step_frame(self, delta):
+		if self.snapshot_frames:
+			self.slider.setValue(self.slider.value() + delta)
+
+	def select_event(self, row, center=True):
+		"""Highlight event ``row``; ``center`` also frames its window and shows its nearest TIFF frame."""
+		t = self.event_table_data[row][1]
+		if self.selected_event_marker is None or self.selected_event_marker.axes is None:
+			self.selected_event_marker = self.views.add_animated(
+				self.ax.axvline(x=t, color='blue', linestyle='--', linewidth=1.2)
+			)
+		else:
+			self.selected_event_marker.set_xdata([t, t])
+
+		if center:
+			xlim, ylim = self.navigator.limits(row, self.filtered_trace(), 'Inner Diameter')
+			self.views.show_limits({self.ax: (xlim, ylim or self.ax.get_ylim())})
+			self.update_scroll_slider()
+			self.event_table.selectRow(row)
+			if self.navigator.frames is not None:
+				self.slider.setValue(int(self.navigator.frames[row]))
+		self.views.update_animated()
+
 # [J] ========================= PLOT STYLE EDITOR ================================
 	def open_plot_style_editor(self):
 		from PyQt5.QtWidgets import QDialog
+		from vasoanalyzer.plot_style_dialog import PlotStyleDialog
 	
 		dialog = PlotStyleDialog(self)
+		if self.plot_style:
+			dialog.set_style(self.plot_style)
 	
 		# Store current styles to revert if Cancel is pressed
 		prev_style = dialog.get_style()
@@ -936,42 +1451,18 @@ class VasoAnalyzerApp(QMainWindow):
 			self.apply_plot_style(prev_style)
 	
 	def apply_plot_style(self, style):
-		# Axis Titles
-		self.ax.xaxis.label.set_fontsize(style['axis_font_size'])
-		self.ax.xaxis.label.set_fontname(style['axis_font_family'])
-		self.ax.xaxis.label.set_fontstyle('italic' if style['axis_italic'] else 'normal')
-		self.ax.xaxis.label.set_fontweight('bold' if style['axis_bold'] else 'normal')
-	
-		self.ax.yaxis.label.set_fontsize(style['axis_font_size'])
-		self.ax.yaxis.label.set_fontname(style['axis_font_family'])
-		self.ax.yaxis.label.set_fontstyle('italic' if style['axis_italic'] else 'normal')
-		self.ax.yaxis.label.set_fontweight('bold' if style['axis_bold'] else 'normal')
-	
-		# Tick Labels
-		self.ax.tick_params(axis='x', labelsize=style['tick_font_size'])
-		self.ax.tick_params(axis='y', labelsize=style['tick_font_size'])
-	
-		# Event Labels
-		for txt, _ in self.event_text_objects:
-			txt.set_fontsize(style['event_font_size'])
-			txt.set_fontname(style['event_font_family'])
-			txt.set_fontstyle('italic' if style['event_italic'] else 'normal')
-			txt.set_fontweight('bold' if style['event_bold'] else 'normal')
-	
-		# Pinned Labels
-		for marker, label in self.pinned_points:
-			marker.set_markersize(style['pin_size'])
-			label.set_fontsize(style['pin_font_size'])
-			label.set_fontname(style['pin_font_family'])
-			label.set_fontstyle('italic' if style['pin_italic'] else 'normal')
-			label.set_fontweight('bold' if style['pin_bold'] else 'normal')
-	
-		# Line Width — ONLY change the main trace line
-		main_line = self.ax.lines[0] if self.ax.lines else None
-		if main_line:
-			main_line.set_linewidth(style['line_width'])
-	
-		self.canvas.draw_idle()
+		self.plot_style = dict(style)
+
+		from vasoanalyzer.plot_document import apply_style
+
+		# Axis titles, tick labels, event and pin labels; line width only for the main trace
+		apply_style(
+			self.ax, style,
+			trace_line=self.trace_line,
+			events=self.event_markers,
+			pins=self.pins
+		)
+		self.redraw()
 		
 	
 	def open_customize_dialog(self):
@@ -979,11 +1470,15 @@ class VasoAnalyzerApp(QMainWindow):
 		is_grid_visible = any(line.get_visible() for line in self.ax.get_xgridlines())
 		self.ax.grid(not is_grid_visible)
 		self.toolbar.edit_parameters()
-		self.canvas.draw_idle()
+		self.redraw()
 
 
 # [K] ========================= EXPORT LOGIC (CSV, FIG) ==============================
+	@profiled("auto_export_table")
 	def auto_export_table(self):
+		import pandas as pd
+		from vasoanalyzer.excel_mapper import update_excel_file
+
 		if not self.trace_file_path:
 			print("⚠️ No trace path set. Cannot export event table.")
 			return
@@ -992,6 +1487,8 @@ class VasoAnalyzerApp(QMainWindow):
 			output_dir = os.path.abspath(self.trace_file_path)
 			csv_path = os.path.join(output_dir, "eventDiameters_output.csv")
 			df = pd.DataFrame(self.event_table_data, columns=["Event", "Time (s)", "Frame", "ID (µm)"])
+			for name in self.extra_table_columns():
+				df[name] = np.round(self.event_metrics.get(name, [np.nan] * len(df)), 2)
 			df.to_csv(csv_path, index=False)
 			print(f"✔ Event table auto-exported to:\n{csv_path}")
 		except Exception as e:
@@ -1002,49 +1499,116 @@ class VasoAnalyzerApp(QMainWindow):
 				self.excel_auto_path,
 				self.event_table_data,
 				start_row=3,
-				column_letter=self.excel_auto_column
+				column_letter=self.excel_auto_column,
+				match_labels=self.excel_auto_match
 			)
 
+	@profiled("auto_export_editable_plot")
 	def auto_export_editable_plot(self):
-		if not self.trace_file_path:
+		from vasoanalyzer.plot_document import save_plot_document, PLOT_DOCUMENT_EXTENSION
+
+		if not self.trace_file_path or self.trace_data is None:
 			return
 		try:
-			pickle_path = os.path.join(os.path.abspath(self.trace_file_path), "tracePlot_output.fig.pickle")
-			with open(pickle_path, 'wb') as f:
-				pickle.dump(self.fig, f)
-			print(f"✔ Editable trace figure saved to:\n{pickle_path}")
+			doc_path = os.path.join(os.path.abspath(self.trace_file_path), f"tracePlot_output{PLOT_DOCUMENT_EXTENSION}")
+			trace = self.filtered_trace()
+			document = {
+				"trace_label": os.path.basename(self.trace_file or ""),
+				"diameter_column": 'Inner Diameter',
+				"channels": self.channels(),
+				"channel_colors": CHANNEL_COLORS,
+				"trace_filter": self.trace_filter,
+				"filter_window": self.filter_window,
+				"events": [{"label": label, "x": x} for label, x in self.event_markers.positions()],
+				"event_table": [list(row) for row in self.event_table_data],
+				"pins": self.pins.positions(),
+				"style": self.plot_style,
+				"xlim": self.ax.get_xlim(),
+				"ylim": self.ax.get_ylim(),
+				"xlabel": self.ax.get_xlabel(),
+				"ylabel": self.ax.get_ylabel(),
+				"grid": self.grid_visible,
+				"figsize": tuple(self.fig.get_size_inches()),
+				"comparison_mode": self.overlay.mode,
+			}
+			comparison = [
+				(label, self.filtered(store)['Time (s)'], self.filtered(store)[self.overlay.column])
+				for label, store in self.overlay.traces
+			]
+			save_plot_document(doc_path, document, {col: trace[col] for col in trace.columns}, comparison)
+			print(f"✔ Editable trace plot saved to:\n{doc_path}")
 		except Exception as e:
-			print(f"❌ Failed to save .pickle figure:\n{e}")
+			print(f"❌ Failed to save editable plot:\n{e}")
 
 	def export_high_res_plot(self):
 		if not self.trace_file_path:
 			QMessageBox.warning(self, "Export Error", "No trace file loaded.")
 			return
 
-		save_path, _ = QFileDialog.getSaveFileName(
+		all_formats = "All Formats: TIFF + SVG + PDF + PNG (*.tiff *.svg *.pdf *.png)"
+		save_path, selected_filter = QFileDialog.getSaveFileName(
 			self,
 			"Save High-Resolution Plot",
 			os.path.join(os.path.abspath(self.trace_file_path), "tracePlot_highres.tiff"),
-			"TIFF Image (*.tiff);;SVG Vector (*.svg)"
+			f"TIFF Image (*.tiff);;SVG Vector (*.svg);;PDF Document (*.pdf);;PNG Image (*.png);;{all_formats}"
 		)
 
 		if save_path:
-			try:
-				ext = os.path.splitext(save_path)[1].lower()
-				if ext == ".svg":
-					self.fig.savefig(save_path, format='svg', bbox_inches='tight')
-				else:
-					self.fig.savefig(save_path, format='tiff', dpi=600, bbox_inches='tight')
+			from vasoanalyzer.export_jobs import EXPORT_FORMATS
 
-				QMessageBox.information(self, "Export Complete", f"Plot exported:\n{save_path}")
-			except Exception as e:
-				QMessageBox.critical(self, "Export Failed", str(e))
+			base, ext = os.path.splitext(save_path)
+			if selected_filter == all_formats:
+				targets = [(f"{base}.{fmt}", fmt) for fmt in EXPORT_FORMATS]
+			else:
+				fmt = {".tif": "tiff"}.get(ext.lower(), ext.lower().lstrip("."))
+				targets = [(save_path, fmt if fmt in EXPORT_FORMATS else "tiff")]
+			self.start_figure_export(targets)
+			self.auto_export_editable_plot()
+
+	def start_figure_export(self, targets):
+		"""Snapshot the figure and render ``[(path, fmt)]`` in worker processes."""
+		from vasoanalyzer.export_jobs import ExportManager, EXPORT_FORMATS, snapshot_figure
+
+		try:
+			dpi = max(EXPORT_FORMATS[fmt] or 72 for _, fmt in targets)
+			snapshot = snapshot_figure(self.fig, self.line_sources(), n_bins=int(self.fig.get_figwidth() * dpi))
+			if self.export_manager is None:
+				self.export_manager = ExportManager()
+			self.export_manager.submit(snapshot, targets)
+		except Exception as e:
+			QMessageBox.critical(self, "Export Failed", str(e))
+			return
+		self.export_timer.start()
+		print(f"⏳ Exporting {len(targets)} plot file(s) in the background…")
+
+	def check_figure_exports(self):
+		for paths, errors in self.export_manager.finished():
+			if errors:
+				QMessageBox.critical(self, "Export Failed", "\n".join(errors))
+			if paths:
+				print("✔ Plot exported:\n" + "\n".join(paths))
+				QMessageBox.information(self, "Export Complete", "Plot exported:\n" + "\n".join(paths))
+		if not self.export_manager.pending():
+			self.export_timer.stop()
+
+	def line_sources(self):
+		"""Lines filled from a TraceStore, mapped to (store, column) so exports can re-read them."""
+		sources = {}
+		if self.trace_line is not None:
+			sources[self.trace_line] = (self.filtered_trace(), 'Inner Diameter')
+		for column, line in self.channel_lines:
+			sources[line] = (self.trace_data, column)
+		for line, (_, store) in zip(self.overlay.lines, self.overlay.traces):
+			sources[line] = (self.filtered(store), self.overlay.column)
+		return sources
 
 
 	def open_excel_mapping_dialog(self):
 		if not self.event_table_data:
 			QMessageBox.warning(self, "No Data", "No event data available to export.")
 			return
+
+		from vasoanalyzer.excel_mapper import ExcelMappingDialog
 		
 		# Format the data as dictionaries with all four fields
 		dialog_data = [
@@ -1056,6 +1620,15 @@ class VasoAnalyzerApp(QMainWindow):
 		if dialog.exec_():
 			self.excel_auto_path = dialog.excel_path
 			self.excel_auto_column = dialog.column_selector.currentText()
+			self.excel_auto_match = dialog.auto_matched
+
+	def open_bulk_excel_dialog(self):
+		from vasoanalyzer.excel_mapper import BulkExcelDialog
+
+		current = None
+		if self.event_table_data:
+			current = (os.path.basename(self.trace_file or "Current recording"), self.event_table_data)
+		BulkExcelDialog(self, current).exec_()
 
 	def toggle_grid(self):
 		self.grid_visible = not self.grid_visible
@@ -1063,221 +1636,460 @@ class VasoAnalyzerApp(QMainWindow):
 			self.ax.grid(True, color='#CCC')
 		else:
 			self.ax.grid(False)
-		self.canvas.draw_idle()
+		self.redraw()
 
+# [L] ========================= SESSION SAVE / RESUME ===============================
+	def save_session_dialog(self):
+		if self.trace_data is None:
+			QMessageBox.warning(self, "No Data", "Load a trace before saving a session.")
+			return
 
-# [L] ========================= PlotStyleDialog =========================
-from PyQt5.QtWidgets import (
-	QDialog, QTabWidget, QWidget, QVBoxLayout, QHBoxLayout, QLabel, QComboBox, QSpinBox,
-	QCheckBox, QPushButton, QFormLayout
-)
+		from vasoanalyzer.session import SESSION_EXTENSION
 
-class PlotStyleDialog(QDialog):
-	def __init__(self, parent=None):
-		super().__init__(parent)
-		self.setWindowTitle("Plot Style Editor")
-		self.setMinimumWidth(400)
+		default_name = os.path.splitext(self.trace_file or "session")[0] + SESSION_EXTENSION
+		path, _ = QFileDialog.getSaveFileName(
+			self, "Save Session", default_name, f"VasoAnalyzer Session (*{SESSION_EXTENSION})"
+		)
+		if not path:
+			return
+		try:
+			self.save_session(path)
+			print(f"✔ Session saved to:\n{path}")
+		except Exception as e:
+			QMessageBox.critical(self, "Session Save Error", f"Failed to save session:\n{e}")
 
-		self.tabs = QTabWidget()
-		main_layout = QVBoxLayout()
-		main_layout.addWidget(self.tabs)
-		self.setLayout(main_layout)
+	def open_session_dialog(self):
+		from vasoanalyzer.session import SESSION_EXTENSION
 
-		# ===== Bottom OK / Apply / Cancel =====
-		btn_row = QHBoxLayout()
-		btn_row.setContentsMargins(10, 4, 10, 10)
-		
-		self.ok_btn = QPushButton("OK")
-		self.cancel_btn = QPushButton("Cancel")
-		self.apply_btn = QPushButton("Apply")
-		
-		self.ok_btn.clicked.connect(self.accept)
-		self.cancel_btn.clicked.connect(self.reject)
-		self.apply_btn.clicked.connect(self.handle_apply_all)
-		
-		btn_row.addStretch()
-		btn_row.addWidget(self.apply_btn)
-		btn_row.addWidget(self.cancel_btn)
-		btn_row.addWidget(self.ok_btn)
-		
-		main_layout.addLayout(btn_row)
+		path, _ = QFileDialog.getOpenFileName(
+			self, "Open Session", "", f"VasoAnalyzer Session (*{SESSION_EXTENSION})"
+		)
+		if not path:
+			return
+		try:
+			self.restore_session(path)
+		except Exception as e:
+			QMessageBox.critical(self, "Session Load Error", f"Failed to open session:\n{e}")
+
+	def save_session(self, path):
+		from vasoanalyzer.session import save_session
+
+		state = {
+			"trace_file": self.trace_file,
+			"event_labels": list(self.event_labels),
+			"event_times": list(self.event_times),
+			"event_frames": list(self.event_frames) if self.event_frames is not None else None,
+			"event_table": [list(row) for row in self.event_table_data],
+			"pins": self.pins.positions(),
+			"tiff_file": self.tiff_file,
+			"frames_metadata": self.frames_metadata if self.tiff_file else [],
+			"plot_style": self.plot_style,
+			"trace_filter": self.trace_filter,
+			"filter_window": self.filter_window,
+			"excel_auto_path": self.excel_auto_path,
+			"excel_auto_column": self.excel_auto_column,
+			"excel_auto_match": self.excel_auto_match,
+			"comparison_files": list(self.comparison_files),
+			"comparison_mode": self.overlay.mode,
+		}
+		trace_columns = {col: np.asarray(self.trace_data[col]) for col in self.trace_data.columns}
+		save_session(path, state, trace_columns)
+
+	def restore_session(self, path):
+		from vasoanalyzer.session import load_session
+		from vasoanalyzer.trace_loader import TraceStore
+
+		state, trace_columns = load_session(path)
+		self.follow_btn.setChecked(False)
+		self.flush_auto_export()
+		self.undo_stack.clear()
+
+		# Trace
+		self.trace_data = TraceStore.from_arrays(trace_columns)
+		self.filter_cache.clear()
+		self.trace_file = state.get("trace_file")
+		self.trace_file_path = os.path.dirname(self.trace_file) if self.trace_file else os.path.dirname(path)
+		self.trace_file_label.setText(f"🧪 {os.path.basename(self.trace_file or path)}")
+		self.follow_btn.setEnabled(bool(self.trace_file and os.path.exists(self.trace_file)))
+		self.compare_btn.setEnabled(True)
+		self.detect_btn.setEnabled(True)
+
+		# Events + table exactly as they were edited
+		self.event_labels = state.get("event_labels", [])
+		self.event_times = state.get("event_times", [])
+		self.event_frames = state.get("event_frames")
+		self.event_table_data = [tuple(row) for row in state.get("event_table", [])]
+		self.pins.clear()
+		self.slider_marker = None
+		self.set_trace_filter(state.get("trace_filter"), state.get("filter_window", self.filter_window))
+		self.restore_comparison(state.get("comparison_files", []), state.get("comparison_mode", OVERLAY))
+		self.update_plot(rebuild_table=False)
+		self.excel_map_action.setEnabled(bool(self.event_table_data))
+
+		# Pins
+		for x, y in state.get("pins", []):
+			self.pins.append(x, y)
+
+		# Excel mapping and style
+		self.excel_auto_path = state.get("excel_auto_path")
+		self.excel_auto_column = state.get("excel_auto_column")
+		self.excel_auto_match = state.get("excel_auto_match", False)
+		if state.get("plot_style"):
+			self.apply_plot_style(state["plot_style"])
+
+		# TIFF: reuse the stored metadata index, only map/decode the sampled pages
+		tiff_file = state.get("tiff_file")
+		frames_metadata = state.get("frames_metadata") or []
+		if tiff_file and os.path.exists(tiff_file) and frames_metadata:
+			from vasoanalyzer.tiff_loader import load_tiff_frames
+
+			frames = load_tiff_frames(tiff_file, [meta["index"] for meta in frames_metadata])
+			self.tiff_file = tiff_file
+			self.show_snapshot_frames(frames, frames_metadata)
+		elif tiff_file:
+			print(f"⚠️ Session TIFF not found, skipping snapshots:\n{tiff_file}")
+
+		self.redraw()
+		print(f"✔ Session restored from:\n{path}")
+
+# [M] ========================= LIVE TAIL (FOLLOW MODE) =============================
+	def event_file_for_trace(self, trace_file):
+		base_name = os.path.splitext(os.path.basename(trace_file))[0]
+		return os.path.join(os.path.dirname(trace_file), f"{base_name}_table.csv")
+
+	def toggle_follow_mode(self, checked):
+		if checked:
+			self.start_follow()
+		else:
+			self.stop_follow()
 
-		# Track settings per tab
-		self.init_axis_tab()
-		self.init_tick_tab()
-		self.init_event_tab()
-		self.init_pin_tab()
-		self.init_line_tab()
-
-	def init_axis_tab(self):
-		tab = QWidget()
-		layout = QVBoxLayout(tab)
-		form = QFormLayout()
-
-		self.axis_font_size = QSpinBox()
-		self.axis_font_size.setRange(6, 32)
-		self.axis_font_size.setValue(14)
-
-		self.axis_font_family = QComboBox()
-		self.axis_font_family.addItems(["Arial", "Helvetica", "Times New Roman", "Courier", "Verdana"])
-
-		self.axis_bold = QCheckBox("Bold")
-		self.axis_italic = QCheckBox("Italic")
-
-		form.addRow("Font Size:", self.axis_font_size)
-		form.addRow("Font Family:", self.axis_font_family)
-		form.addRow("", self.axis_bold)
-		form.addRow("", self.axis_italic)
-
-		layout.addLayout(form)
-		layout.addLayout(self.button_row('axis'))
-		self.tabs.addTab(tab, "Axis Titles")
-
-	def init_tick_tab(self):
-		tab = QWidget()
-		layout = QVBoxLayout(tab)
-		form = QFormLayout()
-
-		self.tick_font_size = QSpinBox()
-		self.tick_font_size.setRange(6, 32)
-		self.tick_font_size.setValue(12)
-
-		form.addRow("Tick Label Font Size:", self.tick_font_size)
-
-		layout.addLayout(form)
-		layout.addLayout(self.button_row('tick'))
-		self.tabs.addTab(tab, "Tick Labels")
-
-	def init_event_tab(self):
-		tab = QWidget()
-		layout = QVBoxLayout(tab)
-		form = QFormLayout()
-
-		self.event_font_size = QSpinBox()
-		self.event_font_size.setRange(6, 32)
-		self.event_font_size.setValue(10)
-
-		self.event_font_family = QComboBox()
-		self.event_font_family.addItems(["Arial", "Helvetica", "Times New Roman", "Courier", "Verdana"])
-
-		self.event_bold = QCheckBox("Bold")
-		self.event_italic = QCheckBox("Italic")
-
-		form.addRow("Font Size:", self.event_font_size)
-		form.addRow("Font Family:", self.event_font_family)
-		form.addRow("", self.event_bold)
-		form.addRow("", self.event_italic)
-
-		layout.addLayout(form)
-		layout.addLayout(self.button_row('event'))
-		self.tabs.addTab(tab, "Event Labels")
-
-	def init_pin_tab(self):
-		tab = QWidget()
-		layout = QVBoxLayout(tab)
-		form = QFormLayout()
-
-		self.pin_font_size = QSpinBox()
-		self.pin_font_size.setRange(6, 32)
-		self.pin_font_size.setValue(10)
-
-		self.pin_font_family = QComboBox()
-		self.pin_font_family.addItems(["Arial", "Helvetica", "Times New Roman", "Courier", "Verdana"])
-
-		self.pin_bold = QCheckBox("Bold")
-		self.pin_italic = QCheckBox("Italic")
-
-		self.pin_size = QSpinBox()
-		self.pin_size.setRange(2, 20)
-		self.pin_size.setValue(6)
-
-		form.addRow("Font Size:", self.pin_font_size)
-		form.addRow("Font Family:", self.pin_font_family)
-		form.addRow("", self.pin_bold)
-		form.addRow("", self.pin_italic)
-		form.addRow("Marker Size:", self.pin_size)
-
-		layout.addLayout(form)
-		layout.addLayout(self.button_row('pin'))
-		self.tabs.addTab(tab, "Pinned Labels")
-
-	def init_line_tab(self):
-		tab = QWidget()
-		layout = QVBoxLayout(tab)
-		form = QFormLayout()
-
-		self.line_width = QSpinBox()
-		self.line_width.setRange(1, 10)
-		self.line_width.setValue(2)
-
-		form.addRow("Trace Line Width:", self.line_width)
-		layout.addLayout(form)
-		layout.addLayout(self.button_row('line'))
-		self.tabs.addTab(tab, "Trace Style")
-
-	def button_row(self, section):
-		layout = QHBoxLayout()
-		apply_btn = QPushButton("Apply")
-		default_btn = QPushButton("Default")
-	
-		apply_btn.clicked.connect(lambda: self.handle_apply_tab(section))
-		default_btn.clicked.connect(lambda: self.reset_defaults(section))
-	
-		layout.addStretch()
-		layout.addWidget(apply_btn)
-		layout.addWidget(default_btn)
-		return layout
-	
-	def handle_apply_tab(self, section):
-		# Only reapply current tab settings (optional expansion in future)
-		if hasattr(self.parent(), "apply_plot_style"):
-			self.parent().apply_plot_style(self.get_style())
-
-	def handle_apply_all(self):
-		if hasattr(self.parent(), "apply_plot_style"):
-			self.parent().apply_plot_style(self.get_style())
-
-	def reset_defaults(self, section):
-		if section == 'axis':
-			self.axis_font_size.setValue(14)
-			self.axis_font_family.setCurrentText("Arial")
-			self.axis_bold.setChecked(False)
-			self.axis_italic.setChecked(False)
-		elif section == 'tick':
-			self.tick_font_size.setValue(12)
-		elif section == 'event':
-			self.event_font_size.setValue(10)
-			self.event_font_family.setCurrentText("Arial")
-			self.event_bold.setChecked(False)
-			self.event_italic.setChecked(False)
-		elif section == 'pin':
-			self.pin_font_size.setValue(10)
-			self.pin_font_family.setCurrentText("Arial")
-			self.pin_bold.setChecked(False)
-			self.pin_italic.setChecked(False)
-			self.pin_size.setValue(6)
-		elif section == 'line':
-			self.line_width.setValue(2)
-
-	def get_style(self):
-		return {
-			"axis_font_size": self.axis_font_size.value(),
-			"axis_font_family": self.axis_font_family.currentText(),
-			"axis_bold": self.axis_bold.isChecked(),
-			"axis_italic": self.axis_italic.isChecked(),
-
-			"tick_font_size": self.tick_font_size.value(),
-
-			"event_font_size": self.event_font_size.value(),
-			"event_font_family": self.event_font_family.currentText(),
-			"event_bold": self.event_bold.isChecked(),
-			"event_italic": self.event_italic.isChecked(),
-
-			"pin_font_size": self.pin_font_size.value(),
-			"pin_font_family": self.pin_font_family.currentText(),
-			"pin_bold": self.pin_bold.isChecked(),
-			"pin_italic": self.pin_italic.isChecked(),
-			"pin_size": self.pin_size.value(),
-
-			"line_width": self.line_width.value()
-		}
\ No newline at end of file
+	def start_follow(self):
+		if not self.trace_file:
+			self.follow_btn.setChecked(False)
+			return
+
+		from vasoanalyzer.live_tail import TraceTail, EventTail
+		from vasoanalyzer.trace_loader import TraceStore
+
+		# Re-read the file once through the tail so later polls only see appended bytes;
+		# keep the channels that were selected when the trace was loaded
+		columns = list(self.trace_data.columns) if self.trace_data is not None else None
+		self.trace_tail = TraceTail(self.trace_file, usecols=columns)
+		first = self.trace_tail.poll()
+		if first:
+			numeric = [col for col, values in first.items() if np.issubdtype(values.dtype, np.number)]
+		else:
+			# Only the header so far: start empty with the selected channels it names
+			numeric = [col for col in self.trace_tail.columns() if columns is None or col in columns]
+		if 'Time (s)' not in numeric or 'Inner Diameter' not in numeric:
+			QMessageBox.warning(self, "Follow Error", "Trace file has no numeric 'Time (s)' / 'Inner Diameter' columns.")
+			self.follow_btn.setChecked(False)
+			return
+		store = TraceStore(numeric, max_memory_chunks=FOLLOW_MEMORY_CHUNKS)
+		if first:
+			store.append(first)
+		self.trace_data = store
+		self.filter_cache.clear()
+
+		self.event_tail = EventTail(self.event_file_for_trace(self.trace_file))
+		events = self.event_tail.poll()
+		if events:
+			self.event_labels, self.event_times, self.event_frames = events
+			self.excel_map_action.setEnabled(True)
+
+		self.update_plot()
+		self.update_scroll_slider()
+		self.follow_timer.start()
+		print(f"📡 Following {os.path.basename(self.trace_file)}")
+
+	def stop_follow(self):
+		if not self.follow_timer.isActive():
+			return
+		self.follow_timer.stop()
+		self.follow_tick()
+		if self.event_table_data:		# Don't replace the last export with an empty table
+			self.auto_export_table()
+		if self.plugin_follow_timer.isActive():		# A plugin run deferred while following
+			self.start_plugins()
+		print("⏹ Stopped following trace.")
+
+	def restart_follow(self):
+		"""Start the followed recording over after its trace or event file was rewritten.
+
+		Runs from the follow timer, so it never opens a dialog: the file may
+		hold only its header yet, so the trace restarts empty (same channels)
+		and the following ticks fill it.
+		"""
+		from vasoanalyzer.live_tail import TraceTail, EventTail
+		from vasoanalyzer.trace_loader import TraceStore
+
+		print(f"🔁 {os.path.basename(self.trace_file)} was rewritten; reloading it.")
+		# Fresh tails first: one still flagged as reset would restart again on every tick
+		columns = list(self.trace_data.columns)
+		self.trace_tail = TraceTail(self.trace_file, usecols=columns)
+		self.event_tail = EventTail(self.event_file_for_trace(self.trace_file))
+
+		self.undo_stack.clear()
+		self.event_labels, self.event_times, self.event_frames = [], [], None
+		self.event_table_data = []
+		self.trace_data = TraceStore(columns, max_memory_chunks=FOLLOW_MEMORY_CHUNKS)
+		self.filter_cache.clear()
+		self.populate_table()
+		self.update_plot()
+		self.update_scroll_slider()
+		self.follow_tick()
+
+	@profiled("follow_tick")
+	def follow_tick(self):
+		from vasoanalyzer.event_table import build_event_table
+
+		new_rows = self.trace_tail.poll() if self.trace_tail else None
+		new_events = self.event_tail.poll() if self.event_tail else None
+		if any(tail is not None and tail.reset for tail in (self.trace_tail, self.event_tail)):
+			self.restart_follow()
+			return
+		if not new_rows and not new_events:
+			return
+
+		n_events_before = len(self.event_labels)
+		first_rows = bool(new_rows) and not len(self.trace_data)
+		last_sample = self.last_event_sample()
+
+		if new_rows:
+			if first_rows:
+				self.trace_data.append(new_rows)
+			else:
+				self.extend_trace(new_rows)
+
+		if new_events:
+			labels, times, frames = new_events
+			self.event_labels = list(self.event_labels) + labels
+			self.event_times = list(self.event_times) + times
+			if frames is not None and (self.event_frames is not None or n_events_before == 0):
+				self.event_frames = list(self.event_frames or []) + frames
+			else:
+				self.event_frames = None
+			for label, time, frame in zip(labels, times, frames or times):
+				self.draw_event_marker(label, frame)
+			self.excel_map_action.setEnabled(True)
+
+		# Only the last existing event (its "next event" or final sample moved)
+		# and the new events need resampling; earlier rows keep any manual edits
+		if self.event_labels and len(self.trace_data):
+			start = max(0, min(n_events_before, len(self.event_table_data)) - 1)
+			frames = self.event_frames[start:] if self.event_frames is not None else None
+			# Sample from the trace window the affected events can reach only
+			if start + 1 < len(self.event_times):
+				t_from = self.event_times[start + 1] - 2
+			else:
+				t_from = self.trace_data.t_max
+			trace = self.filtered_trace()
+			window = trace.window(t_from, trace.t_max, ['Time (s)', 'Inner Diameter'])
+			self.event_table_data[start:] = build_event_table(
+				window['Time (s)'],
+				window['Inner Diameter'],
+				self.event_labels[start:],
+				self.event_times[start:],
+				frames
+			)
+			if last_sample is not None:
+				self.keep_last_event_edit(start, *last_sample)
+			self.update_table_rows(start)
+
+		if first_rows:
+			# The first rows after a restart: lay the plot out around them
+			self.update_plot(rebuild_table=False)
+			self.update_scroll_slider()
+			return
+		# New events to step to, and the last event's window runs to the new end of the trace
+		self.refresh_navigation()
+		self.redraw()
+
+	def last_event_sample(self):
+		"""``(sampled, current)`` ID of the last event before a tick moves it, or None.
+
+		Until the trace grows the last event holds its final sample; a
+		different current ID is a manual edit.
+		"""
+		n = len(self.trace_data)
+		if not n or not self.event_table_data or len(self.event_table_data) != len(self.event_labels):
+			return None
+		sampled = round(self.filtered_trace().rows(n - 1, n, ['Inner Diameter'])['Inner Diameter'][0], 2)
+		return sampled, self.event_table_data[-1][3]
+
+	def keep_last_event_edit(self, row, sampled, current):
+		"""After resampling ``row``: restore a manual edit, and let undo return to the new sample."""
+		same = lambda a, b: a == b or (np.isnan(a) and np.isnan(b))
+		resampled = self.event_table_data[row][3]
+		for command in self.undo_stack.commands():
+			if isinstance(command, SetEventValue) and command.row == row and same(command.old, sampled):
+				command.old = resampled
+		if not same(current, sampled):
+			self.event_table_data[row] = self.event_table_data[row][:3] + (current,)
+
+	def extend_trace(self, new_rows):
+		"""Append rows to the live trace and extend the plotted line in place."""
+		prev_t_max = self.trace_data.t_max if len(self.trace_data) else None
+		self.trace_data.append(new_rows)
+		t_min, t_max = self.trace_data.t_min, self.trace_data.t_max
+
+		# Grow the y-range from the new samples only
+		new_d = np.asarray(new_rows['Inner Diameter'], dtype=float)
+		new_d = new_d[np.isfinite(new_d)]
+		if new_d.size:
+			y_min, y_max = self.ax.get_ylim()
+			lo, hi = min(y_min, new_d.min()), max(y_max, new_d.max())
+			if lo < y_min or hi > y_max:
+				pad = 0.05 * (hi - lo or 1)
+				self.ax.set_ylim(lo - pad if lo < y_min else y_min, hi + pad if hi > y_max else y_max)
+
+		# Keep the newest data in view if the user was looking at the end
+		x_min, x_max = self.ax.get_xlim()
+		if prev_t_max is not None and x_max >= prev_t_max:
+			if x_min <= t_min:
+				self.ax.set_xlim(x_min, t_max)
+			else:
+				width = x_max - x_min
+				self.ax.set_xlim(t_max - width, t_max)
+		self.refresh_trace_line()
+		self.update_scroll_slider()
+
+# [N] ========================= TRACE COMPARISON ====================================
+	def add_comparison_traces_dialog(self):
+		file_paths, _ = QFileDialog.getOpenFileNames(self, "Select Traces to Compare", self.trace_file_path or "", "CSV Files (*.csv)")
+		if file_paths:
+			self.add_comparison_traces(file_paths)
+
+	def add_comparison_traces(self, file_paths):
+		from vasoanalyzer.trace_loader import load_trace
+
+		for file_path in file_paths:
+			try:
+				store = load_trace(file_path, columns=[])
+			except Exception as e:
+				QMessageBox.warning(self, "Trace Load Error", f"Failed to load comparison trace:\n{file_path}\n{e}")
+				continue
+			self.overlay.add(os.path.splitext(os.path.basename(file_path))[0], store)
+			self.comparison_files.append(file_path)
+		self.redraw_comparison()
+
+	def restore_comparison(self, file_paths, mode):
+		"""Reload comparison traces without drawing (the caller replots)."""
+		from vasoanalyzer.trace_loader import load_trace
+
+		self.overlay.clear()
+		self.comparison_files = []
+		for action_mode, action in self.compare_mode_actions.items():
+			action.setChecked(action_mode == mode)
+		self.overlay.mode = mode
+		for file_path in file_paths:
+			if not os.path.exists(file_path):
+				print(f"⚠️ Comparison trace not found, skipping:\n{file_path}")
+				continue
+			self.overlay.add(os.path.splitext(os.path.basename(file_path))[0], load_trace(file_path, columns=[]))
+			self.comparison_files.append(file_path)
+
+	def set_comparison_mode(self, mode):
+		for action_mode, action in self.compare_mode_actions.items():
+			action.setChecked(action_mode == mode)
+		self.overlay.mode = mode
+		self.redraw_comparison()
+
+	def clear_comparison(self):
+		self.overlay.clear()
+		self.comparison_files = []
+		self.redraw_comparison()
+
+	def redraw_comparison(self):
+		"""Rebuild the comparison lines/subplots, keeping the main trace, events and pins."""
+		if self.trace_data is None or self.trace_line is None:
+			return
+		xlim = self.ax.get_xlim()
+		self.overlay.render(self.trace_line, os.path.basename(self.trace_file or ""))
+		self.render_channel_axes()
+		self.ax.set_xlim(xlim)
+		self.refresh_trace_line()
+		self.overlay.autoscale()
+		self.autoscale_channel_axes()
+		self.ax.set_xlim(xlim)
+		self.toolbar.update()
+		self.canvas.draw_idle()
+
+# [O] ========================= EVENT DETECTION =====================================
+	def open_event_detection_dialog(self):
+		if self.trace_data is None:
+			return
+		from vasoanalyzer.detection_dialog import EventDetectionDialog
+
+		trace = self.filtered_trace()
+		dialog = EventDetectionDialog(self, trace['Time (s)'], trace['Inner Diameter'], on_preview=self.show_detection_preview)
+		accepted = dialog.exec_()
+		self.show_detection_preview([])
+		if accepted:
+			self.add_detected_events(dialog.accepted_events())
+
+	def show_detection_preview(self, times):
+		for line in self.detection_preview_lines:
+			if line.axes is not None:
+				line.remove()
+		self.detection_preview_lines = [
+			self.ax.axvline(x=t, color='tab:blue', linestyle=':', linewidth=1.2, alpha=0.8)
+			for t in times
+		]
+		self.redraw()
+
+	def add_detected_events(self, events):
+		"""Merge ``[(label, time)]`` into the events (kept in time order) and rebuild the table."""
+		if not events:
+			return
+		from vasoanalyzer.event_table import build_event_table
+
+		# Merge in time order and sample the IDs as a fresh load would
+		frames = self.event_frames or [None] * len(self.event_times)
+		merged = sorted(
+			[(t, False, label, frame, row) for label, t, frame, row in zip(self.event_labels, self.event_times, frames, self.event_table_data)]
+			+ [(t, True, label, int(t / self.recording_interval), None) for label, t in events],
+			key=lambda event: (event[0], event[1])
+		)
+		trace = self.filtered_trace()
+		rows = build_event_table(
+			trace['Time (s)'], trace['Inner Diameter'],
+			[event[2] for event in merged], [event[0] for event in merged],
+			[event[3] for event in merged] if self.event_frames is not None else None
+		)
+		# Only the new rows, and the ID of each existing event now followed by a new one, change
+		commands = [InsertEvents(self, [(i, rows[i]) for i, event in enumerate(merged) if event[1]])]
+		for i, (_, is_new, label, _, old_row) in enumerate(merged[:-1]):
+			if not is_new and merged[i + 1][1] and old_row[3] != rows[i][3]:
+				commands.append(SetEventValue(self, i, old_row[3], rows[i][3], label))
+		self.undo_stack.push(Group(commands, f"Add {len(events)} detected events"))
+		print(f"✔ Added {len(events)} detected events.")
+
+# [P] ========================= TIFF DIAMETER RE-MEASUREMENT ========================
+	def open_remeasure_dialog(self):
+		if self.trace_data is None or not self.tiff_file or not self.snapshot_frames:
+			return
+		from vasoanalyzer.remeasure_dialog import RemeasureDialog
+
+		frame = self.snapshot_frames[min(self.slider.value(), len(self.snapshot_frames) - 1)]
+		dialog = RemeasureDialog(self, self.tiff_file, frame, self.recording_interval)
+		if dialog.exec_():
+			self.add_remeasured_channel(dialog.times, dialog.diameters)
+
+	def add_remeasured_channel(self, frame_times, diameters):
+		"""Add per-frame diameters as a trace channel, interpolated onto the trace's time base."""
+		from vasoanalyzer.remeasure import align_to_trace, REMEASURED_COLUMN
+
+		aligned = align_to_trace(self.trace_data['Time (s)'], frame_times, diameters)
+		if not np.isfinite(aligned).any():
+			QMessageBox.warning(
+				self, "Re-measure",
+				"The re-measured frames do not overlap the trace's time range (check the frame interval)."
+			)
+			return
+		# Added in place, so a followed trace keeps its spill limits (new rows get NaN)
+		self.trace_data.add_column(REMEASURED_COLUMN, aligned)
+		self.filter_cache.clear()
+		# Only a column is added: keep the IDs (and any manual edits) as they are
+		self.update_plot(rebuild_table=False)
+		print(f"✔ Re-measured diameter on {len(diameters)} frames (channel '{REMEASURED_COLUMN}').")
@@ -0,0 +1,114 @@
+import numpy as np
+from matplotlib.artist import Artist, allow_rasterization
+from matplotlib.text import Text, Annotation
+
+# Many text labels of one style (event labels, pin annotations) drawn as a
+# single artist. Positions and strings live in arrays; one template Text
+# holds the font, colour, rotation and alignment shared by all of them and
+# is stamped at each label's position when the axes draw. A restyle is
+# therefore one update of the template, not a loop over artists. The
+# template memoises its text layout (rotated extents and line offsets) per
+# string, so labels are measured once per style and resolution rather than
+# on every draw; labels scrolled out of view are not drawn at all.
+
+CULL_MARGIN_PX = 200		# Also draw labels anchored this far outside the axes (their text may reach in)
+
+class _CachedLayout:
+	"""Mixin memoising ``Text._get_layout`` per string until ``clear_layout_cache``."""
+
+	def clear_layout_cache(self):
+		self._layouts = {}
+
+	def _get_layout(self, renderer):
+		layouts = self.__dict__.setdefault("_layouts", {})
+		# The layout is relative to the text's position, so it depends only on
+		# the string, the resolution and the backend's font metrics
+		key = (self.get_text(), self.figure.dpi, type(renderer))
+		layout = layouts.get(key)
+		if layout is None:
+			layout = layouts[key] = super()._get_layout(renderer)
+		return layout
+
+class CachedText(_CachedLayout, Text):
+	pass
+
+class CachedAnnotation(_CachedLayout, Annotation):
+	pass
+
+class LabelSet(Artist):
+	"""Labels ``strings`` anchored at ``(xs, ys)`` (data coordinates), drawn by stamping ``template``.
+
+	``template`` is a CachedText or CachedAnnotation (then ``xs, ys`` are
+	its ``xy``) carrying the shared style; change it through ``set_style``.
+	"""
+
+	def __init__(self, ax, template):
+		super().__init__()
+		self.template = template
+		self.xs = np.empty(0)
+		self.ys = np.empty(0)
+		self.strings = []
+		self.set_zorder(template.get_zorder())
+		template.axes = ax
+		template.set_figure(ax.figure)
+		if template.get_clip_on():
+			template.set_clip_path(ax.patch)
+		ax.add_artist(self)
+
+	def __len__(self):
+		return len(self.strings)
+
+	def set_labels(self, strings, xs, ys):
+		self.strings = list(strings)
+		self.xs = np.asarray(xs, dtype=float)
+		self.ys = np.asarray(ys, dtype=float)
+		self.stale = True
+
+	def insert(self, index, string, x, y):
+		self.strings.insert(index, string)
+		self.xs = np.insert(self.xs, index, x)
+		self.ys = np.insert(self.ys, index, y)
+		self.stale = True
+
+	def remove_label(self, index):
+		self.strings.pop(index)
+		self.xs = np.delete(self.xs, index)
+		self.ys = np.delete(self.ys, index)
+		self.stale = True
+
+	def set_style(self, **props):
+		"""Update the shared text properties (``fontsize``, ``fontname``, ``color``, …) of every label."""
+		self.template.update(props)
+		self.template.clear_layout_cache()
+		self.stale = True
+
+	def anchors(self):
+		"""Data coordinates each label is drawn at (``xs, ys`` here; subclasses may derive them)."""
+		return self.xs, self.ys
+
+	def _place(self, index, x, y):
+		template = self.template
+		template.set_text(self.strings[index])
+		if isinstance(template, Annotation):
+			template.xy = (x, y)
+		else:
+			template.set_position((x, y))
+		return template
+
+	def iter_texts(self):
+		"""Yield the template placed as each label in turn (for snapshots of the figure)."""
+		xs, ys = self.anchors()
+		for i, (x, y) in enumerate(zip(xs, ys)):
+			yield self._place(i, x, y)
+
+	@allow_rasterization
+	def draw(self, renderer):
+		if not self.get_visible() or not self.strings:
+			return
+		xs, ys = self.anchors()
+		ax = self.template.axes
+		pixels_x = ax.transData.transform(np.column_stack([xs, ys]))[:, 0]
+		visible = np.flatnonzero((pixels_x >= ax.bbox.x0 - CULL_MARGIN_PX) & (pixels_x <= ax.bbox.x1 + CULL_MARGIN_PX))
+		for i in visible:
+			self._place(i, xs[i], ys[i]).draw(renderer)
+		self.stale = False
@@ -0,0 +1,90 @@
+import io
+import os
+
+from vasoanalyzer.profiling import profiled
+
+class FileTail:
+	"""Read only the complete lines appended to a text file since the last poll."""
+
+	def __init__(self, path):
+		self.path = path
+		self.offset = 0
+		self.header = None
+		self.reset = False		# Set once the file shrank: reading restarted from its first line
+
+	def read_new_lines(self):
+		"""Return new complete lines as bytes (header excluded), or b'' if none."""
+		try:
+			size = os.path.getsize(self.path)
+		except OSError:
+			return b""
+		if size < self.offset:
+			# File was truncated/rewritten: start over; rows read before are void
+			self.offset = 0
+			self.header = None
+			self.reset = True
+		if size == self.offset:
+			return b""
+
+		with open(self.path, "rb") as f:
+			f.seek(self.offset)
+			chunk = f.read(size - self.offset)
+
+		# Keep a partially written last line for the next poll
+		end = chunk.rfind(b"\n")
+		if end < 0:
+			return b""
+		chunk = chunk[:end + 1]
+		self.offset += len(chunk)
+
+		if self.header is None:
+			header_end = chunk.find(b"\n")
+			self.header = chunk[:header_end].decode("utf-8", errors="replace").strip()
+			chunk = chunk[header_end + 1:]
+		return chunk
+
+	def delimiter(self):
+		return "," if self.header and "," in self.header else "\t"
+
+class TraceTail(FileTail):
+	"""Incrementally parse a trace CSV that VasoTracker is still writing.
+
+	With ``usecols`` only those columns are parsed from each new chunk.
+	"""
+
+	def __init__(self, path, usecols=None):
+		super().__init__(path)
+		self.usecols = usecols
+
+	def columns(self):
+		return [c.strip().strip('"') for c in self.header.split(self.delimiter())] if self.header else []
+
+	@profiled("trace_tail_poll")
+	def poll(self):
+		"""Return ``{column: array}`` for newly appended rows, or None."""
+		import pandas as pd
+
+		chunk = self.read_new_lines()
+		if not chunk.strip():
+			return None
+		usecols = None
+		if self.usecols is not None:
+			usecols = [col for col in self.columns() if col in self.usecols]
+		df = pd.read_csv(io.BytesIO(chunk), header=None, names=self.columns(), usecols=usecols, delimiter=self.delimiter())
+		return {col: df[col].to_numpy() for col in df.columns}
+
+class EventTail(FileTail):
+	"""Incrementally parse a ``_table.csv`` event file."""
+
+	@profiled("event_tail_poll")
+	def poll(self):
+		"""Return ``(labels, times, frames)`` for newly appended events, or None."""
+		import pandas as pd
+		from vasoanalyzer.event_loader import parse_events
+
+		chunk = self.read_new_lines()
+		if not chunk.strip():
+			return None
+		header = (self.header + "\n").encode("utf-8")
+		df = pd.read_csv(io.BytesIO(header + chunk), delimiter=self.delimiter())
+		return parse_events(df)
@@ -0,0 +1,103 @@
+import numpy as np
+
+from vasoanalyzer.profiling import profiled
+
+BASELINE_SEC = 10	# window before each event used as its baseline
+STEADY_SEC = 10		# window before the next event (or trace end) used as the steady state
+
+# Column name -> key in the dict returned by compute_event_metrics
+METRIC_COLUMNS = {
+	"Baseline (µm)": "baseline",
+	"Steady (µm)": "steady",
+	"Constriction (%)": "constriction",
+	"Min (µm)": "min",
+	"Max (µm)": "max",
+	"Time to Peak (s)": "time_to_peak",
+}
+
+def _window_means(cum_sum, cum_count, a, b):
+	"""Mean over sample ranges ``[a, b)`` from prefix sums; NaN for empty/all-NaN ranges."""
+	count = cum_count[b] - cum_count[a]
+	with np.errstate(invalid='ignore', divide='ignore'):
+		return np.where(count > 0, (cum_sum[b] - cum_sum[a]) / count, np.nan)
+
+@profiled("compute_event_metrics")
+def compute_event_metrics(time_trace, diam_trace, times, baseline_sec=BASELINE_SEC, steady_sec=STEADY_SEC):
+	"""Per-event window statistics for all events in one vectorized pass.
+
+	Event ``i`` spans ``[times[i], times[i+1])`` (the last one runs to the end
+	of the trace). For each event this returns, keyed as in METRIC_COLUMNS:
+
+	- ``baseline``: mean diameter over the ``baseline_sec`` before the event
+	- ``steady``: mean over the last ``steady_sec`` of the event's span
+	- ``constriction``: ``(baseline - steady) / baseline`` in %
+	- ``min`` / ``max``: extremes over the event's span
+	- ``time_to_peak``: seconds from the event to the sample furthest from baseline
+
+	Means come from prefix sums and extremes from ``reduceat`` over the
+	segment boundaries, so the cost is O(samples + events) regardless of the
+	number of events. NaN samples are ignored; empty windows give NaN.
+	"""
+	time_trace = np.asarray(time_trace, dtype=float)
+	diam_trace = np.asarray(diam_trace, dtype=float)
+	times = np.asarray(times, dtype=float)
+	n_events = len(times)
+	nan = np.full(n_events, np.nan)
+	if n_events == 0 or len(time_trace) == 0:
+		return {key: nan.copy() for key in METRIC_COLUMNS.values()}
+
+	# Work on events in time order; results are scattered back at the end
+	order = np.argsort(times, kind='stable')
+	t_sorted = times[order]
+	n = len(time_trace)
+
+	seg_start = np.searchsorted(time_trace, t_sorted, side='left')
+	seg_end = np.append(seg_start[1:], n)
+	span_end_t = np.append(t_sorted[1:], time_trace[-1] + 1)
+
+	finite = np.isfinite(diam_trace)
+	cum_sum = np.concatenate(([0.0], np.cumsum(np.where(finite, diam_trace, 0.0))))
+	cum_count = np.concatenate(([0], np.cumsum(finite)))
+
+	base_a = np.searchsorted(time_trace, t_sorted - baseline_sec, side='left')
+	baseline = _window_means(cum_sum, cum_count, base_a, seg_start)
+	steady_a = np.maximum(np.searchsorted(time_trace, span_end_t - steady_sec, side='left'), seg_start)
+	steady = _window_means(cum_sum, cum_count, steady_a, seg_end)
+	with np.errstate(invalid='ignore', divide='ignore'):
+		constriction = (baseline - steady) / baseline * 100
+
+	# Segments are contiguous from the first event onwards, so one reduceat
+	# over [seg_start[0], n) covers them all; empty segments are masked below
+	lengths = seg_end - seg_start
+	non_empty = lengths > 0
+	seg_min, seg_max, time_to_peak = nan.copy(), nan.copy(), nan.copy()
+	if non_empty.any():
+		first = seg_start[0]
+		starts = seg_start[non_empty] - first
+		values = diam_trace[first:]
+		seg_min[non_empty] = np.fmin.reduceat(values, starts)
+		seg_max[non_empty] = np.fmax.reduceat(values, starts)
+
+		# Peak = first sample with the largest deviation from its event's baseline
+		deviation = np.abs(values - np.repeat(baseline[non_empty], lengths[non_empty]))
+		deviation = np.where(np.isfinite(deviation), deviation, -1.0)
+		peak_dev = np.maximum.reduceat(deviation, starts)
+		hits = np.flatnonzero(deviation == np.repeat(peak_dev, lengths[non_empty]))
+		peak_idx = hits[np.searchsorted(hits, starts)]
+		valid = peak_dev >= 0
+		peak_time = np.where(valid, time_trace[first + peak_idx] - t_sorted[non_empty], np.nan)
+		time_to_peak[non_empty] = peak_time
+
+	result = {}
+	for key, values in (
+		("baseline", baseline),
+		("steady", steady),
+		("constriction", constriction),
+		("min", seg_min),
+		("max", seg_max),
+		("time_to_peak", time_to_peak),
+	):
+		unsorted = np.empty(n_events)
+		unsorted[order] = values
+		result[key] = unsorted
+	return result
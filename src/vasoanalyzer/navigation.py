@@ -0,0 +1,83 @@
+import numpy as np
+
+# Keyboard stepping through events. When the event table or the TIFF
+# changes, EventNavigator works out each event's window (from the event to
+# the next one, or the end of the trace) and the TIFF frame nearest to its
+# marker, so a step is a few array lookups. A window's diameter range is
+# read from the TraceStore summaries the first time it is shown and kept
+# until the events change.
+
+NAV_PAD = 0.1			# Show this fraction of an event window's width either side of it
+NAV_Y_PAD = 0.05		# ... and of its diameter range above and below
+NAV_Y_BINS = 256		# Envelope bins used to find a window's diameter range
+
+class EventNavigator:
+	"""Event windows and nearest TIFF frames for stepping through events."""
+
+	def __init__(self):
+		self.current = -1
+		self.times = np.empty(0)
+		self.xs = np.empty(0)
+		self.ends = np.empty(0)
+		self.frames = None			# Nearest TIFF frame (slider position) per event, or None
+		self._frame_xs = None
+		self._y_ranges = {}
+
+	def __len__(self):
+		return len(self.times)
+
+	def set_events(self, times, xs, store):
+		"""Events at ``times`` (trace time) drawn at ``xs`` (plot x: frame number or time) on ``store``'s trace."""
+		self.times = np.asarray(times, dtype=float)
+		self.xs = np.asarray(xs, dtype=float)
+		if len(self.times):
+			t_end = store.t_max if store is not None and len(store) else self.times[-1]
+			self.ends = np.append(self.times[1:], max(t_end, self.times[-1]))
+		else:
+			self.ends = np.empty(0)
+		self._y_ranges = {}
+		self.current = min(self.current, len(self.times) - 1)
+		self._match_frames()
+
+	def set_frames(self, frame_xs):
+		"""Plot x of each TIFF frame (slider position order), or None without a TIFF."""
+		self._frame_xs = None if frame_xs is None or not len(frame_xs) else np.asarray(frame_xs, dtype=float)
+		self._match_frames()
+
+	def _match_frames(self):
+		self.frames = None if self._frame_xs is None else self.nearest_frames(self.xs)
+
+	def nearest_frames(self, xs):
+		"""Slider position of the TIFF frame nearest to each plot x in ``xs``."""
+		order = np.argsort(self._frame_xs, kind="stable")
+		sorted_xs = self._frame_xs[order]
+		right = np.clip(np.searchsorted(sorted_xs, xs), 0, len(sorted_xs) - 1)
+		left = np.maximum(right - 1, 0)
+		nearer = np.where(np.abs(sorted_xs[left] - xs) <= np.abs(sorted_xs[right] - xs), left, right)
+		return order[nearer]
+
+	def step(self, delta):
+		"""Move ``delta`` events on (clamped to the first/last); returns the new index, or -1 without events."""
+		if not len(self.times):
+			return -1
+		if self.current < 0:
+			self.current = 0 if delta > 0 else len(self.times) - 1
+		else:
+			self.current = int(np.clip(self.current + delta, 0, len(self.times) - 1))
+		return self.current
+
+	def limits(self, index, store, column):
+		"""``(xlim, ylim)`` framing event ``index``'s window (ylim None if the window has no samples)."""
+		t0, t1 = self.times[index], self.ends[index]
+		pad = max(t1 - t0, 1.0) * NAV_PAD
+		xlim = (t0 - pad, t1 + pad)
+		if index not in self._y_ranges:
+			_, values = store.envelope(column, t0, t1, NAV_Y_BINS)
+			values = np.asarray(values, dtype=float)
+			values = values[np.isfinite(values)]
+			self._y_ranges[index] = (values.min(), values.max()) if len(values) else None
+		y_range = self._y_ranges[index]
+		if y_range is None:
+			return xlim, None
+		y_pad = max(y_range[1] - y_range[0], 1.0) * NAV_Y_PAD
+		return xlim, (y_range[0] - y_pad, y_range[1] + y_pad)
@@ -0,0 +1,98 @@
+from matplotlib import rcParams
+
+OVERLAY = "overlay"
+STACKED = "stacked"
+
+class TraceOverlay:
+	"""Extra traces drawn on the main figure for side-by-side comparison.
+
+	In ``OVERLAY`` mode every trace is a line on the main axes; in
+	``STACKED`` mode each gets its own subplot below the main one, sharing
+	its x-axis. Either way all lines are filled through
+	``TraceStore.envelope`` for the visible range only, so N traces cost
+	O(N * screen width) per redraw, and everything stays on one canvas.
+	"""
+
+	def __init__(self, fig, ax, column='Inner Diameter', prepare=None, on_xlim=None):
+		self.fig = fig
+		self.ax = ax						# Main axes (holds the primary trace and events)
+		self.column = column
+		self.prepare = prepare or (lambda store: store)	# e.g. apply the active filter
+		self.on_xlim = on_xlim				# Called when a stacked subplot is panned/zoomed
+		self.mode = OVERLAY
+		self.traces = []					# [(label, TraceStore)]
+		self.lines = []
+		self.axes = []						# Extra axes in STACKED mode
+
+	def __len__(self):
+		return len(self.traces)
+
+	def add(self, label, store):
+		self.traces.append((label, store))
+
+	def clear(self):
+		self.traces = []
+
+	def t_range(self):
+		"""(t_min, t_max) over all comparison traces, or None."""
+		stores = [store for _, store in self.traces if len(store)]
+		if not stores:
+			return None
+		return min(s.t_min for s in stores), max(s.t_max for s in stores)
+
+	def render(self, primary_line=None, primary_label=None):
+		"""(Re)create the comparison artists; call after the main axes were cleared."""
+		for line in self.lines:
+			if line.axes is not None:
+				line.remove()
+		self.lines = []
+		for ax in self.axes:
+			self.fig.delaxes(ax)
+		self.axes = []
+		legend = self.ax.get_legend()
+		if legend is not None:
+			legend.remove()
+
+		n_rows = 1 + len(self.traces) if self.mode == STACKED else 1
+		grid = self.fig.add_gridspec(n_rows, 1, hspace=0.08)
+		self.ax.set_subplotspec(grid[0])
+		self.ax.xaxis.label.set_visible(n_rows == 1)
+		self.ax.tick_params(labelbottom=n_rows == 1)
+
+		colors = rcParams['axes.prop_cycle'].by_key().get('color', ['C0'])
+		for i, (label, _) in enumerate(self.traces):
+			color = colors[(i + 1) % len(colors)]
+			if self.mode == STACKED:
+				ax = self.fig.add_subplot(grid[i + 1], sharex=self.ax)
+				ax.set_ylabel(label, fontsize=8)
+				ax.grid(True, color='#CCC')
+				ax.tick_params(labelbottom=i == len(self.traces) - 1)
+				if self.on_xlim is not None:
+					# Shared limits are propagated without callbacks on the main axes
+					ax.callbacks.connect('xlim_changed', lambda ax: self.on_xlim())
+				self.axes.append(ax)
+			else:
+				ax = self.ax
+			self.lines.append(ax.plot([], [], '-', color=color, linewidth=1.0, label=label)[0])
+
+		if self.axes:
+			self.axes[-1].set_xlabel(self.ax.get_xlabel())
+		elif self.traces:
+			if primary_line is not None:
+				primary_line.set_label(primary_label or "Trace")
+			self.ax.legend(loc='upper right', fontsize=8)
+
+	def refresh(self, x_min, x_max, n_bins):
+		"""Fill every comparison line for [x_min, x_max] from its TraceStore."""
+		for line, (_, store) in zip(self.lines, self.traces):
+			store = self.prepare(store)
+			if store is None or not len(store) or self.column not in store:
+				line.set_data([], [])
+				continue
+			t, d = store.envelope(self.column, x_min, x_max, n_bins)
+			line.set_data(t, d)
+
+	def autoscale(self):
+		for ax in [self.ax] + self.axes:
+			ax.relim()
+			ax.autoscale_view()
@@ -0,0 +1,124 @@
+import numpy as np
+
+from vasoanalyzer.labels import CachedAnnotation, LabelSet
+
+# Pinned points on the trace plot. Positions live in two arrays and every
+# marker is drawn by one Line2D (markers only) and every annotation by one
+# LabelSet, so hundreds of pins cost two artists to draw and restyle. Right-click
+# hit-testing transforms all pins to pixels in one call and buckets them in
+# a grid of HIT_RADIUS_PX cells, sorted by cell key, so a lookup is a few
+# binary searches. The index is rebuilt only when the pins, the view limits
+# or the axes' size change.
+
+HIT_RADIUS_PX = 10		# A click this close (in pixels) hits a pin
+_CELL_OFFSET = 1 << 20	# Keeps (possibly negative) cell coordinates positive in the key
+_NEIGHBOURS = np.array([(dx, dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1)], dtype=np.int64)
+
+def _cell_keys(cells):
+	cells = cells + _CELL_OFFSET
+	return cells[:, 0] * (2 * _CELL_OFFSET) + cells[:, 1]
+
+def _label(x, y):
+	return f"{x:.2f} s\n{y:.1f} µm"
+
+class PinSet:
+	"""Pinned ``(x, y)`` points of ``ax`` with their marker artist, labels and hit-test index."""
+
+	def __init__(self, ax, marker_size=6):
+		self.xs = np.empty(0)
+		self.ys = np.empty(0)
+		self.marker_size = marker_size
+		self.label_style = {"fontsize": 8}
+		self.marker = None
+		self.labels = None
+		self._index = None			# (view key, sorted cell keys, order, pixel positions)
+		self.attach(ax)
+
+	def attach(self, ax):
+		"""(Re)create the artists on ``ax``, e.g. after ``ax.clear()`` removed them."""
+		self.ax = ax
+		self.marker = ax.plot(self.xs, self.ys, 'ro', linestyle='None', markersize=self.marker_size)[0]
+		template = CachedAnnotation(
+			"",
+			xy=(0, 0),
+			xytext=(6, 6),
+			textcoords='offset points',
+			bbox=dict(boxstyle="round,pad=0.3", fc="white", ec="gray", lw=1),
+			**self.label_style
+		)
+		self.labels = LabelSet(ax, template)
+		self.labels.set_labels([_label(x, y) for x, y in zip(self.xs, self.ys)], self.xs, self.ys)
+		self._index = None
+
+	def __len__(self):
+		return len(self.xs)
+
+	def positions(self):
+		"""``[(x, y)]`` as plain floats (sessions, plot documents)."""
+		return [(float(x), float(y)) for x, y in zip(self.xs, self.ys)]
+
+	def insert(self, index, x, y):
+		self.xs = np.insert(self.xs, index, x)
+		self.ys = np.insert(self.ys, index, y)
+		self.marker.set_data(self.xs, self.ys)
+		self.labels.insert(index, _label(x, y), x, y)
+		self._index = None
+
+	def append(self, x, y):
+		self.insert(len(self.xs), x, y)
+
+	def remove(self, index):
+		"""Remove the pin at ``index``; returns its ``(x, y)``."""
+		position = (float(self.xs[index]), float(self.ys[index]))
+		self.xs = np.delete(self.xs, index)
+		self.ys = np.delete(self.ys, index)
+		self.marker.set_data(self.xs, self.ys)
+		self.labels.remove_label(index)
+		self._index = None
+		return position
+
+	def clear(self):
+		self.xs = np.empty(0)
+		self.ys = np.empty(0)
+		self.marker.set_data(self.xs, self.ys)
+		self.labels.set_labels([], self.xs, self.ys)
+		self._index = None
+
+	def set_style(self, marker_size=None, label_style=None):
+		"""Marker size and annotation font (``fontsize``, ``fontname``, …) for current and future pins."""
+		if marker_size is not None:
+			self.marker_size = marker_size
+			self.marker.set_markersize(marker_size)
+		if label_style is not None:
+			self.label_style = dict(label_style)
+			self.labels.set_style(**self.label_style)
+
+	# ----- Hit-testing -----
+	def _view_key(self):
+		return tuple(self.ax.viewLim.bounds) + tuple(self.ax.bbox.bounds)
+
+	def _hit_index(self, radius):
+		key = self._view_key() + (radius,)
+		if self._index is None or self._index[0] != key:
+			pixels = self.ax.transData.transform(np.column_stack([self.xs, self.ys]))
+			keys = _cell_keys(np.floor(pixels / radius).astype(np.int64))
+			order = np.argsort(keys, kind="stable")
+			self._index = (key, keys[order], order, pixels)
+		return self._index[1:]
+
+	def hit(self, x_px, y_px, radius=HIT_RADIUS_PX):
+		"""Index of the pin nearest to display point ``(x_px, y_px)`` within ``radius`` pixels, or None."""
+		if not len(self.xs):
+			return None
+		keys, order, pixels = self._hit_index(radius)
+		# The clicked cell and its 8 neighbours cover every point within radius
+		cell = np.floor(np.array([x_px, y_px]) / radius).astype(np.int64)
+		cell_keys = _cell_keys(cell + _NEIGHBOURS)
+		lo = np.searchsorted(keys, cell_keys, 'left')
+		hi = np.searchsorted(keys, cell_keys, 'right')
+		if not (hi > lo).any():
+			return None
+		candidates = np.concatenate([order[a:b] for a, b in zip(lo, hi) if b > a])
+		distance = np.hypot(pixels[candidates, 0] - x_px, pixels[candidates, 1] - y_px)
+		best = int(np.argmin(distance))
+		return int(candidates[best]) if distance[best] < radius else None
@@ -0,0 +1,177 @@
+import json
+import zipfile
+
+import numpy as np
+
+from vasoanalyzer.profiling import profiled
+from vasoanalyzer.pins import PinSet
+from vasoanalyzer.event_markers import EventMarkers
+
+# An editable plot document is a small zip container:
+#   plot.json            events, pins, style, axis labels/limits, column names
+#   trace/<n>.npy        trace columns: time as float64 (relative to time_offset), others float32
+#   comparison/<n>.npy   float32 diameter of each comparison trace
+#   comparison/<n>.time.npy  ... and its float64 time (relative to time_offset)
+# Unlike pickling the Figure it holds only data and settings, so it is a
+# fraction of the size, loads in milliseconds and does not depend on the
+# matplotlib version it was written with. open_figure() rebuilds the plot.
+PLOT_DOCUMENT_EXTENSION = ".vasoplot"
+PLOT_DOCUMENT_VERSION = 2		# 1: float32 time, comparisons as one (2, n) float32 array
+
+def _font_kwargs(style, prefix):
+	return {
+		"fontsize": style[f"{prefix}_font_size"],
+		"fontname": style[f"{prefix}_font_family"],
+		"fontstyle": "italic" if style[f"{prefix}_italic"] else "normal",
+		"fontweight": "bold" if style[f"{prefix}_bold"] else "normal",
+	}
+
+def apply_style(ax, style, trace_line=None, events=None, pins=None):
+	"""Apply a PlotStyleDialog.get_style() dict to ``ax`` and its event/pin artists.
+
+	``events`` is an EventMarkers and ``pins`` a PinSet; each restyles all
+	its labels at once. Only ``trace_line`` gets the line width.
+	"""
+	for label in (ax.xaxis.label, ax.yaxis.label):
+		label.update(_font_kwargs(style, "axis"))
+	ax.tick_params(axis='x', labelsize=style['tick_font_size'])
+	ax.tick_params(axis='y', labelsize=style['tick_font_size'])
+
+	if events is not None:
+		events.set_style(_font_kwargs(style, "event"))
+
+	if pins is not None:
+		pins.set_style(style['pin_size'], _font_kwargs(style, "pin"))
+
+	if trace_line is not None:
+		trace_line.set_linewidth(style['line_width'])
+
+def _write_array(zf, name, array, dtype=np.float32):
+	with zf.open(name, "w", force_zip64=True) as f:
+		np.lib.format.write_array(f, np.ascontiguousarray(array, dtype=dtype), allow_pickle=False)
+
+@profiled("save_plot_document")
+def save_plot_document(path, document, trace_columns, comparison_traces=()):
+	"""Write ``document`` (JSON-serialisable dict), ``trace_columns`` ({name: array}) and
+	``comparison_traces`` ([(label, time, diameter)]) to ``path``."""
+	from vasoanalyzer.cache import json_default
+
+	trace_columns = {name: np.asarray(values, dtype=float) for name, values in trace_columns.items()}
+	time_column = document.get("time_column", "Time (s)")
+	time_offset = float(trace_columns[time_column][0]) if len(trace_columns.get(time_column, [])) else 0.0
+
+	manifest = dict(document)
+	manifest["version"] = PLOT_DOCUMENT_VERSION
+	manifest["time_column"] = time_column
+	manifest["time_offset"] = time_offset
+	manifest["trace_columns"] = list(trace_columns)
+	manifest["comparison_labels"] = [label for label, _, _ in comparison_traces]
+
+	with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED, allowZip64=True, compresslevel=1) as zf:
+		# Level 1: trace noise barely compresses further, and higher levels cost seconds on long traces
+		zf.writestr("plot.json", json.dumps(manifest, default=json_default))
+		for i, (name, values) in enumerate(trace_columns.items()):
+			# float32 (~7 significant digits) is plenty for measured values, but its
+			# steps grow with magnitude (1 ms at 2.3 h, 8 ms at 24 h): time stays float64
+			if name == time_column:
+				_write_array(zf, f"trace/{i}.npy", values - time_offset, np.float64)
+			else:
+				_write_array(zf, f"trace/{i}.npy", values)
+		for i, (_, t, d) in enumerate(comparison_traces):
+			_write_array(zf, f"comparison/{i}.time.npy", np.asarray(t, dtype=float) - time_offset, np.float64)
+			_write_array(zf, f"comparison/{i}.npy", d)
+
+@profiled("load_plot_document")
+def load_plot_document(path):
+	"""Return ``(document, trace_columns, comparison_traces)`` as written by save_plot_document."""
+	with zipfile.ZipFile(path, "r") as zf:
+		document = json.loads(zf.read("plot.json"))
+		if document.get("version", 0) > PLOT_DOCUMENT_VERSION:
+			raise ValueError(f"Plot was written by a newer VasoAnalyzer (format {document['version']}).")
+		time_offset = document.get("time_offset", 0.0)
+		trace_columns = {}
+		for i, name in enumerate(document.get("trace_columns", [])):
+			values = np.load(zf.open(f"trace/{i}.npy"), allow_pickle=False)
+			trace_columns[name] = values + time_offset if name == document["time_column"] else values
+		comparison_traces = []
+		for i, label in enumerate(document.get("comparison_labels", [])):
+			d = np.load(zf.open(f"comparison/{i}.npy"), allow_pickle=False)
+			if document.get("version", 1) < 2:
+				t, d = d
+			else:
+				t = np.load(zf.open(f"comparison/{i}.time.npy"), allow_pickle=False)
+			comparison_traces.append((label, t + time_offset, d))
+	return document, trace_columns, comparison_traces
+
+def build_figure(document, trace_columns, comparison_traces=(), fig=None):
+	"""Draw a loaded plot document onto ``fig`` (a new Figure if None) and return it."""
+	from matplotlib import rcParams
+	from matplotlib.figure import Figure
+
+	if fig is None:
+		fig = Figure(figsize=document.get("figsize", (8, 4)), facecolor='white')
+	channels = document.get("channels", [])
+	# Same room for offset channel spines as the main window
+	fig.subplots_adjust(right=max(0.5, rcParams['figure.subplot.right'] - 0.12 * max(0, len(channels) - 1)))
+	stacked = document.get("comparison_mode") == "stacked" and comparison_traces
+	n_rows = 1 + len(comparison_traces) if stacked else 1
+	grid = fig.add_gridspec(n_rows, 1, hspace=0.08)
+	ax = fig.add_subplot(grid[0])
+
+	time_column = document["time_column"]
+	diameter_column = document.get("diameter_column", "Inner Diameter")
+	t = trace_columns[time_column]
+	trace_line, = ax.plot(t, trace_columns[diameter_column], 'k-', linewidth=1.5, label=document.get("trace_label") or "Trace")
+
+	colors = rcParams['axes.prop_cycle'].by_key().get('color', ['C0'])
+	for i, (label, ct, cd) in enumerate(comparison_traces):
+		color = colors[(i + 1) % len(colors)]
+		if stacked:
+			cax = fig.add_subplot(grid[i + 1], sharex=ax)
+			cax.set_ylabel(label, fontsize=8)
+			cax.grid(document.get("grid", True), color='#CCC')
+			cax.plot(ct, cd, '-', color=color, linewidth=1.0)
+		else:
+			ax.plot(ct, cd, '-', color=color, linewidth=1.0, label=label)
+	if comparison_traces and not stacked:
+		ax.legend(loc='upper right', fontsize=8)
+
+	channel_colors = document.get("channel_colors") or ['tab:blue']
+	for i, column in enumerate(channels):
+		color = channel_colors[i % len(channel_colors)]
+		twin = ax.twinx()
+		twin.spines['right'].set_position(('axes', 1 + 0.15 * i))
+		twin.spines['right'].set_color(color)
+		twin.set_ylabel(column, color=color)
+		twin.tick_params(axis='y', colors=color)
+		twin.plot(t, trace_columns[column], '-', color=color, linewidth=1.0)
+
+	if document.get("xlim"):
+		ax.set_xlim(document["xlim"])
+	if document.get("ylim"):
+		ax.set_ylim(document["ylim"])
+	ax.set_xlabel(document.get("xlabel", ""))
+	ax.set_ylabel(document.get("ylabel", ""))
+	ax.grid(document.get("grid", True), color='#CCC')
+
+	events = EventMarkers(ax)
+	document_events = document.get("events", [])
+	events.set_events([event["label"] for event in document_events], [event["x"] for event in document_events])
+
+	pins = PinSet(ax)
+	for x, y in document.get("pins", []):
+		pins.append(x, y)
+
+	if document.get("style"):
+		apply_style(ax, document["style"], trace_line, events, pins)
+	return fig
+
+def open_figure(path, fig=None):
+	"""Load a ``.vasoplot`` file and rebuild its figure, e.g.::
+
+		import matplotlib.pyplot as plt
+		from vasoanalyzer.plot_document import open_figure
+		open_figure("tracePlot_output.vasoplot", plt.figure())
+		plt.show()
+	"""
+	return build_figure(*load_plot_document(path), fig=fig)
@@ -0,0 +1,235 @@
+from PyQt5.QtWidgets import (
+	QDialog, QTabWidget, QWidget, QVBoxLayout, QHBoxLayout, QLabel, QComboBox, QSpinBox,
+	QCheckBox, QPushButton, QFormLayout
+)
+
+class PlotStyleDialog(QDialog):
+	def __init__(self, parent=None):
+		super().__init__(parent)
+		self.setWindowTitle("Plot Style Editor")
+		self.setMinimumWidth(400)
+
+		self.tabs = QTabWidget()
+		main_layout = QVBoxLayout()
+		main_layout.addWidget(self.tabs)
+		self.setLayout(main_layout)
+
+		# ===== Bottom OK / Apply / Cancel =====
+		btn_row = QHBoxLayout()
+		btn_row.setContentsMargins(10, 4, 10, 10)
+		
+		self.ok_btn = QPushButton("OK")
+		self.cancel_btn = QPushButton("Cancel")
+		self.apply_btn = QPushButton("Apply")
+		
+		self.ok_btn.clicked.connect(self.accept)
+		self.cancel_btn.clicked.connect(self.reject)
+		self.apply_btn.clicked.connect(self.handle_apply_all)
+		
+		btn_row.addStretch()
+		btn_row.addWidget(self.apply_btn)
+		btn_row.addWidget(self.cancel_btn)
+		btn_row.addWidget(self.ok_btn)
+		
+		main_layout.addLayout(btn_row)
+
+		# Track settings per tab
+		self.init_axis_tab()
+		self.init_tick_tab()
+		self.init_event_tab()
+		self.init_pin_tab()
+		self.init_line_tab()
+
+	def init_axis_tab(self):
+		tab = QWidget()
+		layout = QVBoxLayout(tab)
+		form = QFormLayout()
+
+		self.axis_font_size = QSpinBox()
+		self.axis_font_size.setRange(6, 32)
+		self.axis_font_size.setValue(14)
+
+		self.axis_font_family = QComboBox()
+		self.axis_font_family.addItems(["Arial", "Helvetica", "Times New Roman", "Courier", "Verdana"])
+
+		self.axis_bold = QCheckBox("Bold")
+		self.axis_italic = QCheckBox("Italic")
+
+		form.addRow("Font Size:", self.axis_font_size)
+		form.addRow("Font Family:", self.axis_font_family)
+		form.addRow("", self.axis_bold)
+		form.addRow("", self.axis_italic)
+
+		layout.addLayout(form)
+		layout.addLayout(self.button_row('axis'))
+		self.tabs.addTab(tab, "Axis Titles")
+
+	def init_tick_tab(self):
+		tab = QWidget()
+		layout = QVBoxLayout(tab)
+		form = QFormLayout()
+
+		self.tick_font_size = QSpinBox()
+		self.tick_font_size.setRange(6, 32)
+		self.tick_font_size.setValue(12)
+
+		form.addRow("Tick Label Font Size:", self.tick_font_size)
+
+		layout.addLayout(form)
+		layout.addLayout(self.button_row('tick'))
+		self.tabs.addTab(tab, "Tick Labels")
+
+	def init_event_tab(self):
+		tab = QWidget()
+		layout = QVBoxLayout(tab)
+		form = QFormLayout()
+
+		self.event_font_size = QSpinBox()
+		self.event_font_size.setRange(6, 32)
+		self.event_font_size.setValue(10)
+
+		self.event_font_family = QComboBox()
+		self.event_font_family.addItems(["Arial", "Helvetica", "Times New Roman", "Courier", "Verdana"])
+
+		self.event_bold = QCheckBox("Bold")
+		self.event_italic = QCheckBox("Italic")
+
+		form.addRow("Font Size:", self.event_font_size)
+		form.addRow("Font Family:", self.event_font_family)
+		form.addRow("", self.event_bold)
+		form.addRow("", self.event_italic)
+
+		layout.addLayout(form)
+		layout.addLayout(self.button_row('event'))
+		self.tabs.addTab(tab, "Event Labels")
+
+	def init_pin_tab(self):
+		tab = QWidget()
+		layout = QVBoxLayout(tab)
+		form = QFormLayout()
+
+		self.pin_font_size = QSpinBox()
+		self.pin_font_size.setRange(6, 32)
+		self.pin_font_size.setValue(10)
+
+		self.pin_font_family = QComboBox()
+		self.pin_font_family.addItems(["Arial", "Helvetica", "Times New Roman", "Courier", "Verdana"])
+
+		self.pin_bold = QCheckBox("Bold")
+		self.pin_italic = QCheckBox("Italic")
+
+		self.pin_size = QSpinBox()
+		self.pin_size.setRange(2, 20)
+		self.pin_size.setValue(6)
+
+		form.addRow("Font Size:", self.pin_font_size)
+		form.addRow("Font Family:", self.pin_font_family)
+		form.addRow("", self.pin_bold)
+		form.addRow("", self.pin_italic)
+		form.addRow("Marker Size:", self.pin_size)
+
+		layout.addLayout(form)
+		layout.addLayout(self.button_row('pin'))
+		self.tabs.addTab(tab, "Pinned Labels")
+
+	def init_line_tab(self):
+		tab = QWidget()
+		layout = QVBoxLayout(tab)
+		form = QFormLayout()
+
+		self.line_width = QSpinBox()
+		self.line_width.setRange(1, 10)
+		self.line_width.setValue(2)
+
+		form.addRow("Trace Line Width:", self.line_width)
+		layout.addLayout(form)
+		layout.addLayout(self.button_row('line'))
+		self.tabs.addTab(tab, "Trace Style")
+
+	def button_row(self, section):
+		layout = QHBoxLayout()
+		apply_btn = QPushButton("Apply")
+		default_btn = QPushButton("Default")
+	
+		apply_btn.clicked.connect(lambda: self.handle_apply_tab(section))
+		default_btn.clicked.connect(lambda: self.reset_defaults(section))
+	
+		layout.addStretch()
+		layout.addWidget(apply_btn)
+		layout.addWidget(default_btn)
+		return layout
+	
+	def handle_apply_tab(self, section):
+		# Only reapply current tab settings (optional expansion in future)
+		if hasattr(self.parent(), "apply_plot_style"):
+			self.parent().apply_plot_style(self.get_style())
+
+	def handle_apply_all(self):
+		if hasattr(self.parent(), "apply_plot_style"):
+			self.parent().apply_plot_style(self.get_style())
+
+	def reset_defaults(self, section):
+		if section == 'axis':
+			self.axis_font_size.setValue(14)
+			self.axis_font_family.setCurrentText("Arial")
+			self.axis_bold.setChecked(False)
+			self.axis_italic.setChecked(False)
+		elif section == 'tick':
+			self.tick_font_size.setValue(12)
+		elif section == 'event':
+			self.event_font_size.setValue(10)
+			self.event_font_family.setCurrentText("Arial")
+			self.event_bold.setChecked(False)
+			self.event_italic.setChecked(False)
+		elif section == 'pin':
+			self.pin_font_size.setValue(10)
+			self.pin_font_family.setCurrentText("Arial")
+			self.pin_bold.setChecked(False)
+			self.pin_italic.setChecked(False)
+			self.pin_size.setValue(6)
+		elif section == 'line':
+			self.line_width.setValue(2)
+
+	def set_style(self, style):
+		self.axis_font_size.setValue(style['axis_font_size'])
+		self.axis_font_family.setCurrentText(style['axis_font_family'])
+		self.axis_bold.setChecked(style['axis_bold'])
+		self.axis_italic.setChecked(style['axis_italic'])
+
+		self.tick_font_size.setValue(style['tick_font_size'])
+
+		self.event_font_size.setValue(style['event_font_size'])
+		self.event_font_family.setCurrentText(style['event_font_family'])
+		self.event_bold.setChecked(style['event_bold'])
+		self.event_italic.setChecked(style['event_italic'])
+
+		self.pin_font_size.setValue(style['pin_font_size'])
+		self.pin_font_family.setCurrentText(style['pin_font_family'])
+		self.pin_bold.setChecked(style['pin_bold'])
+		self.pin_italic.setChecked(style['pin_italic'])
+		self.pin_size.setValue(style['pin_size'])
+
+		self.line_width.setValue(style['line_width'])
+
+	def get_style(self):
+		return {
+			"axis_font_size": self.axis_font_size.value(),
+			"axis_font_family": self.axis_font_family.currentText(),
+			"axis_bold": self.axis_bold.isChecked(),
+			"axis_italic": self.axis_italic.isChecked(),
+
+			"tick_font_size": self.tick_font_size.value(),
+
+			"event_font_size": self.event_font_size.value(),
+			"event_font_family": self.event_font_family.currentText(),
+			"event_bold": self.event_bold.isChecked(),
+			"event_italic": self.event_italic.isChecked(),
+
+			"pin_font_size": self.pin_font_size.value(),
+			"pin_font_family": self.pin_font_family.currentText(),
+			"pin_bold": self.pin_bold.isChecked(),
+			"pin_italic": self.pin_italic.isChecked(),
+			"pin_size": self.pin_size.value(),
+
+			"line_width": self.line_width.value()
+		}
\ No newline at end of file
@@ -0,0 +1,364 @@
+import hashlib
+import importlib
+import importlib.util
+import os
+import sys
+
+import numpy as np
+
+from vasoanalyzer.metrics import METRIC_COLUMNS
+from vasoanalyzer.trace_loader import TIME_COLUMN, DIAMETER_COLUMN
+from vasoanalyzer.workers import process_pool
+
+# Analysis plugins: extra per-event columns computed by lab-specific code.
+# A plugin is a function registered with @plugin in a .py file in the plugin
+# folder (~/.vasoanalyzer/plugins, plus any folders or files listed in
+# VASOANALYZER_PLUGINS) or in a package advertising a "vasoanalyzer.plugins"
+# entry point. It is called once per recording with an EventWindows — the
+# trace arrays and every event's sample range — and returns one number per
+# event for each of its columns, so it can treat all events at once with
+# numpy. For example:
+#
+#	import numpy as np
+#	from vasoanalyzer.plugins import plugin
+#
+#	@plugin("Area", columns=["Area (µm·s)"], version=1)
+#	def area(events):
+#		dt = np.gradient(events.time)
+#		return {"Area (µm·s)": events.reduce(np.add, np.nan_to_num(events.diameter) * dt)}
+#
+# The columns are added to the event table and eventDiameters_output.csv.
+# Plugins run in worker processes (see vasoanalyzer.workers), one task per
+# recording and plugin, and their results are kept in the disk cache under
+# the plugin's name and version and a hash of the recording's data:
+# reopening a recording or undoing an edit recomputes nothing, and bumping
+# ``version`` after changing a plugin discards its old results.
+
+PLUGIN_DIR = os.path.join(os.path.expanduser("~"), ".vasoanalyzer", "plugins")
+PLUGIN_ENTRY_POINT = "vasoanalyzer.plugins"
+PLUGIN_WORKERS = 4			# Upper bound on worker processes (also limited by the CPU count)
+PLUGIN_CACHE_FORMAT = 2		# Bump when EventWindows, the trace hash or the stored results change meaning
+DIGEST_ROWS = 1 << 16		# Rows per block of the trace hash
+
+# Columns every event table has; plugins cannot take their names
+RESERVED_COLUMNS = {"Event", "Time (s)", "Frame", "ID (µm)", *METRIC_COLUMNS}
+
+class Plugin:
+	"""A registered analysis function and the table columns it fills.
+
+	``source`` is the plugin file's path, or the module name, so worker
+	processes can import it to find the function.
+	"""
+
+	def __init__(self, name, columns, version, func, source):
+		self.name = name
+		self.columns = list(columns)
+		self.version = version
+		self.func = func
+		self.source = source
+
+	def cache_key(self, digest):
+		identity = (PLUGIN_CACHE_FORMAT, self.name, self.version, tuple(self.columns), digest)
+		return hashlib.sha1(repr(identity).encode()).hexdigest()
+
+	def run(self, windows):
+		"""``{column: float array}`` (one value per event) from the plugin's function."""
+		result = self.func(windows)
+		columns = {}
+		for column in self.columns:
+			if column not in result:
+				raise ValueError(f"returned no {column!r} column")
+			values = np.asarray(result[column], dtype=float).reshape(-1)
+			if len(values) != len(windows):
+				raise ValueError(f"{column!r} has {len(values)} values for {len(windows)} events")
+			columns[column] = values
+		return columns
+
+PLUGINS = {}				# name -> Plugin, in registration order
+_loaded_sources = set()
+_loading_file = None		# Plugin file being imported (registrations record it as their source)
+
+def plugin(name, columns, version=1):
+	"""Decorator registering ``func(windows) -> {column: values}`` as the analysis plugin ``name``."""
+	def register(func):
+		taken = RESERVED_COLUMNS.union(*(p.columns for p in PLUGINS.values() if p.name != name))
+		clashes = [column for column in columns if column in taken]
+		if clashes:
+			raise ValueError(f"Plugin {name!r}: column(s) already in use: {', '.join(clashes)}")
+		PLUGINS[name] = Plugin(name, columns, version, func, _loading_file or func.__module__)
+		return func
+	return register
+
+def plugin_columns():
+	"""Table columns of all registered plugins, in registration order."""
+	return [column for p in PLUGINS.values() for column in p.columns]
+
+def plugin_paths():
+	paths = [PLUGIN_DIR]
+	paths += [path for path in os.environ.get("VASOANALYZER_PLUGINS", "").split(os.pathsep) if path]
+	return paths
+
+def _import_source(source):
+	"""Import a plugin file (``*.py`` path) or module once per process."""
+	global _loading_file
+	if source in _loaded_sources:
+		return
+	if source.endswith(".py"):
+		module_name = "vasoanalyzer_plugin_" + hashlib.sha1(os.path.abspath(source).encode()).hexdigest()[:12]
+		spec = importlib.util.spec_from_file_location(module_name, source)
+		module = importlib.util.module_from_spec(spec)
+		sys.modules[module_name] = module
+		_loading_file = source
+		try:
+			spec.loader.exec_module(module)
+		except BaseException:
+			del sys.modules[module_name]
+			raise
+		finally:
+			_loading_file = None
+	else:
+		importlib.import_module(source)
+	_loaded_sources.add(source)
+
+def load_plugins(paths=None):
+	"""Import the plugins in ``paths`` (default: plugin_paths()) and the entry point; returns PLUGINS.
+
+	A plugin that fails to import is reported and skipped.
+	"""
+	sources = []
+	for path in plugin_paths() if paths is None else paths:
+		if os.path.isdir(path):
+			sources += [
+				os.path.join(path, name) for name in sorted(os.listdir(path))
+				if name.endswith(".py") and not name.startswith("_")
+			]
+		elif os.path.isfile(path):
+			sources.append(path)
+	try:
+		from importlib.metadata import entry_points
+
+		sources += [entry_point.module for entry_point in entry_points(group=PLUGIN_ENTRY_POINT)]
+	except Exception as e:
+		print(f"⚠️ Could not list plugin entry points: {e}")
+	for source in sources:
+		try:
+			_import_source(source)
+		except Exception as e:
+			print(f"⚠️ Plugin {source} failed to load: {e}")
+	return PLUGINS
+
+class TraceDigest:
+	"""Hash of a growing trace's samples (part of every plugin result's cache key).
+
+	Rows are hashed in blocks of DIGEST_ROWS; a block's hash is kept once
+	it is complete, so as the trace grows only the new rows and the last,
+	partial block are hashed again. The hash depends only on the values of
+	``columns`` (time, diameter, then channels), not on how rows arrived.
+	"""
+
+	def __init__(self, columns):
+		self.columns = list(columns)
+		self.blocks = []		# Hashes of the complete blocks
+		self.n = 0				# Rows covered by them
+
+	def hexdigest(self, rows, n, final=None):
+		"""Hash of the first ``n`` rows; ``rows(i0, i1)`` returns ``{column: array}`` for rows ``[i0, i1)``.
+
+		Rows from ``final`` (default: ``n``) on may still change, so blocks
+		reaching them are not kept.
+		"""
+		final = n if final is None else min(final, n)
+		while self.n + DIGEST_ROWS <= final:
+			self.blocks.append(self._block(rows(self.n, self.n + DIGEST_ROWS)))
+			self.n += DIGEST_ROWS
+		digest = hashlib.sha1(repr(self.columns).encode())
+		for block in self.blocks:
+			digest.update(block)
+		for start in range(self.n, n, DIGEST_ROWS):
+			digest.update(self._block(rows(start, min(start + DIGEST_ROWS, n))))
+		return digest.hexdigest()
+
+	def _block(self, arrays):
+		digest = hashlib.sha1()
+		for column in self.columns:
+			digest.update(np.ascontiguousarray(arrays[column], dtype=float))
+		return digest.digest()
+
+def digest_columns(channels=()):
+	"""Column order of a trace's hash: time, diameter, then the channels by name."""
+	return [TIME_COLUMN, DIAMETER_COLUMN] + sorted(channels)
+
+def trace_digest(time, diameter, channels=None):
+	"""Hash of a trace's samples given as arrays (see TraceDigest)."""
+	arrays = {TIME_COLUMN: time, DIAMETER_COLUMN: diameter, **(channels or {})}
+	rows = lambda i0, i1: {column: values[i0:i1] for column, values in arrays.items()}
+	return TraceDigest(digest_columns(channels or {})).hexdigest(rows, len(time))
+
+class EventWindows:
+	"""One recording as a plugin sees it.
+
+	``time`` and ``diameter`` are the (filtered) trace and ``channels`` its
+	other loaded columns by name; ``labels`` and ``times`` are the events in
+	table order. Event ``i`` spans samples ``starts[i]:ends[i]``, from its
+	time to the next event's (the last one runs to the end of the trace), as
+	in metrics.compute_event_metrics.
+	"""
+
+	def __init__(self, time, diameter, labels, times, channels=None, digest=None):
+		self.time = np.asarray(time, dtype=float)
+		self.diameter = np.asarray(diameter, dtype=float)
+		self.channels = {name: np.asarray(values, dtype=float) for name, values in (channels or {}).items()}
+		self.labels = [str(label) for label in labels]
+		self.times = np.asarray(times, dtype=float)
+		self._trace_digest = digest
+
+		# Spans are worked out in time order, then put back in table order
+		self._order = np.argsort(self.times, kind="stable")
+		sorted_starts = np.searchsorted(self.time, self.times[self._order], side="left")
+		self.starts = np.empty(len(self.times), dtype=int)
+		self.ends = np.empty(len(self.times), dtype=int)
+		self.starts[self._order] = sorted_starts
+		self.ends[self._order] = np.append(sorted_starts[1:], len(self.time))
+
+	def __len__(self):
+		return len(self.times)
+
+	def segments(self, values=None):
+		"""``values`` (default: the diameter) over each event's span, as a list of views."""
+		values = self.diameter if values is None else np.asarray(values)
+		return [values[a:b] for a, b in zip(self.starts, self.ends)]
+
+	def reduce(self, ufunc, values=None):
+		"""``ufunc.reduceat`` of ``values`` (default: the diameter) over every event's span; NaN for empty spans."""
+		values = self.diameter if values is None else np.asarray(values, dtype=float)
+		result = np.full(len(self), np.nan)
+		starts = self.starts[self._order]
+		non_empty = self.ends[self._order] > starts
+		if non_empty.any():
+			# In time order the non-empty spans are contiguous up to the end of the trace
+			first = starts[non_empty][0]
+			in_order = np.full(len(self), np.nan)
+			in_order[non_empty] = ufunc.reduceat(values[first:], starts[non_empty] - first)
+			result[self._order] = in_order
+		return result
+
+	def mean(self, values=None):
+		"""Mean of ``values`` (default: the diameter) over every event's span, ignoring NaN."""
+		values = self.diameter if values is None else np.asarray(values, dtype=float)
+		finite = np.isfinite(values)
+		with np.errstate(invalid="ignore", divide="ignore"):
+			return self.reduce(np.add, np.where(finite, values, 0.0)) / self.reduce(np.add, finite.astype(float))
+
+	def digest(self):
+		"""Hash of the trace and events (part of every plugin result's cache key)."""
+		if self._trace_digest is None:
+			self._trace_digest = trace_digest(self.time, self.diameter, self.channels)
+		events = hashlib.sha1(np.ascontiguousarray(self.times))
+		events.update(repr(self.labels).encode())
+		return self._trace_digest + events.hexdigest()
+
+def run_plugin(source, name, windows):
+	"""Columns of plugin ``name`` (imported from ``source``) on ``windows`` (runs in a worker process)."""
+	if name not in PLUGINS:
+		_import_source(source)
+	return PLUGINS[name].run(windows)
+
+class PluginRunner:
+	"""Runs plugins over recordings on a process pool, through the disk cache.
+
+	``submit(key, windows)`` queues every plugin for one recording (``key``
+	is the caller's tag for it); call ``finished`` (e.g. from a timer on the
+	GUI thread) to collect ``(key, columns, errors)`` for recordings whose
+	plugins are all done. Cached results count as done straight away.
+	"""
+
+	def __init__(self, plugins=None, max_workers=None, cache=None):
+		from vasoanalyzer.cache import default_cache
+
+		self.plugins = list(PLUGINS.values()) if plugins is None else list(plugins)
+		self.max_workers = max_workers or min(PLUGIN_WORKERS, os.cpu_count() or 1)
+		self.cache = default_cache() if cache is None else cache
+		self._executor = None
+		self._jobs = []			# (key, n_events, columns, errors, {plugin: (cache key, future)})
+
+	def submit(self, key, windows):
+		columns, futures = {}, {}
+		digest = windows.digest() if len(windows) else None
+		for p in self.plugins:
+			if not len(windows):
+				columns.update({column: np.empty(0) for column in p.columns})
+				continue
+			cache_key = p.cache_key(digest)
+			cached = self.cache.get(cache_key) if self.cache else None
+			if cached is not None:
+				columns.update({column: np.array(values) for column, values in cached[1].items()})
+				continue
+			if self._executor is None:
+				self._executor = process_pool(self.max_workers)
+			futures[p] = (cache_key, self._executor.submit(run_plugin, p.source, p.name, windows))
+		self._jobs.append((key, len(windows), columns, [], futures))
+
+	def pending(self):
+		return bool(self._jobs)
+
+	def finished(self):
+		done = [job for job in self._jobs if all(future.done() for _, future in job[4].values())]
+		self._jobs = [job for job in self._jobs if job not in done]
+		results = []
+		for key, n_events, columns, errors, futures in done:
+			for p, (cache_key, future) in futures.items():
+				error = future.exception()
+				if error is not None:
+					errors.append(f"{p.name}: {error}")
+					columns.update({column: np.full(n_events, np.nan) for column in p.columns})
+					continue
+				result = future.result()
+				columns.update(result)
+				if self.cache:
+					self.cache.put(cache_key, {"plugin": p.name, "version": p.version}, result)
+			results.append((key, columns, errors))
+		return results
+
+	def wait(self):
+		"""Block until every submitted recording is done; returns ``finished()``."""
+		for job in self._jobs:
+			for _, future in job[4].values():
+				future.exception()
+		return self.finished()
+
+	def cancel(self):
+		"""Drop all submitted recordings (their results will not be reported)."""
+		for job in self._jobs:
+			for _, future in job[4].values():
+				future.cancel()
+		self._jobs = []
+
+	def shutdown(self):
+		self.cancel()
+		if self._executor is not None:
+			self._executor.shutdown(wait=False, cancel_futures=True)
+			self._executor = None
+
+def analyze_recordings(trace_paths, plugins=None, max_workers=None, cache=None):
+	"""Run plugins on many recordings at once: ``{trace_path: (columns, errors)}``.
+
+	Each trace is read with all its columns and its events from the matching
+	``_table.csv``; traces without one are skipped.
+	"""
+	from vasoanalyzer.trace_loader import load_trace
+	from vasoanalyzer.event_loader import load_events
+
+	runner = PluginRunner(plugins, max_workers, cache)
+	try:
+		for path in trace_paths:
+			event_path = os.path.splitext(path)[0] + "_table.csv"
+			if not os.path.exists(event_path):
+				print(f"⚠️ No event file for {os.path.basename(path)}; skipped")
+				continue
+			trace = load_trace(path)
+			labels, times, _ = load_events(event_path)
+			channels = {col: trace[col] for col in trace.columns if col not in (TIME_COLUMN, DIAMETER_COLUMN)}
+			runner.submit(path, EventWindows(trace[TIME_COLUMN], trace[DIAMETER_COLUMN], labels, times, channels))
+		return {path: (columns, errors) for path, columns, errors in runner.wait()}
+	finally:
+		runner.shutdown()
@@ -0,0 +1,145 @@
+import atexit
+import functools
+import json
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+# Instrumentation is off unless VASOANALYZER_PROFILE is set (or main.py is
+# started with --profile). VASOANALYZER_PROFILE_TRACE=<path> (--profile-trace)
+# additionally writes a Chrome trace (chrome://tracing, Perfetto) on exit.
+ENV_FLAG = "VASOANALYZER_PROFILE"
+ENV_TRACE = "VASOANALYZER_PROFILE_TRACE"
+
+# Histogram buckets: powers of two from 0.125 ms up to ~65 s
+_BUCKET_MIN_MS = 0.125
+_N_BUCKETS = 20
+_MAX_TRACE_EVENTS = 200000
+
+class LatencyStats:
+	"""Log2 latency histogram plus count/total/min/max for one timer name."""
+
+	def __init__(self):
+		self.count = 0
+		self.total = 0.0
+		self.min = math.inf
+		self.max = 0.0
+		self.buckets = [0] * _N_BUCKETS
+
+	def add(self, seconds):
+		ms = seconds * 1000.0
+		self.count += 1
+		self.total += ms
+		self.min = min(self.min, ms)
+		self.max = max(self.max, ms)
+		self.buckets[_bucket_index(ms)] += 1
+
+	def percentile(self, q):
+		"""Upper bucket edge (ms) below which ``q`` percent of samples fall."""
+		if not self.count:
+			return 0.0
+		target = self.count * q / 100.0
+		seen = 0
+		for i, n in enumerate(self.buckets):
+			seen += n
+			if seen >= target:
+				return min(_bucket_edge(i), self.max)
+		return self.max
+
+def _bucket_index(ms):
+	if ms <= _BUCKET_MIN_MS:
+		return 0
+	return min(_N_BUCKETS - 1, int(math.ceil(math.log2(ms / _BUCKET_MIN_MS))))
+
+def _bucket_edge(i):
+	return _BUCKET_MIN_MS * (2 ** i)
+
+class Profiler:
+	def __init__(self):
+		self.enabled = False
+		self.trace_path = None
+		self.stats = {}
+		self.trace_events = []
+		self._lock = threading.Lock()
+		self._t0 = time.perf_counter()
+		self._atexit_registered = False
+
+	def enable(self, trace_path=None):
+		self.enabled = True
+		if trace_path:
+			self.trace_path = trace_path
+		if not self._atexit_registered:
+			atexit.register(self.dump)
+			self._atexit_registered = True
+
+	def record(self, name, start, end):
+		with self._lock:
+			stats = self.stats.get(name)
+			if stats is None:
+				stats = self.stats[name] = LatencyStats()
+			stats.add(end - start)
+			if self.trace_path and len(self.trace_events) < _MAX_TRACE_EVENTS:
+				self.trace_events.append({
+					"name": name,
+					"ph": "X",
+					"ts": (start - self._t0) * 1e6,
+					"dur": (end - start) * 1e6,
+					"pid": os.getpid(),
+					"tid": threading.get_ident(),
+				})
+
+	def summary(self):
+		lines = [f"{'timer':<24}{'count':>7}{'mean ms':>10}{'p50':>9}{'p95':>9}{'max':>10}"]
+		for name, s in sorted(self.stats.items(), key=lambda kv: kv[1].total, reverse=True):
+			lines.append(
+				f"{name:<24}{s.count:>7}{s.total / s.count:>10.2f}"
+				f"{s.percentile(50):>9.2f}{s.percentile(95):>9.2f}{s.max:>10.2f}"
+			)
+		return "\n".join(lines)
+
+	def dump(self):
+		if not self.stats:
+			return
+		print("⏱ Profiling summary:")
+		print(self.summary())
+		if self.trace_path:
+			try:
+				with open(self.trace_path, "w") as f:
+					json.dump({"traceEvents": self.trace_events, "displayTimeUnit": "ms"}, f)
+				print(f"✔ Chrome trace written to:\n{self.trace_path}")
+			except Exception as e:
+				print(f"❌ Failed to write Chrome trace:\n{e}")
+
+PROFILER = Profiler()
+
+if os.environ.get(ENV_FLAG) or os.environ.get(ENV_TRACE):
+	PROFILER.enable(os.environ.get(ENV_TRACE))
+
+@contextmanager
+def timer(name):
+	"""Time the enclosed block under ``name`` when profiling is enabled."""
+	if not PROFILER.enabled:
+		yield
+		return
+	start = time.perf_counter()
+	try:
+		yield
+	finally:
+		PROFILER.record(name, start, time.perf_counter())
+
+def profiled(name):
+	"""Decorator form of :func:`timer`; near-free when profiling is off."""
+	def decorator(fn):
+		@functools.wraps(fn)
+		def wrapper(*args, **kwargs):
+			if not PROFILER.enabled:
+				return fn(*args, **kwargs)
+			start = time.perf_counter()
+			try:
+				return fn(*args, **kwargs)
+			finally:
+				PROFILER.record(name, start, time.perf_counter())
+		return wrapper
+	return decorator
@@ -0,0 +1,186 @@
+import json
+import os
+
+import numpy as np
+
+from vasoanalyzer.workers import process_pool
+
+# Re-measuring the diameter from the _Result.tiff images along a user-drawn
+# line. Pages are split into ranges, one per worker process; each worker
+# opens the TIFF itself and streams its range BATCH_FRAMES pages at a time
+# (memory-mapped when the file allows it), so neither the GUI process nor
+# any worker ever holds the whole stack. Profiles, edges and diameters are
+# computed for a whole batch at once (workers: see vasoanalyzer.workers).
+
+REMEASURED_COLUMN = "Remeasured Diameter"
+BATCH_FRAMES = 64			# Pages decoded and measured together in a worker
+RANGES_PER_WORKER = 4		# Finer ranges give smoother progress and better balance
+INNER = "inner"				# Lumen edges: the wall's inner (lumen-side) boundaries
+OUTER = "outer"				# The wall's outer boundaries
+
+def profile_coordinates(p0, p1, width=1):
+	"""Sample points along the line ``p0`` → ``p1`` ((x, y) in pixels), one per pixel of length.
+
+	``width`` > 1 adds parallel lines one pixel apart on either side, so the
+	profile can be averaged across the vessel wall. Returns ``(xs, ys, step)``
+	with ``xs``/``ys`` of shape ``(width, n)`` and ``step`` the spacing in pixels.
+	"""
+	p0 = np.asarray(p0, dtype=float)
+	p1 = np.asarray(p1, dtype=float)
+	length = float(np.hypot(*(p1 - p0)))
+	n = max(2, int(np.ceil(length)) + 1)
+	along = np.linspace(0.0, 1.0, n)
+	points = p0 + along[:, None] * (p1 - p0)
+	normal = np.array([-(p1 - p0)[1], (p1 - p0)[0]]) / max(length, 1e-9)
+	offsets = np.arange(width) - (width - 1) / 2
+	xs = points[None, :, 0] + offsets[:, None] * normal[0]
+	ys = points[None, :, 1] + offsets[:, None] * normal[1]
+	return xs, ys, length / (n - 1)
+
+def extract_profiles(frames, xs, ys):
+	"""Bilinear intensity profiles of ``frames`` (k, H, W) at the sample points, averaged across width.
+
+	Returns a ``(k, n)`` float array; points outside the image are clamped to the border.
+	"""
+	frames = np.asarray(frames)
+	if frames.ndim == 4:		# RGB(A) -> grey
+		frames = frames[..., :3].mean(axis=-1)
+	height, width = frames.shape[1:3]
+	xs = np.clip(xs, 0, width - 1)
+	ys = np.clip(ys, 0, height - 1)
+	x0 = np.minimum(np.floor(xs).astype(int), width - 2 if width > 1 else 0)
+	y0 = np.minimum(np.floor(ys).astype(int), height - 2 if height > 1 else 0)
+	x1 = np.minimum(x0 + 1, width - 1)
+	y1 = np.minimum(y0 + 1, height - 1)
+	fx = xs - x0
+	fy = ys - y0
+	# Gather the four neighbours for every frame at once: (k, width, n)
+	top = frames[:, y0, x0] * (1 - fx) + frames[:, y0, x1] * fx
+	bottom = frames[:, y1, x0] * (1 - fx) + frames[:, y1, x1] * fx
+	return (top * (1 - fy) + bottom * fy).mean(axis=1)
+
+def _subpixel(values, idx):
+	"""Refine the extremum at ``idx`` (one per row) with a parabola through its neighbours."""
+	rows = np.arange(len(idx))
+	idx = np.clip(idx, 1, values.shape[1] - 2)
+	left, centre, right = values[rows, idx - 1], values[rows, idx], values[rows, idx + 1]
+	denom = left - 2 * centre + right
+	shift = np.where(np.abs(denom) > 1e-12, 0.5 * (left - right) / np.where(denom == 0, 1, denom), 0.0)
+	return idx + np.clip(shift, -0.5, 0.5)
+
+def edge_positions(profiles, edge=INNER, smooth=3):
+	"""Left and right wall edges (in profile samples) for every profile row.
+
+	The line is assumed to cross the vessel roughly centred, starting and
+	ending outside it, with the lumen brighter than the wall (bright-field).
+	Inner edges are the strongest dark→bright step in the first half and
+	bright→dark step in the second; outer edges the opposite ones.
+	"""
+	profiles = np.asarray(profiles, dtype=float)
+	if smooth > 1:		# Moving average along the profile (same length)
+		padded = np.pad(profiles, ((0, 0), (smooth // 2, smooth - 1 - smooth // 2)), mode='edge')
+		csum = np.cumsum(np.pad(padded, ((0, 0), (1, 0))), axis=1)
+		profiles = (csum[:, smooth:] - csum[:, :-smooth]) / smooth
+	gradient = np.gradient(profiles, axis=1)
+	half = gradient.shape[1] // 2
+	sign = 1 if edge == INNER else -1
+	left = _subpixel(sign * gradient, np.argmax(sign * gradient[:, :half], axis=1))
+	right = _subpixel(-sign * gradient, half + np.argmax(-sign * gradient[:, half:], axis=1))
+	return left, right
+
+def frame_times(pages, recording_interval=1.0):
+	"""Trace time (s) of each TIFF page: its ``FrameNumber`` (else the page index) times ``recording_interval``.
+
+	This is where the window places frames on the plot (see frame_x); the
+	JSON ``Time`` is not used as it may be a wall-clock time.
+	"""
+	times = np.empty(len(pages))
+	for i, page in enumerate(pages):
+		meta = {}
+		if getattr(page, "description", None):
+			try:
+				meta = json.loads(page.description)
+			except (ValueError, TypeError):
+				meta = {}
+		if not isinstance(meta, dict):
+			meta = {}
+		times[i] = float(meta.get("FrameNumber", page.index)) * recording_interval
+	return times
+
+def iter_frame_batches(tif, file_path, start, stop, batch_frames=BATCH_FRAMES):
+	"""Yield ``(first_index, frames)`` stacks of at most ``batch_frames`` pages from [start, stop)."""
+	from vasoanalyzer.tiff_loader import _memmap_stack
+
+	for first in range(start, stop, batch_frames):
+		indices = range(first, min(first + batch_frames, stop))
+		mapped = _memmap_stack(file_path, tif, indices)
+		if mapped is not None:
+			yield first, np.stack(mapped)
+		else:
+			yield first, np.stack([tif.pages[i].asarray() for i in indices])
+
+def measure_range(file_path, start, stop, p0, p1, width=3, edge=INNER, pixel_size=1.0,
+		recording_interval=1.0, batch_frames=BATCH_FRAMES):
+	"""Diameters and times for pages [start, stop) of ``file_path`` (runs in a worker process)."""
+	import tifffile
+
+	xs, ys, step = profile_coordinates(p0, p1, width)
+	diameters = np.empty(stop - start)
+	with tifffile.TiffFile(file_path) as tif:
+		tif.pages.cache = True		# Parse each page header once (times, then pixels)
+		times = frame_times([tif.pages[i] for i in range(start, stop)], recording_interval)
+		for first, frames in iter_frame_batches(tif, file_path, start, stop, batch_frames):
+			left, right = edge_positions(extract_profiles(frames, xs, ys), edge)
+			diameters[first - start:first - start + len(frames)] = (right - left) * step * pixel_size
+	return times, diameters
+
+def count_pages(file_path):
+	import tifffile
+
+	with tifffile.TiffFile(file_path) as tif:
+		return len(tif.pages)
+
+class RemeasureJob:
+	"""Re-measure every page of a TIFF on a process pool; poll ``progress``/``done`` from the GUI.
+
+	Keyword arguments are passed to ``measure_range``.
+	"""
+
+	def __init__(self, file_path, p0, p1, max_workers=None, **kwargs):
+		n_pages = count_pages(file_path)
+		# No more workers than batches: short stacks aren't worth a pool start-up per process
+		workers = max_workers or max(1, min(os.cpu_count() or 1, 8, -(-n_pages // kwargs.get("batch_frames", BATCH_FRAMES))))
+		n_ranges = max(1, min(n_pages, workers * RANGES_PER_WORKER))
+		bounds = np.linspace(0, n_pages, n_ranges + 1).astype(int)
+		self._executor = process_pool(workers)
+		self._futures = [
+			self._executor.submit(measure_range, file_path, int(a), int(b), tuple(p0), tuple(p1), **kwargs)
+			for a, b in zip(bounds[:-1], bounds[1:]) if b > a
+		]
+
+	def progress(self):
+		return sum(future.done() for future in self._futures) / max(1, len(self._futures))
+
+	def done(self):
+		return all(future.done() for future in self._futures)
+
+	def result(self):
+		"""``(times, diameters)`` over all pages, in page order (raises a worker's error)."""
+		parts = [future.result() for future in self._futures]
+		self._executor.shutdown(wait=False)
+		if not parts:
+			return np.array([]), np.array([])
+		return np.concatenate([t for t, _ in parts]), np.concatenate([d for _, d in parts])
+
+	def cancel(self):
+		self._executor.shutdown(wait=False, cancel_futures=True)
+
+def align_to_trace(trace_time, frame_times, diameters):
+	"""Interpolate per-frame ``diameters`` onto ``trace_time`` (NaN outside the frames' time span)."""
+	order = np.argsort(frame_times, kind="stable")
+	frame_times = np.asarray(frame_times)[order]
+	diameters = np.asarray(diameters)[order]
+	valid = np.isfinite(diameters)
+	if valid.sum() < 2:
+		return np.full(len(trace_time), np.nan)
+	return np.interp(trace_time, frame_times[valid], diameters[valid], left=np.nan, right=np.nan)
@@ -0,0 +1,180 @@
+import numpy as np
+from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+from matplotlib.figure import Figure
+from PyQt5.QtCore import QTimer
+from PyQt5.QtWidgets import (
+	QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QFormLayout, QComboBox,
+	QDoubleSpinBox, QSpinBox, QProgressBar, QMessageBox
+)
+
+from vasoanalyzer.remeasure import (
+	RemeasureJob, profile_coordinates, extract_profiles, edge_positions, INNER, OUTER
+)
+
+REMEASURE_POLL_MS = 200
+
+class RemeasureDialog(QDialog):
+	"""Draw a line across the vessel on a TIFF frame and re-measure its diameter on every frame.
+
+	The line is previewed on the shown frame (edges marked) as soon as it
+	is drawn; "Measure All Frames" runs a RemeasureJob on worker processes.
+	After ``exec_()`` succeeds, ``times``/``diameters`` hold one value per page.
+	"""
+
+	def __init__(self, parent, tiff_path, frame, recording_interval=1.0):
+		super().__init__(parent)
+		self.setWindowTitle("Re-measure Diameter from TIFF")
+		self.setMinimumSize(640, 600)
+		self.tiff_path = tiff_path
+		self.frame = np.asarray(frame)
+		self.line = None			# ((x0, y0), (x1, y1)) in image pixels
+		self.press = None
+		self.job = None
+		self.times = None
+		self.diameters = None
+		self._timer = QTimer(self)
+		self._timer.setInterval(REMEASURE_POLL_MS)
+		self._timer.timeout.connect(self.check_job)
+
+		main_layout = QVBoxLayout(self)
+		main_layout.addWidget(QLabel("Drag a line across the vessel, starting and ending outside its walls."))
+
+		self.fig = Figure(figsize=(6, 4.5), facecolor='white')
+		self.canvas = FigureCanvas(self.fig)
+		self.ax = self.fig.add_axes([0, 0, 1, 1])
+		self.ax.imshow(self.frame, cmap='gray')
+		self.ax.set_axis_off()
+		self.line_artist, = self.ax.plot([], [], '-', color='tab:orange', linewidth=1.5)
+		self.edge_artist, = self.ax.plot([], [], 'o', color='tab:red', markersize=5)
+		self.canvas.mpl_connect("button_press_event", self.on_press)
+		self.canvas.mpl_connect("motion_notify_event", self.on_motion)
+		self.canvas.mpl_connect("button_release_event", self.on_release)
+		main_layout.addWidget(self.canvas)
+
+		form = QFormLayout()
+		self.edge_selector = QComboBox()
+		self.edge_selector.addItem("Inner (lumen)", INNER)
+		self.edge_selector.addItem("Outer", OUTER)
+		self.edge_selector.currentIndexChanged.connect(self.preview)
+		self.pixel_size = QDoubleSpinBox()
+		self.pixel_size.setDecimals(4)
+		self.pixel_size.setRange(0.0001, 1000)
+		self.pixel_size.setValue(1.0)
+		self.pixel_size.valueChanged.connect(self.preview)
+		self.line_width = QSpinBox()
+		self.line_width.setRange(1, 51)
+		self.line_width.setSingleStep(2)
+		self.line_width.setValue(5)
+		self.line_width.setToolTip("Parallel profiles averaged across the line (pixels)")
+		self.line_width.valueChanged.connect(self.preview)
+		self.interval = QDoubleSpinBox()
+		self.interval.setDecimals(3)
+		self.interval.setRange(0.001, 3600)
+		self.interval.setValue(recording_interval)
+		self.interval.setToolTip("Seconds per frame: each frame is placed at its FrameNumber times this")
+		form.addRow("Edges:", self.edge_selector)
+		form.addRow("Pixel size (µm/px):", self.pixel_size)
+		form.addRow("Line width (px):", self.line_width)
+		form.addRow("Frame interval (s):", self.interval)
+		main_layout.addLayout(form)
+
+		self.preview_label = QLabel("Diameter on this frame: –")
+		main_layout.addWidget(self.preview_label)
+		self.progress = QProgressBar()
+		self.progress.setRange(0, 100)
+		self.progress.hide()
+		main_layout.addWidget(self.progress)
+
+		btn_row = QHBoxLayout()
+		self.measure_btn = QPushButton("Measure All Frames")
+		self.measure_btn.setEnabled(False)
+		self.measure_btn.clicked.connect(self.start_job)
+		self.cancel_btn = QPushButton("Cancel")
+		self.cancel_btn.clicked.connect(self.reject)
+		btn_row.addStretch()
+		btn_row.addWidget(self.cancel_btn)
+		btn_row.addWidget(self.measure_btn)
+		main_layout.addLayout(btn_row)
+
+	# ----- Line drawing -----
+	def on_press(self, event):
+		if event.inaxes is self.ax and event.xdata is not None and self.job is None:
+			self.press = (event.xdata, event.ydata)
+
+	def on_motion(self, event):
+		if self.press is None or event.inaxes is not self.ax or event.xdata is None:
+			return
+		self.line_artist.set_data([self.press[0], event.xdata], [self.press[1], event.ydata])
+		self.canvas.draw_idle()
+
+	def on_release(self, event):
+		if self.press is None:
+			return
+		end = (event.xdata, event.ydata) if event.inaxes is self.ax and event.xdata is not None else None
+		start, self.press = self.press, None
+		if end is None or np.hypot(end[0] - start[0], end[1] - start[1]) < 5:
+			return
+		self.line = (start, end)
+		self.measure_btn.setEnabled(True)
+		self.preview()
+
+	def settings(self):
+		return {
+			"width": self.line_width.value(),
+			"edge": self.edge_selector.currentData(),
+			"pixel_size": self.pixel_size.value(),
+		}
+
+	def preview(self):
+		"""Measure the shown frame only and mark the detected edges."""
+		if self.line is None:
+			return
+		settings = self.settings()
+		xs, ys, step = profile_coordinates(*self.line, width=settings["width"])
+		left, right = edge_positions(extract_profiles(self.frame[None], xs, ys), settings["edge"])
+		(x0, y0), (x1, y1) = self.line
+		n = xs.shape[1] - 1
+		edges = np.array([left[0], right[0]]) / n
+		self.line_artist.set_data([x0, x1], [y0, y1])
+		self.edge_artist.set_data(x0 + edges * (x1 - x0), y0 + edges * (y1 - y0))
+		diameter = (right[0] - left[0]) * step * settings["pixel_size"]
+		self.preview_label.setText(f"Diameter on this frame: {diameter:.1f} µm")
+		self.canvas.draw_idle()
+
+	# ----- Background measurement -----
+	def start_job(self):
+		try:
+			self.job = RemeasureJob(
+				self.tiff_path, *self.line, recording_interval=self.interval.value(), **self.settings()
+			)
+		except Exception as e:
+			QMessageBox.critical(self, "Re-measure Error", f"Could not start measuring:\n{e}")
+			return
+		self.measure_btn.setEnabled(False)
+		self.progress.setValue(0)
+		self.progress.show()
+		self._timer.start()
+
+	def check_job(self):
+		if self.job is None:
+			return
+		self.progress.setValue(int(self.job.progress() * 100))
+		if not self.job.done():
+			return
+		self._timer.stop()
+		job, self.job = self.job, None
+		try:
+			self.times, self.diameters = job.result()
+		except Exception as e:
+			self.measure_btn.setEnabled(True)
+			self.progress.hide()
+			QMessageBox.critical(self, "Re-measure Error", f"Measuring failed:\n{e}")
+			return
+		self.accept()
+
+	def reject(self):
+		if self.job is not None:
+			self._timer.stop()
+			self.job.cancel()
+			self.job = None
+		super().reject()
@@ -0,0 +1,78 @@
+import json
+import os
+import struct
+import zipfile
+
+import numpy as np
+
+from vasoanalyzer.profiling import profiled
+from vasoanalyzer.cache import json_default
+
+# A session is a zip container:
+#   session.json        labels, events, table rows, pins, TIFF index, style, Excel mapping
+#   trace/<n>.npy       one array per trace column, stored uncompressed
+# Arrays are stored (not deflated) so load_session can memory-map them
+# straight out of the zip instead of reading and decoding them.
+SESSION_EXTENSION = ".vaso"
+SESSION_VERSION = 1
+
+_LOCAL_HEADER = struct.Struct("<4s2B4HL2L2H")
+
+def _write_array(zf, name, array):
+	info = zipfile.ZipInfo(name, date_time=(1980, 1, 1, 0, 0, 0))
+	info.compress_type = zipfile.ZIP_STORED
+	if array.dtype == object:
+		array = array.astype(str)
+	with zf.open(info, "w", force_zip64=True) as f:
+		np.lib.format.write_array(f, np.ascontiguousarray(array), allow_pickle=False)
+
+def _memmap_member(path, zf, name):
+	"""Memory-map a stored .npy member of the zip at ``path``."""
+	info = zf.getinfo(name)
+	if info.compress_type != zipfile.ZIP_STORED:
+		return np.load(zf.open(name), allow_pickle=False)
+
+	with open(path, "rb") as f:
+		f.seek(info.header_offset)
+		header = _LOCAL_HEADER.unpack(f.read(_LOCAL_HEADER.size))
+		name_len, extra_len = header[-2], header[-1]
+		f.seek(name_len + extra_len, os.SEEK_CUR)
+		version = np.lib.format.read_magic(f)
+		if version == (1, 0):
+			shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+		else:
+			shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(f)
+		offset = f.tell()
+
+	if not shape or 0 in shape:
+		return np.zeros(shape, dtype=dtype)
+	return np.memmap(path, dtype=dtype, mode="r", offset=offset, shape=shape,
+		order="F" if fortran_order else "C")
+
+@profiled("save_session")
+def save_session(path, state, trace_columns=None):
+	"""Write ``state`` (JSON-serialisable dict) and ``trace_columns`` ({name: array})."""
+	trace_columns = trace_columns or {}
+	manifest = dict(state)
+	manifest["version"] = SESSION_VERSION
+	manifest["trace_columns"] = list(trace_columns)
+
+	tmp_path = path + ".tmp"
+	with zipfile.ZipFile(tmp_path, "w", zipfile.ZIP_DEFLATED, allowZip64=True) as zf:
+		zf.writestr("session.json", json.dumps(manifest, default=json_default, indent=1))
+		for i, (name, values) in enumerate(trace_columns.items()):
+			_write_array(zf, f"trace/{i}.npy", np.asarray(values))
+	os.replace(tmp_path, path)
+
+@profiled("load_session")
+def load_session(path):
+	"""Return ``(state, trace_columns)``; trace arrays are read-only memory maps."""
+	with zipfile.ZipFile(path, "r") as zf:
+		state = json.loads(zf.read("session.json"))
+		if state.get("version", 0) > SESSION_VERSION:
+			raise ValueError(f"Session was written by a newer VasoAnalyzer (format {state['version']}).")
+		trace_columns = {
+			name: _memmap_member(path, zf, f"trace/{i}.npy")
+			for i, name in enumerate(state.get("trace_columns", []))
+		}
+	return state, trace_columns
@@ -0,0 +1,64 @@
+import importlib
+import sys
+import threading
+import time
+
+# Modules that are only needed once a file is opened or exported. They are
+# imported on a background thread after the main window is up so the first
+# click doesn't pay for them.
+WARMUP_MODULES = [
+	"numpy",
+	"pandas",
+	"tifffile",
+	"openpyxl",
+	"vasoanalyzer.trace_loader",
+	"vasoanalyzer.event_loader",
+	"vasoanalyzer.event_table",
+	"vasoanalyzer.tiff_loader",
+	"vasoanalyzer.excel_mapper",
+	"vasoanalyzer.plot_style_dialog",
+]
+
+_T0 = time.perf_counter()
+IMPORT_TIMES = {}	# module name -> seconds spent importing it
+MILESTONES = []		# (label, seconds since launch)
+
+def timed_import(name):
+	"""Import ``name`` and record how long it took (0 if already imported)."""
+	already_loaded = name in sys.modules
+	start = time.perf_counter()
+	module = importlib.import_module(name)
+	if not already_loaded:
+		IMPORT_TIMES[name] = time.perf_counter() - start
+	return module
+
+def mark(label):
+	"""Record a startup milestone relative to process launch."""
+	MILESTONES.append((label, time.perf_counter() - _T0))
+
+def warm_up_in_background(modules=None, on_done=None):
+	"""Import heavy modules on a daemon thread; returns the thread."""
+	def run():
+		for name in modules or WARMUP_MODULES:
+			try:
+				timed_import(name)
+			except Exception as e:
+				print(f"⚠️ Warm-up import of {name} failed: {e}")
+		mark("background warm-up done")
+		if on_done:
+			on_done()
+
+	thread = threading.Thread(target=run, name="vasoanalyzer-warmup", daemon=True)
+	thread.start()
+	return thread
+
+def report_import_times(limit=10):
+	"""Print startup milestones and the slowest recorded imports."""
+	print("⏱ Startup timeline:")
+	for label, t in MILESTONES:
+		print(f"   {t * 1000:8.1f} ms  {label}")
+	if IMPORT_TIMES:
+		print("⏱ Import-time breakdown:")
+		slowest = sorted(IMPORT_TIMES.items(), key=lambda kv: kv[1], reverse=True)
+		for name, seconds in slowest[:limit]:
+			print(f"   {seconds * 1000:8.1f} ms  {name}")
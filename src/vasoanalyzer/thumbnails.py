@@ -0,0 +1,184 @@
+import os
+
+import numpy as np
+
+from vasoanalyzer.cache import user_cache_dir, file_key
+from vasoanalyzer.workers import process_pool
+
+# Frame thumbnails for the filmstrip. Each TIFF gets one memory-mapped
+# uint8 array of thumbnails (one slot per page) plus a "ready" flag array in
+# the user cache dir, keyed by the file's content hash and the thumbnail
+# size, so reopening a stack shows every thumbnail made before instantly.
+# Opening a stack touches its files; when the directory outgrows its budget
+# the least recently used stacks' thumbnails are deleted, as in DiskCache.
+# Missing ones are rendered in worker processes (see vasoanalyzer.workers).
+
+THUMBNAIL_SIZE = 96			# Longest side in pixels
+THUMBNAIL_BATCH = 16		# Pages per worker task
+THUMBNAIL_WORKERS = 2		# Leave cores for the GUI and other jobs
+DEFAULT_THUMBNAIL_CACHE_MB = 256	# Size budget; VASOANALYZER_THUMBNAIL_CACHE_MB overrides
+
+def thumbnail_factor(page_shape, size=THUMBNAIL_SIZE):
+	"""Integer downsampling factor so the longer side of a page fits in ``size``."""
+	return max(1, -(-max(page_shape[:2]) // size))
+
+def make_thumbnail(frame, factor):
+	"""Area-averaged, 8-bit greyscale miniature of ``frame`` (1/``factor`` per side)."""
+	frame = np.asarray(frame)
+	is_8bit = frame.dtype == np.uint8
+	if frame.ndim == 3:
+		frame = frame[..., :3].mean(axis=-1)
+	height, width = frame.shape[0] // factor * factor, frame.shape[1] // factor * factor
+	small = frame[:height, :width].reshape(height // factor, factor, width // factor, factor).mean(axis=(1, 3))
+	if is_8bit:
+		return small.astype(np.uint8)
+	low, high = float(small.min()), float(small.max())
+	return ((small - low) * (255.0 / max(high - low, 1e-12))).astype(np.uint8)
+
+def render_thumbnails(path, pages, factor):
+	"""Thumbnails for ``pages`` of the TIFF at ``path`` (runs in a worker process)."""
+	import tifffile
+
+	with tifffile.TiffFile(path) as tif:
+		return pages, np.stack([make_thumbnail(tif.pages[page].asarray(), factor) for page in pages])
+
+def _open_array(path, dtype, shape):
+	"""Open a cached .npy as a writable memmap, (re)creating it if missing or of another shape."""
+	if os.path.exists(path):
+		try:
+			array = np.lib.format.open_memmap(path, mode="r+")
+			if array.shape == shape and array.dtype == dtype:
+				return array, False
+			del array
+		except (ValueError, OSError):
+			pass
+	return np.lib.format.open_memmap(path, mode="w+", dtype=dtype, shape=shape), True
+
+def thumbnail_cache_bytes():
+	return int(float(os.environ.get("VASOANALYZER_THUMBNAIL_CACHE_MB", DEFAULT_THUMBNAIL_CACHE_MB)) * 1024 * 1024)
+
+def evict_thumbnails(cache_dir, max_bytes=None, keep=()):
+	"""Delete the least recently used stacks' thumbnails until ``cache_dir`` fits in ``max_bytes``.
+
+	A stack's files share a ``{file_key}-{size}`` base; its last use is the
+	newest mtime among them. Bases in ``keep`` (open stores) are never deleted.
+	"""
+	budget = thumbnail_cache_bytes() if max_bytes is None else max_bytes
+	groups = {}			# base -> [last_used, size, paths]
+	for entry in os.scandir(cache_dir):
+		if not entry.is_file(follow_symlinks=False) or not entry.name.endswith(".npy"):
+			continue
+		base = entry.name[:-len(".ready.npy")] if entry.name.endswith(".ready.npy") else entry.name[:-len(".npy")]
+		try:
+			info = entry.stat()
+		except OSError:
+			continue
+		group = groups.setdefault(os.path.join(cache_dir, base), [0.0, 0, []])
+		group[0] = max(group[0], info.st_mtime)
+		group[1] += info.st_size
+		group[2].append(entry.path)
+	total = sum(size for _, size, _ in groups.values())
+	for base, (_, size, paths) in sorted(groups.items(), key=lambda item: item[1][0]):
+		if total <= budget:
+			break
+		if base in keep:
+			continue
+		for path in paths:
+			try:
+				os.remove(path)
+			except OSError:
+				pass		# Still mapped by another process (Windows); try again next time
+		total -= size
+
+class ThumbnailStore:
+	"""Thumbnails of ``pages`` of a TIFF: served from the disk cache, rendered in the background.
+
+	Positions (0..len-1) index ``pages``; ``request`` queues missing ones,
+	``collect`` (called from a GUI timer) stores finished ones and returns
+	their positions.
+	"""
+
+	def __init__(self, path, pages, size=THUMBNAIL_SIZE, cache_dir=None):
+		import tifffile
+
+		self.path = path
+		self.pages = list(pages)
+		with tifffile.TiffFile(path) as tif:
+			n_pages = len(tif.pages)
+			page_shape = tif.pages[0].shape
+		self.factor = thumbnail_factor(page_shape, size)
+		shape = (page_shape[0] // self.factor, page_shape[1] // self.factor)
+
+		cache_dir = cache_dir or user_cache_dir("thumbnails")
+		base = os.path.join(cache_dir, f"{file_key(path)}-{size}")
+		self.images, created = _open_array(base + ".npy", np.uint8, (n_pages,) + shape)
+		self.ready, _ = _open_array(base + ".ready.npy", np.bool_, (n_pages,))
+		if created:
+			self.ready[:] = False
+		os.utime(base + ".ready.npy")		# Mark this stack as the most recently used
+		evict_thumbnails(cache_dir, keep=(base,))
+		self._executor = None
+		self._pending = {}			# future -> pages
+		self._queued = set()
+
+	def __len__(self):
+		return len(self.pages)
+
+	@property
+	def shape(self):
+		return self.images.shape[1:]
+
+	def get(self, position):
+		"""Thumbnail at ``position``, or None until it has been rendered."""
+		page = self.pages[position]
+		return self.images[page] if self.ready[page] else None
+
+	def missing(self):
+		return sum(1 for page in self.pages if not self.ready[page])
+
+	def request(self, positions):
+		"""Queue rendering of the positions not cached or already queued."""
+		pages = [
+			self.pages[p] for p in positions
+			if 0 <= p < len(self.pages) and not self.ready[self.pages[p]] and self.pages[p] not in self._queued
+		]
+		if not pages:
+			return
+		if self._executor is None:
+			self._executor = process_pool(THUMBNAIL_WORKERS)
+		for start in range(0, len(pages), THUMBNAIL_BATCH):
+			batch = pages[start:start + THUMBNAIL_BATCH]
+			self._pending[self._executor.submit(render_thumbnails, self.path, batch, self.factor)] = batch
+			self._queued.update(batch)
+
+	def pending(self):
+		return bool(self._pending)
+
+	def collect(self):
+		"""Store finished thumbnails; returns the positions that became available."""
+		done = [future for future in self._pending if future.done()]
+		arrived = set()
+		for future in done:
+			batch = self._pending.pop(future)
+			self._queued.difference_update(batch)
+			try:
+				pages, images = future.result()
+			except Exception as e:
+				print(f"⚠️ Thumbnail rendering failed: {e}")
+				continue
+			self.images[pages] = images
+			self.ready[pages] = True
+			arrived.update(pages)
+		if arrived:
+			self.images.flush()
+			self.ready.flush()
+		return [position for position, page in enumerate(self.pages) if page in arrived]
+
+	def close(self):
+		if self._executor is not None:
+			self._executor.shutdown(wait=False, cancel_futures=True)
+			self._executor = None
+		self._pending.clear()
+		self._queued.clear()
+		for array in (self.images, self.ready):
+			array.flush()
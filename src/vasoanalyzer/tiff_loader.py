@@ -2,30 +2,134 @@ import tifffile
 import numpy as np
 import json
 
-def load_tiff(file_path, max_frames=300):
+from vasoanalyzer.profiling import profiled
+
+def _memmap_stack(file_path, tif, indices):
+    """Return memory-mapped frames for ``indices`` or None if the layout can't be mapped.
+
+    Uncompressed stacks whose pages are stored contiguously are exposed as
+    read-only views on a ``numpy.memmap`` so frames are paged in by the OS
+    on demand instead of being decoded into process memory up front.
+    """
+    pages = tif.pages
+    total_frames = len(pages)
+
+    try:
+        # Fast path: the whole series is one contiguous block (tifffile.memmap)
+        series = tif.series[0]
+        if series.dataoffset is not None and pages[0].is_memmappable:
+            stack = tifffile.memmap(file_path, mode='r')
+            page_shape = pages[0].shape
+            if stack.shape == page_shape:
+                stack = stack.reshape((1,) + page_shape)
+            elif stack.shape[-len(page_shape):] == page_shape:
+                stack = stack.reshape((-1,) + page_shape)
+            if stack.shape[0] == total_frames:
+                return [stack[i] for i in indices]
+    except (ValueError, IndexError, OSError):
+        pass
+
+    # Per-page path: pages are individually contiguous (e.g. JSON description
+    # written between frames), so map the file once and view each page in place
+    sampled = [pages[i] for i in indices]
+    if not all(getattr(page, 'is_memmappable', False) for page in sampled):
+        return None
+
+    raw = np.memmap(file_path, dtype=np.uint8, mode='r')
+    frames = []
+    for page in sampled:
+        frames.append(np.ndarray(
+            shape=page.shape,
+            dtype=page.dtype,
+            buffer=raw,
+            offset=page.dataoffsets[0],
+        ))
+    return frames
+
+@profiled("load_tiff_frames")
+def load_tiff_frames(file_path, indices, memmap=True):
+    """Load only the pages at ``indices`` (no metadata), e.g. when resuming a session."""
+    with tifffile.TiffFile(file_path) as tif:
+        mapped = _memmap_stack(file_path, tif, indices) if memmap else None
+        if mapped is not None:
+            return mapped
+        return [tif.pages[i].asarray() for i in indices]
+
+@profiled("load_tiff")
+def load_tiff(file_path, max_frames=300, memmap=True, cache=None):
+    """Sample up to ``max_frames`` pages of a TIFF with their metadata.
+
+    The metadata and the sampled pages' file offsets (or, for stacks that
+    can't be memory-mapped, the decoded frames) are kept in the disk cache
+    (``cache``: a DiskCache, the shared one if None, or False for none), so
+    reopening a stack parses no page headers and decompresses nothing.
+    """
+    from vasoanalyzer.cache import default_cache
+
+    cache = default_cache() if cache is None else cache
+    key = None
+    if cache:
+        key = cache.key(file_path, "tiff", max_frames, memmap)
+        cached = cache.get(key)
+        if cached is not None:
+            meta, arrays = cached
+            frames_metadata = meta["frames"]
+            if "frames" in arrays:
+                frames = list(arrays["frames"])
+            elif meta["offsets"] is not None:
+                raw = np.memmap(file_path, dtype=np.uint8, mode='r')
+                frames = [
+                    np.ndarray(shape=tuple(m['shape']), dtype=m['dtype'], buffer=raw, offset=offset)
+                    for m, offset in zip(frames_metadata, meta["offsets"])
+                ]
+            else:
+                frames = load_tiff_frames(file_path, [m["index"] for m in frames_metadata], memmap)
+            return frames, frames_metadata
+
+    frames, frames_metadata, offsets = _read_tiff(file_path, max_frames, memmap)
+    if key is not None:
+        arrays = {}
+        if offsets is None and frames and len({(f.shape, f.dtype) for f in frames}) == 1:
+            arrays["frames"] = np.stack(frames)
+        cache.put(key, {"frames": frames_metadata, "offsets": offsets}, arrays)
+    return frames, frames_metadata
+
+def _read_tiff(file_path, max_frames, memmap):
+    """``(frames, frames_metadata, offsets)``; ``offsets`` (file offset of each memory-mapped
+    frame) is None unless every frame was mapped."""
     frames = []
     frames_metadata = []
-    
+    offsets = []
+
     with tifffile.TiffFile(file_path) as tif:
         total_frames = len(tif.pages)
         skip = max(1, round(total_frames / max_frames))
-        
-        for i in range(0, total_frames, skip):
+        indices = range(0, total_frames, skip)
+
+        mapped = _memmap_stack(file_path, tif, indices) if memmap else None
+        if mapped is not None:
+            print(f"Memory-mapped {len(mapped)} frames from uncompressed TIFF")
+
+        for n, i in enumerate(indices):
             # Get the page
             page = tif.pages[i]
-            
-            # Extract frame
-            frame = page.asarray()
+
+            # Extract frame (memory-mapped views are paged in lazily)
+            frame = mapped[n] if mapped is not None else page.asarray()
             frames.append(frame)
-            
+            if mapped is not None and offsets is not None and getattr(page, 'is_memmappable', False):
+                offsets.append(page.dataoffsets[0])
+            else:
+                offsets = None
+
             # Extract metadata for this frame
             frame_meta = {}
-            
+
             # Get basic page info
             frame_meta['index'] = i
             frame_meta['shape'] = frame.shape
             frame_meta['dtype'] = str(frame.dtype)
-            
+
             # Try to extract the JSON metadata from the description field
             if hasattr(page, 'description') and page.description:
                 try:
@@ -36,11 +140,11 @@ def load_tiff(file_path, max_frames=300):
                     print(f"Found JSON metadata in frame {i}")
                 except json.JSONDecodeError:
                     print(f"Frame {i} has description but not valid JSON: {page.description[:100]}...")
-            
+
             # Also get regular TIFF tags
             for tag in page.tags.values():
                 frame_meta[tag.name] = tag.value
-            
+
             frames_metadata.append(frame_meta)
-    
-    return frames, frames_metadata
\ No newline at end of file
+
+    return frames, frames_metadata, offsets
@@ -1,5 +1,352 @@
-import pandas as pd
+import bisect
+import os
+import shutil
+import tempfile
+import weakref
 
-def load_trace(file_path):
-	trace = pd.read_csv(file_path)
-	return trace
+import numpy as np
+
+from vasoanalyzer.profiling import profiled
+
+TIME_COLUMN = 'Time (s)'
+CHUNK_ROWS = 65536		# rows per chunk
+SUMMARY_BUCKET = 256	# rows per min/max summary bucket (divides CHUNK_ROWS)
+
+class _Chunk:
+	__slots__ = ('columns', 'n', 'owned', 'summary', 'spill_base')
+
+	def __init__(self, columns, n, owned):
+		self.columns = columns	# {name: 1-D array}; owned chunks are preallocated to CHUNK_ROWS
+		self.n = n				# filled rows
+		self.owned = owned		# False for read-only views on loaded/memory-mapped arrays
+		self.summary = None		# {name: (bucket_min, bucket_max)} plus TIME_COLUMN bucket starts
+		self.spill_base = None	# path prefix of the .npy files once spilled to disk
+
+def _bucket_summary(columns, n, time_column):
+	starts = np.arange(0, n, SUMMARY_BUCKET)
+	summary = {}
+	for name, values in columns.items():
+		values = values[:n]
+		if name == time_column:
+			summary[name] = values[starts]
+		else:
+			summary[name] = (np.fmin.reduceat(values, starts), np.fmax.reduceat(values, starts))
+	return summary
+
+class TraceStore:
+	"""Chunked, append-only trace container with bounded memory.
+
+	Rows live in fixed-size chunks, so appending is O(rows appended) and never
+	copies existing data (unlike growing a DataFrame). Each sealed chunk keeps
+	per-bucket min/max summaries for overview rendering; with
+	``max_memory_chunks`` older chunks are spilled to .npy files and
+	memory-mapped back, and with ``max_rows`` the oldest chunks are dropped
+	(ring buffer). Time must be non-decreasing. Only numeric columns are kept.
+
+	``store[column]`` returns the whole column as one array (cached until the
+	next append); rendering and lookups should prefer :meth:`window`,
+	:meth:`envelope` and :meth:`value_at`, which only touch the chunks needed.
+	"""
+
+	def __init__(self, columns, time_column=TIME_COLUMN, max_memory_chunks=None, max_rows=None):
+		self.columns = list(columns)
+		self.time_column = time_column
+		self.max_memory_chunks = max_memory_chunks
+		self.max_rows = max_rows
+		self._chunks = []
+		self._chunk_t0 = []		# first time stamp of each chunk (for bisect)
+		self._chunk_start = []	# logical row index of each chunk's first row
+		self._n_rows = 0
+		self._column_cache = {}
+		self._spill_dir = None
+		self._spill_count = 0
+		self._finalizer = None
+
+	# ----- Construction -----
+	@classmethod
+	def from_arrays(cls, arrays, time_column=TIME_COLUMN, **kwargs):
+		"""Wrap existing column arrays (e.g. memory maps) as read-only chunks without copying."""
+		arrays = {
+			name: values for name, values in ((n, np.asarray(v)) for n, v in arrays.items())
+			if np.issubdtype(values.dtype, np.number)
+		}
+		store = cls(arrays.keys(), time_column=time_column, **kwargs)
+		n = len(arrays[time_column]) if arrays else 0
+		for start in range(0, n, CHUNK_ROWS):
+			stop = min(start + CHUNK_ROWS, n)
+			chunk = _Chunk({name: values[start:stop] for name, values in arrays.items()}, stop - start, owned=False)
+			store._add_chunk(chunk)
+			store._n_rows += chunk.n
+			store._seal(chunk)
+		store._column_cache = dict(arrays)
+		return store
+
+	@classmethod
+	def from_dataframe(cls, df, time_column=TIME_COLUMN, **kwargs):
+		return cls.from_arrays({col: df[col].to_numpy() for col in df.columns}, time_column=time_column, **kwargs)
+
+	def _add_chunk(self, chunk):
+		self._chunk_start.append(self._n_rows)
+		self._chunk_t0.append(chunk.columns[self.time_column][0])
+		self._chunks.append(chunk)
+
+	# ----- Appending -----
+	def append(self, new_columns):
+		"""Append rows given as ``{column: array}``; amortised O(1) per row. Missing columns get NaN."""
+		k = len(new_columns[self.time_column])
+		new_columns = {
+			name: np.asarray(new_columns[name], dtype=float) if name in new_columns else np.full(k, np.nan)
+			for name in self.columns
+		}
+		i = 0
+		while i < k:
+			chunk = self._chunks[-1] if self._chunks else None
+			if chunk is None or not chunk.owned or chunk.n == CHUNK_ROWS:
+				chunk = _Chunk({name: np.empty(CHUNK_ROWS) for name in self.columns}, 0, owned=True)
+				chunk.columns[self.time_column][0] = new_columns[self.time_column][i]
+				self._add_chunk(chunk)
+			take = min(k - i, CHUNK_ROWS - chunk.n)
+			for name in self.columns:
+				chunk.columns[name][chunk.n:chunk.n + take] = new_columns[name][i:i + take]
+			chunk.n += take
+			self._n_rows += take
+			i += take
+			if chunk.n == CHUNK_ROWS:
+				self._seal(chunk)
+		if k:
+			self._column_cache = {}
+			self._enforce_limits()
+
+	def overwrite(self, i0, new_columns):
+		"""Replace values of logical rows ``[i0, i0 + k)`` with ``{column: array}`` (e.g. a provisional tail).
+
+		The time column must not be overwritten (chunk lookups depend on it).
+		"""
+		k = len(next(iter(new_columns.values())))
+		i1 = min(i0 + k, self._n_rows)
+		c0 = max(0, bisect.bisect_right(self._chunk_start, i0) - 1)
+		for c in range(c0, len(self._chunks)):
+			chunk, start = self._chunks[c], self._chunk_start[c]
+			if start >= i1:
+				break
+			lo, hi = max(i0 - start, 0), min(i1 - start, chunk.n)
+			for name, values in new_columns.items():
+				target = chunk.columns[name]
+				if not target.flags.writeable and chunk.spill_base is not None:
+					target = chunk.columns[name] = np.load(f"{chunk.spill_base}_{self.columns.index(name)}.npy", mmap_mode='r+')
+				target[lo:hi] = values[start + lo - i0:start + hi - i0]
+			if chunk.summary is not None:
+				chunk.summary.update(_bucket_summary({name: chunk.columns[name] for name in new_columns}, chunk.n, self.time_column))
+		for name in new_columns:
+			self._column_cache.pop(name, None)
+
+	def add_column(self, name, values):
+		"""Add (or replace) column ``name`` with one value per row, keeping chunks, spills and limits."""
+		values = np.asarray(values, dtype=float)
+		if len(values) != self._n_rows:
+			raise ValueError(f"{name!r} has {len(values)} values for {self._n_rows} rows")
+		if name not in self.columns:
+			self.columns.append(name)
+		index = self.columns.index(name)
+		for chunk, start in zip(self._chunks, self._chunk_start):
+			part = values[start:start + chunk.n]
+			if chunk.spill_base is not None:
+				path = f"{chunk.spill_base}_{index}.npy"
+				np.save(path, part)
+				column = np.load(path, mmap_mode='r')
+			elif chunk.owned:
+				column = np.full(CHUNK_ROWS, np.nan)	# Room for the rows later appends add
+				column[:chunk.n] = part
+			else:
+				column = part
+			chunk.columns[name] = column
+			if chunk.summary is not None:
+				chunk.summary[name] = _bucket_summary({name: column}, chunk.n, self.time_column)[name]
+		self._column_cache.pop(name, None)
+
+	def _seal(self, chunk):
+		chunk.summary = _bucket_summary(chunk.columns, chunk.n, self.time_column)
+
+	def _enforce_limits(self):
+		# Ring buffer: drop whole chunks from the front while staying above max_rows
+		while self.max_rows and len(self._chunks) > 1 and self._n_rows - self._chunks[0].n >= self.max_rows:
+			chunk = self._chunks.pop(0)
+			self._chunk_t0.pop(0)
+			self._chunk_start.pop(0)
+			self._n_rows -= chunk.n
+			self._chunk_start = [start - chunk.n for start in self._chunk_start]
+			self._discard_spill(chunk)
+
+		# Spill: keep at most max_memory_chunks sealed chunks in RAM
+		if self.max_memory_chunks is not None:
+			in_memory = [c for c in self._chunks if c.owned and c.summary is not None and c.spill_base is None]
+			for chunk in in_memory[:max(0, len(in_memory) - self.max_memory_chunks)]:
+				self._spill(chunk)
+
+	def _spill(self, chunk):
+		if self._spill_dir is None:
+			self._spill_dir = tempfile.mkdtemp(prefix="vasoanalyzer-trace-")
+			self._finalizer = weakref.finalize(self, shutil.rmtree, self._spill_dir, True)
+		chunk.spill_base = os.path.join(self._spill_dir, f"chunk_{self._spill_count}")
+		self._spill_count += 1
+		for i, name in enumerate(self.columns):
+			path = f"{chunk.spill_base}_{i}.npy"
+			np.save(path, chunk.columns[name][:chunk.n])
+			chunk.columns[name] = np.load(path, mmap_mode='r')
+
+	def _discard_spill(self, chunk):
+		if chunk.spill_base is None:
+			return
+		chunk.columns = {}
+		for i, _ in enumerate(self.columns):
+			try:
+				os.remove(f"{chunk.spill_base}_{i}.npy")
+			except OSError:
+				pass
+
+	def close(self):
+		"""Remove spilled chunk files now rather than at garbage collection."""
+		if self._finalizer is not None:
+			self._finalizer()
+
+	# ----- Whole-column access -----
+	def __len__(self):
+		return self._n_rows
+
+	def __contains__(self, name):
+		return name in self.columns
+
+	def __getitem__(self, name):
+		if name not in self._column_cache:
+			if name not in self.columns:
+				raise KeyError(name)
+			self._column_cache[name] = self.rows(0, self._n_rows)[name]
+		return self._column_cache[name]
+
+	@property
+	def t_min(self):
+		return float(self._chunk_t0[0]) if self._chunks else 0.0
+
+	@property
+	def t_max(self):
+		if not self._chunks:
+			return 0.0
+		last = self._chunks[-1]
+		return float(last.columns[self.time_column][last.n - 1])
+
+	# ----- Windowed access -----
+	def index_of(self, t, side='left'):
+		"""Logical row index where ``t`` would be inserted (like np.searchsorted)."""
+		if not self._chunks:
+			return 0
+		c = max(0, bisect.bisect_right(self._chunk_t0, t) - 1)
+		chunk = self._chunks[c]
+		return self._chunk_start[c] + int(np.searchsorted(chunk.columns[self.time_column][:chunk.n], t, side=side))
+
+	def rows(self, i0, i1, columns=None):
+		"""``{column: array}`` for logical rows ``[i0, i1)``, touching only the chunks involved."""
+		columns = columns or self.columns
+		i0, i1 = max(0, i0), min(self._n_rows, i1)
+		if i1 <= i0:
+			return {name: np.empty(0) for name in columns}
+		c0 = bisect.bisect_right(self._chunk_start, i0) - 1
+		c1 = bisect.bisect_right(self._chunk_start, i1 - 1) - 1
+		parts = {name: [] for name in columns}
+		for c in range(c0, c1 + 1):
+			chunk, start = self._chunks[c], self._chunk_start[c]
+			lo, hi = max(i0 - start, 0), min(i1 - start, chunk.n)
+			for name in columns:
+				parts[name].append(chunk.columns[name][lo:hi])
+		return {name: p[0] if len(p) == 1 else np.concatenate(p) for name, p in parts.items()}
+
+	def window(self, t0, t1, columns=None):
+		"""Rows with ``t0 <= time <= t1`` plus one sample either side (for nearest lookups/line ends)."""
+		return self.rows(self.index_of(t0, 'left') - 1, self.index_of(t1, 'right') + 1, columns)
+
+	def count_between(self, t0, t1):
+		return self.index_of(t1, 'right') - self.index_of(t0, 'left')
+
+	def value_at(self, t, name):
+		"""``(time, value)`` of the sample nearest to ``t``; O(log n)."""
+		window = self.window(t, t, [self.time_column, name])
+		times = window[self.time_column]
+		if not len(times):
+			return None, None
+		i = int(np.argmin(np.abs(times - t)))
+		return times[i], window[name][i]
+
+	def envelope(self, name, t0, t1, n_bins):
+		"""Line data for ``name`` over ``[t0, t1]`` with at most ~2*n_bins points.
+
+		Small ranges return the raw samples, medium ones a min/max envelope
+		of the raw samples, and ranges spanning more than one summary bucket
+		per bin an envelope built from the chunk summaries, so zoomed-out
+		redraws cost O(n_bins + chunks) instead of O(samples).
+		"""
+		i0 = max(0, self.index_of(t0, 'left') - 1)
+		i1 = min(self._n_rows, self.index_of(t1, 'right') + 1)
+		if i1 - i0 <= 2 * n_bins:
+			window = self.rows(i0, i1, [self.time_column, name])
+			return window[self.time_column], window[name]
+		if i1 - i0 < n_bins * SUMMARY_BUCKET:
+			window = self.rows(i0, i1, [self.time_column, name])
+			return _min_max_envelope(window[self.time_column], window[name], window[name], n_bins)
+
+		bucket_t, bucket_min, bucket_max = [], [], []
+		c0 = bisect.bisect_right(self._chunk_start, i0) - 1
+		c1 = bisect.bisect_right(self._chunk_start, i1 - 1) - 1
+		for c in range(c0, c1 + 1):
+			chunk, start = self._chunks[c], self._chunk_start[c]
+			summary = chunk.summary or _bucket_summary(chunk.columns, chunk.n, self.time_column)
+			b0 = max(i0 - start, 0) // SUMMARY_BUCKET
+			b1 = -(-(min(i1 - start, chunk.n)) // SUMMARY_BUCKET)
+			bucket_t.append(summary[self.time_column][b0:b1])
+			bucket_min.append(summary[name][0][b0:b1])
+			bucket_max.append(summary[name][1][b0:b1])
+		return _min_max_envelope(np.concatenate(bucket_t), np.concatenate(bucket_min), np.concatenate(bucket_max), n_bins)
+
+def _min_max_envelope(t, lows, highs, n_bins):
+	"""Group samples/buckets into <= n_bins bins; each bin becomes a vertical min-max segment."""
+	group = max(1, -(-len(t) // n_bins))
+	starts = np.arange(0, len(t), group)
+	x = np.repeat(t[starts], 2)
+	y = np.column_stack([
+		np.fmin.reduceat(lows, starts),
+		np.fmax.reduceat(highs, starts),
+	]).ravel()
+	return x, y
+
+DIAMETER_COLUMN = 'Inner Diameter'
+
+def read_trace_columns(file_path):
+	"""Column names of a trace CSV, read from the header line only."""
+	import pandas as pd
+
+	return [str(col) for col in pd.read_csv(file_path, nrows=0).columns]
+
+@profiled("load_trace")
+def load_trace(file_path, columns=None, cache=None):
+	"""Load a trace CSV; with ``columns`` only those are parsed (time and diameter are always kept).
+
+	Parsed columns are kept in the disk cache (``cache``: a DiskCache, the
+	shared one if None, or False for none) and memory-mapped on later loads.
+	"""
+	import pandas as pd
+	from vasoanalyzer.cache import default_cache
+
+	cache = default_cache() if cache is None else cache
+	key = None
+	if cache:
+		key = cache.key(file_path, "trace", None if columns is None else sorted(columns))
+		cached = cache.get(key)
+		if cached is not None:
+			return TraceStore.from_arrays(cached[1])
+
+	if columns is not None:
+		wanted = {TIME_COLUMN, DIAMETER_COLUMN, *columns}
+		columns = lambda col: col in wanted
+	trace = pd.read_csv(file_path, usecols=columns)
+	store = TraceStore.from_dataframe(trace)
+	if key is not None:
+		cache.put(key, {}, {name: store[name] for name in store.columns})
+	return store
@@ -0,0 +1,193 @@
+# Undo/redo for edits to the event table, pins and Excel mappings.
+#
+# Every edit is a Command holding only what it changed (a row index and
+# its old/new values, the inserted rows, a pin position, the written
+# cells), so history costs O(1) memory per edit whatever the size of the
+# recording and can be unlimited. Commands apply themselves through small
+# primitives on their target (VasoAnalyzerApp.set_event_value,
+# insert_event, remove_event, insert_pin, remove_pin; a worksheet), which
+# update only the affected table rows and artists.
+
+class Command:
+	"""One undoable edit; ``text`` names it in Undo/Redo menus and tooltips."""
+
+	text = ""
+
+	def redo(self):
+		raise NotImplementedError
+
+	def undo(self):
+		raise NotImplementedError
+
+class UndoStack:
+	"""Undo/redo history of Commands; ``on_change()`` is called after every push, undo or redo."""
+
+	def __init__(self, on_change=None):
+		self._undo = []
+		self._redo = []
+		self.on_change = on_change
+
+	def push(self, command):
+		"""Apply ``command`` and record it (clearing the redo history)."""
+		command.redo()
+		self._undo.append(command)
+		self._redo.clear()
+		self._changed()
+
+	def undo(self):
+		if not self._undo:
+			return None
+		command = self._undo.pop()
+		command.undo()
+		self._redo.append(command)
+		self._changed()
+		return command
+
+	def redo(self):
+		if not self._redo:
+			return None
+		command = self._redo.pop()
+		command.redo()
+		self._undo.append(command)
+		self._changed()
+		return command
+
+	def can_undo(self):
+		return bool(self._undo)
+
+	def can_redo(self):
+		return bool(self._redo)
+
+	def undo_text(self):
+		return self._undo[-1].text if self._undo else ""
+
+	def redo_text(self):
+		return self._redo[-1].text if self._redo else ""
+
+	def clear(self):
+		self._undo.clear()
+		self._redo.clear()
+		self._changed()
+
+	def __len__(self):
+		return len(self._undo)
+
+	def commands(self):
+		"""Every recorded command, undone or not, with Groups expanded."""
+		pending = self._undo + self._redo
+		while pending:
+			command = pending.pop()
+			if isinstance(command, Group):
+				pending.extend(command.commands)
+			else:
+				yield command
+
+	def _changed(self):
+		if self.on_change is not None:
+			self.on_change()
+
+class Group(Command):
+	"""Several commands undone and redone as one (applied in order, undone in reverse)."""
+
+	def __init__(self, commands, text):
+		self.commands = list(commands)
+		self.text = text
+
+	def redo(self):
+		for command in self.commands:
+			command.redo()
+
+	def undo(self):
+		for command in reversed(self.commands):
+			command.undo()
+
+# ===== Event table =====
+class SetEventValue(Command):
+	"""Change the ID (µm) of one event-table row."""
+
+	def __init__(self, window, row, old, new, label=None):
+		self.window = window
+		self.row = row
+		self.old = old
+		self.new = new
+		self.text = f"Edit ID of '{window.event_table_data[row][0] if label is None else label}'"
+
+	def redo(self):
+		self.window.set_event_value(self.row, self.new)
+
+	def undo(self):
+		self.window.set_event_value(self.row, self.old)
+
+class InsertEvents(Command):
+	"""Insert events given as ``[(index, (label, time, frame, ID))]`` (indices in the final order)."""
+
+	def __init__(self, window, entries, text=None):
+		self.window = window
+		self.entries = sorted(entries, key=lambda entry: entry[0])
+		if text:
+			self.text = text
+		elif len(self.entries) == 1:
+			self.text = f"Add event '{self.entries[0][1][0]}'"
+		else:
+			self.text = f"Add {len(self.entries)} events"
+
+	def redo(self):
+		for index, row in self.entries:
+			self.window.insert_event(index, row)
+		self.window.events_changed(self.entries[0][0])
+
+	def undo(self):
+		for index, _ in reversed(self.entries):
+			self.window.remove_event(index)
+		self.window.events_changed(self.entries[0][0])
+
+# ===== Pins =====
+class AddPin(Command):
+	def __init__(self, window, x, y):
+		self.window = window
+		self.index = len(window.pins)
+		self.x = x
+		self.y = y
+		self.text = f"Add pin at {x:.2f} s"
+
+	def redo(self):
+		self.window.insert_pin(self.index, self.x, self.y)
+
+	def undo(self):
+		self.window.remove_pin(self.index)
+
+class RemovePin(Command):
+	def __init__(self, window, index):
+		self.window = window
+		self.index = index
+		self.x = float(window.pins.xs[index])
+		self.y = float(window.pins.ys[index])
+		self.text = f"Delete pin at {self.x:.2f} s"
+
+	def redo(self):
+		self.window.remove_pin(self.index)
+
+	def undo(self):
+		self.window.insert_pin(self.index, self.x, self.y)
+
+# ===== Excel mapping =====
+class SetCells(Command):
+	"""Write ``[(cell, old, new)]`` to an openpyxl worksheet; ``on_apply(cells)`` runs afterwards."""
+
+	def __init__(self, ws, changes, on_apply=None, text=None):
+		self.ws = ws
+		self.changes = list(changes)
+		self.on_apply = on_apply
+		self.text = text or (f"Map {self.changes[0][0]}" if len(self.changes) == 1 else f"Map {len(self.changes)} cells")
+
+	def redo(self):
+		for cell, _, new in self.changes:
+			self.ws[cell] = new
+		if self.on_apply:
+			self.on_apply([cell for cell, _, _ in self.changes])
+
+	def undo(self):
+		for cell, old, _ in reversed(self.changes):
+			self.ws[cell] = old
+		if self.on_apply:
+			self.on_apply([cell for cell, _, _ in self.changes])
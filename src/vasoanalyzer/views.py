@@ -0,0 +1,211 @@
+from collections import OrderedDict
+
+from matplotlib.backends.backend_qt5agg import NavigationToolbar2QT
+
+# Zoom/pan navigation. A view is the x/y limits of every axes in the figure;
+# ViewManager keeps a back/forward history of them (replacing the
+# toolbar's own stack) and a small LRU of rendered canvases for views in the
+# history. Going back, forward or home to a view rendered before restores
+# its pixels and blits them instead of redrawing the figure, so hopping
+# between an overview and a few zoomed regions is instant. Rendered views
+# are only valid while the plot's content is unchanged: the window calls
+# invalidate() whenever it edits artists, and any full redraw of a history
+# view refreshes its copy.
+#
+# Markers that move often (the TIFF frame line, the selected event) are
+# "animated" artists: full draws leave them out, and they are drawn on top
+# of the last full rendering and blitted, so moving one costs a few
+# milliseconds and does not invalidate the cached views.
+
+VIEW_HISTORY = 50	# Back/forward entries kept
+VIEW_CACHE = 8		# Rendered views kept (one full-canvas RGBA copy each)
+
+class ViewManager:
+	"""Back/forward history of the figure's axes limits, with rendered views cached for instant return.
+
+	``on_change()`` is called whenever the position in the history moves.
+	"""
+
+	def __init__(self, canvas, on_change=None):
+		self.canvas = canvas
+		self.on_change = on_change
+		self.history = []
+		self.position = -1
+		self._rendered = OrderedDict()		# view key -> canvas region
+		self._background = None				# (view key, canvas region) of the last full rendering
+		self.animated = []
+		self.stats = {"hits": 0, "misses": 0}
+		canvas.mpl_connect("draw_event", self._on_draw)
+
+	def current_view(self):
+		return tuple((ax.get_xlim(), ax.get_ylim()) for ax in self.canvas.figure.axes)
+
+	def _key(self, view):
+		# A rendering also depends on the canvas size and the axes' placement
+		fig = self.canvas.figure
+		return view, tuple(fig.bbox.bounds), tuple(ax.get_position().bounds for ax in fig.axes)
+
+	def can_back(self):
+		return self.position > 0
+
+	def can_forward(self):
+		return self.position < len(self.history) - 1
+
+	def push(self):
+		"""Record the current view (after a zoom, pan or scroll) unless it is the current entry already."""
+		view = self.current_view()
+		if self.position >= 0 and self.history[self.position] == view:
+			return
+		del self.history[self.position + 1:]
+		self.history.append(view)
+		del self.history[:-VIEW_HISTORY]
+		self.position = len(self.history) - 1
+		self._changed()
+
+	def reset(self):
+		"""Start a new history at the current view (a new trace or layout); drops rendered views."""
+		self.history = []
+		self.position = -1
+		self.invalidate()
+		self.push()
+
+	def invalidate(self):
+		"""Forget rendered views (the plot's content changed)."""
+		self._rendered.clear()
+		self._background = None
+
+	def back(self):
+		self.go(self.position - 1)
+
+	def forward(self):
+		self.go(self.position + 1)
+
+	def home(self):
+		"""Show the first view of the history, recorded as a new entry."""
+		if self.history:
+			self.show(self.history[0])
+			self.push()
+
+	def go(self, position):
+		if 0 <= position < len(self.history):
+			self.position = position
+			self.show(self.history[position])
+			self._changed()
+
+	def show(self, view):
+		"""Set the figure's limits to ``view``; blit its rendering if cached, else redraw."""
+		fig = self.canvas.figure
+		if len(view) != len(fig.axes):
+			return
+		done = []
+		for ax, (xlim, ylim) in zip(fig.axes, view):
+			# Axes sharing x (twins, stacked comparisons) already follow an earlier one
+			if not any(ax.get_shared_x_axes().joined(ax, other) for other in done):
+				ax.set_xlim(xlim)
+			ax.set_ylim(ylim)
+			done.append(ax)
+		key = self._key(view)
+		region = self._rendered.get(key)
+		if region is None:
+			self.stats["misses"] += 1
+			self.canvas.draw_idle()
+			return
+		self.stats["hits"] += 1
+		self._rendered.move_to_end(key)
+		self.canvas.restore_region(region)
+		self._background = (key, region)
+		self._draw_animated()
+		self.canvas.blit(fig.bbox)
+
+	def show_limits(self, limits):
+		"""Show ``{ax: (xlim, ylim)}`` as a new history entry; other axes keep their ylim (and share x as before)."""
+		view = []
+		for ax in self.canvas.figure.axes:
+			xlim, ylim = ax.get_xlim(), ax.get_ylim()
+			for other, (other_xlim, other_ylim) in limits.items():
+				if ax is other:
+					xlim, ylim = other_xlim, other_ylim
+				elif ax.get_shared_x_axes().joined(ax, other):
+					xlim = other_xlim
+			view.append((xlim, ylim))
+		view = tuple(view)
+		if view == self.current_view():
+			return
+		self.show(view)
+		self.push()
+
+	def _on_draw(self, event):
+		view = self.current_view()
+		key = self._key(view)
+		region = self.canvas.copy_from_bbox(self.canvas.figure.bbox)
+		self._background = (key, region)
+		# Keep the rendering of history views; intermediate pan/scroll frames are not kept
+		if self.position >= 0 and view == self.history[self.position]:
+			self._rendered[key] = region
+			self._rendered.move_to_end(key)
+			while len(self._rendered) > VIEW_CACHE:
+				self._rendered.popitem(last=False)
+		self._draw_animated()
+
+	# ----- Blitted markers -----
+	def add_animated(self, artist):
+		"""Draw ``artist`` by blitting it over the last full rendering (see update_animated)."""
+		artist.set_animated(True)
+		self.animated.append(artist)
+		return artist
+
+	def update_animated(self):
+		"""Redraw only the animated artists; a full redraw if the view changed since the last rendering."""
+		if self._background is None or self._background[0] != self._key(self.current_view()):
+			self.canvas.draw_idle()
+			return
+		self.canvas.restore_region(self._background[1])
+		self._draw_animated()
+		self.canvas.blit(self.canvas.figure.bbox)
+
+	def _draw_animated(self):
+		# Artists removed from their axes (or cleared with them) are dropped
+		self.animated = [artist for artist in self.animated if artist.axes is not None]
+		for artist in self.animated:
+			if artist.get_visible():
+				artist.axes.draw_artist(artist)
+
+	def _changed(self):
+		if self.on_change is not None:
+			self.on_change()
+
+class ViewToolbar(NavigationToolbar2QT):
+	"""Matplotlib's toolbar with Home/Back/Forward and zoom/pan history handled by a ViewManager."""
+
+	def __init__(self, canvas, parent=None):
+		super().__init__(canvas, parent)
+		self.views = ViewManager(canvas, on_change=self.set_history_buttons)
+		self.set_history_buttons()
+
+	def push_current(self):
+		self.views.push()
+
+	def back(self, *args):
+		self.views.back()
+
+	def forward(self, *args):
+		self.views.forward()
+
+	def home(self, *args):
+		self.views.home()
+
+	def update(self):
+		self.views.reset()
+
+	def edit_parameters(self):
+		# The figure options dialog restyles artists
+		self.views.invalidate()
+		super().edit_parameters()
+
+	def set_history_buttons(self):
+		if not hasattr(self, "views"):	# Called by the base class before ours is set up
+			return
+		if 'back' in self._actions:
+			self._actions['back'].setEnabled(self.views.can_back())
+		if 'forward' in self._actions:
+			self._actions['forward'].setEnabled(self.views.can_forward())
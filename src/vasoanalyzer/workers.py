@@ -0,0 +1,12 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+# Process pools for background work: figure exports (export_jobs), filmstrip
+# thumbnails, TIFF re-measuring and analysis plugins. Workers are started
+# with spawn, not fork: the GUI process runs Qt and other threads, which a
+# forked child would inherit in an unusable state. Spawned workers import
+# the module of the function they run, so those modules must not import Qt.
+
+def process_pool(max_workers):
+	"""A ProcessPoolExecutor with ``max_workers`` spawned worker processes."""
+	return ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("spawn"))